@@ -0,0 +1,118 @@
+"""
+REST/JSON Scoring Service for URL Credibility Checker
+Headless async HTTP API alongside the Streamlit chatbot
+
+Endpoints:
+- GET  /health               liveness plus the active scoring profile version
+- POST /analyze              {"url": ...} -> one analysis result
+- POST /analyze/batch        {"urls": [...]} -> all results, in request order
+- POST /analyze/stream       {"urls": [...]} -> NDJSON, one line per result as it finishes
+
+The event loop never runs scoring itself: analyses go to a bounded thread pool that
+shares the process-wide singleton model, the pooled fetch sessions and the component
+store, and concurrent requests for the same URL share one in-flight analysis.
+
+Run with:
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List
+import asyncio
+import json
+import os
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from deliverable1_3 import analyze_url_credibility, _get_model_and_tokenizer, _normalize_url
+from component_store import get_component_store
+from scoring_profile import get_profile, start_watching
+
+MAX_WORKERS = int(os.environ.get("CREDIBILITY_API_WORKERS", "8"))
+MAX_BATCH_SIZE = int(os.environ.get("CREDIBILITY_API_MAX_BATCH", "100"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="credibility-api")
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+class AnalyzeRequest(BaseModel):
+    url: str
+
+
+class BatchRequest(BaseModel):
+    urls: List[str]
+
+
+def _analyze(url: str) -> dict:
+    return analyze_url_credibility(url, store=get_component_store())
+
+
+async def analyze(url: str) -> dict:
+    """
+    Analyze on the worker pool; concurrent requests for the same page share one analysis.
+    They are matched on the normalized URL, so https://x.com and HTTPS://X.com/ count as one.
+    """
+    url = _normalize_url(url)
+    future = _in_flight.get(url)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = asyncio.ensure_future(loop.run_in_executor(_executor, _analyze, url))
+        _in_flight[url] = future
+        future.add_done_callback(lambda _: _in_flight.pop(url, None))
+    return await asyncio.shield(future)
+
+
+def _check_batch(urls: List[str]) -> None:
+    if not urls:
+        raise HTTPException(status_code=422, detail="urls must not be empty")
+    if len(urls) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} URLs per request")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the model and profile once before serving, not on the first request
+    start_watching()
+    await asyncio.get_running_loop().run_in_executor(_executor, _get_model_and_tokenizer)
+    yield
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="URL Credibility Checker API", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "profile_version": get_profile().version}
+
+
+@app.post("/analyze")
+async def analyze_one(request: AnalyzeRequest):
+    return await analyze(request.url)
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(request: BatchRequest):
+    _check_batch(request.urls)
+    results = await asyncio.gather(*(analyze(url) for url in request.urls))
+    return {"results": results}
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(request: BatchRequest):
+    _check_batch(request.urls)
+
+    async def lines():
+        for next_done in asyncio.as_completed([analyze(url) for url in request.urls]):
+            result = await next_done
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.environ.get("HOST", "0.0.0.0"), port=int(os.environ.get("PORT", "8000")))
@@ -12,10 +12,13 @@ NEW: Now with conversational AI, multi-URL comparison, and educational responses
 
 import streamlit as st
 import re
+import time
 from typing import Optional, List, Dict
-from deliverable1_3 import analyze_url_credibility
 from conversational_ai import ConversationalAI, Intent
 from search_engine import SearchEngine
+from scoring_profile import start_watching
+from session_history import AnalysisHistory, MessageLog
+from job_runner import JobRunner, Job, CANCELLED, TIMED_OUT, URL_QUEUED, URL_RUNNING, URL_DONE, URL_FAILED
 from urllib.parse import urlparse
 
 # Configure Streamlit page
@@ -25,6 +28,9 @@ st.set_page_config(
     layout="centered"
 )
 
+# Hot-reload scoring_profile.json (weights, tranches, domains) without restarting the worker
+profile_watcher = start_watching()
+
 # Initialize conversational AI
 if "ai" not in st.session_state:
     st.session_state.ai = ConversationalAI()
@@ -33,12 +39,32 @@ if "ai" not in st.session_state:
 if "search" not in st.session_state:
     st.session_state.search = SearchEngine()
 
+# Session limits: long-running sessions stay bounded instead of slowing down per message
+MAX_MESSAGES = 200          # Retained chat messages (older ones are summarized)
+MAX_ANALYZED_URLS = 100     # Analyses kept in the URL-keyed history
+RENDER_PAGE_SIZE = 30       # Messages drawn per rerun; "Show earlier" pages back
+
+# Background analysis: the script thread only submits jobs and polls them between reruns
+JOB_TIMEOUT_SECONDS = 180
+POLL_INTERVAL_SECONDS = 0.5
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """One background job runner per server process, shared by every session."""
+    return JobRunner(max_workers=4)
+
 # Initialize enhanced session state
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = MessageLog(MAX_MESSAGES, url_extractor=st.session_state.ai.extract_urls)
 
 if "analyzed_urls" not in st.session_state:
-    st.session_state.analyzed_urls = []  # History of all analyzed URLs
+    st.session_state.analyzed_urls = AnalysisHistory(MAX_ANALYZED_URLS)  # Latest analysis per URL
+
+if "render_limit" not in st.session_state:
+    st.session_state.render_limit = RENDER_PAGE_SIZE
+
+if "active_job" not in st.session_state:
+    st.session_state.active_job = None  # Job currently analyzing/searching for this session
 
 if "last_analysis" not in st.session_state:
     st.session_state.last_analysis = None
@@ -133,6 +159,11 @@ def format_search_results_response(search_results: List[Dict], analyzed_results:
     # Sort by credibility score
     sorted_results = sorted(analyzed_results, key=lambda x: x.get('final_score', 0) if x.get('success') else -1, reverse=True)
     
+    # Index search results by URL once instead of scanning them for every result,
+    # spelled the way analysis results report it
+    from deliverable1_3 import _normalize_url
+    search_by_url = {_normalize_url(sr['url']): sr for sr in search_results}
+    
     response = f"🔎 **Found {len(search_results)} sources. Here they are ranked by credibility:**\n\n"
     
     for i, result in enumerate(sorted_results, 1):
@@ -140,7 +171,7 @@ def format_search_results_response(search_results: List[Dict], analyzed_results:
             continue
         
         # Find original search result for title/snippet
-        search_result = next((sr for sr in search_results if sr['url'] == result['url']), None)
+        search_result = search_by_url.get(result['url'])
         
         emoji_map = {
             "Poor": "🔴",
@@ -212,6 +243,104 @@ def format_comparison_response(results: List[dict]) -> str:
     
     return response
 
+def record_analysis(result: dict, count_stats: bool = True):
+    """Add a successful analysis to the session history (and stats)."""
+    if not result.get('success'):
+        return
+    st.session_state.analyzed_urls.add(result)
+    if count_stats:
+        st.session_state.session_stats['total_analyzed'] += 1
+        if result['final_score'] >= 0.8:
+            st.session_state.session_stats['highly_credible'] += 1
+
+def finish_job(job: Job) -> str:
+    """
+    Turn a finished (or cancelled / timed out) job into the assistant's reply
+    and update session state with its results.
+    """
+    intent_type = job.meta.get('intent')
+    results = job.ordered_results()
+    
+    note = ""
+    if job.status == CANCELLED:
+        note = "⏹️ **Cancelled.** Showing the results that finished before cancelling.\n\n"
+    elif job.status == TIMED_OUT:
+        note = f"⏱️ **Timed out** after {JOB_TIMEOUT_SECONDS} seconds. Showing the results that finished in time.\n\n"
+    
+    if job.kind == 'search':
+        if job.error:
+            return note + f"❌ {job.error}"
+        if not job.search_results:
+            return note + "❌ No search results found. Try rephrasing your question."
+        
+        # Clear previous search results to prevent stale data
+        st.session_state.analyzed_urls.clear()
+        analyzed_results = [r for r in results if r.get('success')]
+        for result in analyzed_results:
+            record_analysis(result)
+        st.session_state.last_analysis = analyzed_results[0] if analyzed_results else None
+        return note + format_search_results_response(job.search_results, analyzed_results)
+    
+    if intent_type == 'compare':
+        # Previously analyzed URLs were reused; merge them with the new results in order
+        known = job.meta.get('known', {})
+        ordered = [known.get(url) or job.results.get(url) for url in job.meta['order']]
+        ordered = [r for r in ordered if r is not None]
+        for result in results:
+            record_analysis(result, count_stats=False)
+        return note + format_comparison_response(ordered)
+    
+    if len(job.urls) == 1:
+        # Single URL analysis
+        if not results:
+            return note + f"❌ **Error**: Analysis of `{job.urls[0]}` did not finish."
+        result = results[0]
+        if result.get('success'):
+            st.session_state.last_analysis = result
+        record_analysis(result)
+        return note + format_credibility_response(result, include_suggestions=True)
+    
+    # Multiple URL comparison
+    for result in results:
+        record_analysis(result)
+    st.session_state.last_analysis = results[0] if results else None
+    return note + format_comparison_response(results)
+
+def render_active_job():
+    """
+    Show progress and partial results for the running job, then poll again.
+    Each poll is a short rerun, so the chat input and Cancel button stay live.
+    """
+    job = st.session_state.active_job.poll()
+    
+    if job.done:
+        response = finish_job(job)
+        st.session_state.messages.append({"role": "assistant", "content": response})
+        get_job_runner().forget(job.id)
+        st.session_state.active_job = None
+        st.rerun()
+    
+    status_icons = {URL_QUEUED: "⏳", URL_RUNNING: "🔄", URL_DONE: "✅", URL_FAILED: "❌"}
+    with st.chat_message("assistant"):
+        completed, total = job.progress
+        if total == 0:
+            st.progress(0.0, text="🔎 Searching for sources...")
+        else:
+            st.progress(completed / total, text=f"Analyzed {completed} of {total} URLs")
+            for url in job.urls:
+                state = job.url_status.get(url)
+                line = f"{status_icons.get(state, '⚪')} `{url}`"
+                result = job.results.get(url)
+                if result and result.get('success'):
+                    line += f" — {result['tranche']} ({result['final_score']:.2f})"
+                st.markdown(line)
+        if st.button("⏹️ Cancel", key=f"cancel-{job.id}"):
+            job.cancel()
+            st.rerun()
+    
+    time.sleep(POLL_INTERVAL_SECONDS)
+    st.rerun()
+
 # App Title and Description
 st.title("🔍 URL Credibility Checker AI")
 st.markdown("""
@@ -231,8 +360,17 @@ Welcome! I'm your **intelligent credibility assistant with search capabilities**
 - Learn: `How do you score URLs?`
 """)
 
-# Display chat history
-for message in st.session_state.messages:
+# Display chat history (only the latest page; older messages on demand)
+if st.session_state.messages.summary:
+    st.info(st.session_state.messages.summary)
+
+if len(st.session_state.messages) > st.session_state.render_limit:
+    hidden = len(st.session_state.messages) - st.session_state.render_limit
+    if st.button(f"⬆️ Show earlier messages ({hidden} hidden)"):
+        st.session_state.render_limit += RENDER_PAGE_SIZE
+        st.rerun()
+
+for message in st.session_state.messages.window(st.session_state.render_limit):
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
@@ -247,7 +385,7 @@ if prompt := st.chat_input("Ask me anything or send me a URL to check..."):
     
     # Build session context for AI
     session_context = {
-        'previous_urls': [a['url'] for a in st.session_state.analyzed_urls],
+        'previous_urls': st.session_state.analyzed_urls.urls(),
         'last_analysis': st.session_state.last_analysis,
         'stats': st.session_state.session_stats
     }
@@ -257,107 +395,64 @@ if prompt := st.chat_input("Ask me anything or send me a URL to check..."):
     
     # Process based on intent
     with st.chat_message("assistant"):
-        if intent.type == 'search':
-            # Search for sources and analyze them
+        response = None
+        runner = get_job_runner()
+        busy = st.session_state.active_job is not None
+        
+        if intent.type in ('search', 'analyze', 'compare') and busy:
+            response = "⏳ I'm still working on your previous request. Wait for it to finish or press **Cancel**."
+        
+        elif intent.type == 'search':
+            # Search for sources and analyze them in the background
             response_obj = st.session_state.ai.generate_response(intent, session_context)
             if isinstance(response_obj, dict) and response_obj.get('type') == 'search':
                 st.markdown(response_obj['message'])
                 
-                with st.spinner("🔎 Searching and analyzing sources..."):
-                    # Search for sources
-                    search_results = st.session_state.search.search_and_filter(intent.search_query, max_results=8, min_results=5)
-                    
-                    if search_results:
-                        # Clear previous search results to prevent stale data
-                        st.session_state.analyzed_urls = []
-                        
-                        # Analyze each URL
-                        analyzed_results = []
-                        for search_result in search_results:
-                            url = search_result['url']
-                            result = analyze_url_credibility(url)
-                            
-                            if result.get('success'):
-                                analyzed_results.append(result)
-                                st.session_state.analyzed_urls.append(result)
-                                st.session_state.session_stats['total_analyzed'] += 1
-                                
-                                if result['final_score'] >= 0.8:
-                                    st.session_state.session_stats['highly_credible'] += 1
-                        
-                        # Format and display results
-                        response = format_search_results_response(search_results, analyzed_results)
-                        st.session_state.last_analysis = analyzed_results[0] if analyzed_results else None
-                    else:
-                        response = "❌ No search results found. Try rephrasing your question."
+                search_engine = st.session_state.search
+                st.session_state.active_job = runner.submit_search(
+                    intent.search_query,
+                    lambda query: search_engine.search_and_filter(query, max_results=8, min_results=5),
+                    timeout=JOB_TIMEOUT_SECONDS,
+                    meta={'intent': 'search'}
+                )
             else:
                 response = response_obj
         
         elif intent.type == 'analyze':
-            # Analyze single or multiple URLs
-            urls = intent.urls
-            
-            if len(urls) == 1:
-                # Single URL analysis
-                with st.spinner(f"Analyzing {urls[0]}... This may take a moment for the first analysis."):
-                    result = analyze_url_credibility(urls[0])
-                    response = format_credibility_response(result, include_suggestions=True)
-                    
-                    # Update session state
-                    if result.get('success'):
-                        st.session_state.last_analysis = result
-                        st.session_state.analyzed_urls.append(result)
-                        st.session_state.session_stats['total_analyzed'] += 1
-                        
-                        if result['final_score'] >= 0.8:
-                            st.session_state.session_stats['highly_credible'] += 1
-            
-            else:
-                # Multiple URL comparison
-                with st.spinner(f"Analyzing {len(urls)} URLs for comparison..."):
-                    results = []
-                    for url in urls:
-                        result = analyze_url_credibility(url)
-                        results.append(result)
-                        
-                        if result.get('success'):
-                            st.session_state.analyzed_urls.append(result)
-                            st.session_state.session_stats['total_analyzed'] += 1
-                            
-                            if result['final_score'] >= 0.8:
-                                st.session_state.session_stats['highly_credible'] += 1
-                    
-                    response = format_comparison_response(results)
-                    st.session_state.last_analysis = results[0] if results else None
+            # Analyze single or multiple URLs in the background
+            st.markdown(f"🔍 Analyzing {len(intent.urls)} URL{'s' if len(intent.urls) > 1 else ''}... "
+                        "This may take a moment for the first analysis.")
+            st.session_state.active_job = runner.submit_analysis(
+                intent.urls, timeout=JOB_TIMEOUT_SECONDS, meta={'intent': 'analyze'}
+            )
         
         elif intent.type == 'compare':
             # Compare with previous URLs
             if len(intent.urls) > 0:
-                # New URLs provided
-                urls_to_compare = intent.urls
+                # New URLs provided, spelled the way results are stored (https://x.com -> https://x.com/)
+                from deliverable1_3 import _normalize_url
+                urls_to_compare = [_normalize_url(url) for url in intent.urls]
             elif len(st.session_state.analyzed_urls) >= 2:
                 # Compare last two
-                urls_to_compare = [st.session_state.analyzed_urls[-2]['url'], st.session_state.analyzed_urls[-1]['url']]
+                urls_to_compare = [a['url'] for a in st.session_state.analyzed_urls.last(2)]
             else:
                 response = "I need at least 2 URLs to compare. Send me multiple URLs in one message, or analyze another URL first!"
                 st.markdown(response)
                 st.session_state.messages.append({"role": "assistant", "content": response})
                 st.stop()
             
-            with st.spinner("Comparing URLs..."):
-                results = []
-                for url in urls_to_compare:
-                    # Check if already analyzed
-                    existing = next((a for a in st.session_state.analyzed_urls if a['url'] == url), None)
-                    if existing:
-                        results.append(existing)
-                    else:
-                        result = analyze_url_credibility(url)
-                        results.append(result)
-                        if result.get('success'):
-                            st.session_state.analyzed_urls.append(result)
-                
-                response = format_comparison_response(results)
+            # Reuse already analyzed URLs (O(1) URL index); only analyze the rest
+            known = {url: st.session_state.analyzed_urls.get(url) for url in urls_to_compare
+                     if url in st.session_state.analyzed_urls}
+            missing = [url for url in urls_to_compare if url not in known]
+            if missing:
+                st.markdown("📊 Comparing URLs...")
+                st.session_state.active_job = runner.submit_analysis(
+                    missing, timeout=JOB_TIMEOUT_SECONDS,
+                    meta={'intent': 'compare', 'order': urls_to_compare, 'known': known}
+                )
+            else:
+                response = format_comparison_response([known[url] for url in urls_to_compare])
         
         elif intent.type in ['greeting', 'thanks', 'educate', 'chat', 'followup']:
             # Use conversational AI for response
@@ -377,10 +472,12 @@ if prompt := st.chat_input("Ask me anything or send me a URL to check..."):
 Just ask or send me a URL!
             """
         
-        st.markdown(response)
+        if response is not None:
+            st.markdown(response)
     
-    # Add assistant response to chat history
-    st.session_state.messages.append({"role": "assistant", "content": response})
+    # Add assistant response to chat history (background jobs add theirs when they finish)
+    if response is not None:
+        st.session_state.messages.append({"role": "assistant", "content": response})
 
 # Sidebar with enhanced info and stats
 with st.sidebar:
@@ -408,6 +505,9 @@ with st.sidebar:
     - 🔴 0.00-0.19: Poor
     """)
     
+    if profile_watcher.last_error:
+        st.warning(f"Scoring profile edit not applied (previous profile still active): {profile_watcher.last_error}")
+    
     # Session statistics
     st.header("📈 Session Stats")
     stats = st.session_state.session_stats
@@ -423,7 +523,7 @@ with st.sidebar:
     # Recently analyzed URLs
     if st.session_state.analyzed_urls:
         st.header("📚 Recent Analyses")
-        for analysis in reversed(st.session_state.analyzed_urls[-3:]):  # Last 3
+        for analysis in reversed(st.session_state.analyzed_urls.last(3)):  # Last 3
             domain = urlparse(analysis['url']).netloc
             tranche = analysis.get('tranche', 'Unknown')
             
@@ -436,8 +536,12 @@ with st.sidebar:
     st.divider()
     
     if st.button("🗑️ Clear Chat History"):
-        st.session_state.messages = []
-        st.session_state.analyzed_urls = []
+        st.session_state.messages.clear()
+        st.session_state.analyzed_urls.clear()
+        st.session_state.render_limit = RENDER_PAGE_SIZE
+        if st.session_state.active_job is not None:
+            st.session_state.active_job.cancel()
+            st.session_state.active_job = None
         st.session_state.last_analysis = None
         st.session_state.session_stats = {
             'total_analyzed': 0,
@@ -445,3 +549,7 @@ with st.sidebar:
             'topics': []
         }
         st.rerun()
+
+# Poll the background job last, after the chat input and sidebar have rendered
+if st.session_state.active_job is not None:
+    render_active_job()
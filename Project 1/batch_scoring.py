@@ -0,0 +1,142 @@
+"""
+Vectorized Scoring Module for URL Credibility Checker
+Array-based versions of aggregate_scores and score_tranche for offline re-scoring
+
+Stored component scores are laid out as an (n, 3) matrix with columns in
+COMPONENTS order, so re-weighting is one matrix-vector product and tranche
+assignment is one np.digitize call. Only NumPy is needed: no model or network.
+Weights and tranche cutoffs default to the active scoring profile, the same one
+aggregate_scores and score_tranche use.
+
+A missing component score (failed or partial analysis) is NaN, never 0, so such a
+row gets no score or tranche and rescore() reports it as an error instead.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+import numpy as np
+
+from scoring_profile import COMPONENTS, ScoringProfile, get_profile
+
+ScoreBatch = Union[np.ndarray, Mapping[str, Sequence[float]], Sequence[dict]]
+Weights = Union[Mapping[str, float], Sequence[float], np.ndarray]
+
+
+def component_matrix(scores: ScoreBatch) -> np.ndarray:
+    """
+    Normalize a batch of component scores into an (n, 3) float matrix.
+
+    Args:
+        scores: One of
+            - an (n, 3) array with columns in COMPONENTS order
+            - a column batch: mapping (dict, DataFrame) of component name -> values
+            - a list of analysis results (dicts with 'individual_scores')
+
+    Returns:
+        np.ndarray of shape (n, 3); NaN where a score is missing, and for
+        every component of a failed analysis (success=False)
+    """
+    if isinstance(scores, np.ndarray):
+        matrix = np.asarray(scores, dtype=float)
+    elif hasattr(scores, 'keys'):
+        matrix = np.column_stack([np.asarray(scores[c], dtype=float) for c in COMPONENTS])
+    else:
+        matrix = np.array([_score_row(r) for r in scores], dtype=float).reshape(-1, len(COMPONENTS))
+
+    if matrix.ndim != 2 or matrix.shape[1] != len(COMPONENTS):
+        raise ValueError(f"Component scores must have shape (n, {len(COMPONENTS)}), got {matrix.shape}")
+    return matrix
+
+
+def _score_row(result: dict) -> List[Optional[float]]:
+    if result.get('success') is False:
+        return [None] * len(COMPONENTS)
+    individual = result.get('individual_scores', result)
+    return [individual.get(c) for c in COMPONENTS]
+
+
+def weight_vector(weights: Optional[Weights] = None) -> np.ndarray:
+    """Convert weights (dict keyed by component, or sequence in COMPONENTS order) to a vector."""
+    if weights is None:
+        return get_profile().weight_vector
+    if hasattr(weights, 'keys'):
+        return np.array([weights[c] for c in COMPONENTS], dtype=float)
+
+    vector = np.asarray(weights, dtype=float)
+    if vector.shape != (len(COMPONENTS),):
+        raise ValueError(f"Expected {len(COMPONENTS)} weights, got shape {vector.shape}")
+    return vector
+
+
+def aggregate_scores_array(scores: ScoreBatch, weights: Optional[Weights] = None,
+                           decimals: Optional[int] = 2) -> np.ndarray:
+    """
+    Weighted final scores for a whole batch in one matrix-vector product.
+    Rows with a missing component score come out as NaN.
+
+    Args:
+        scores: Batch of component scores (see component_matrix)
+        weights: Component weights; defaults to the active profile's
+        decimals: Round like aggregate_scores does; None keeps full precision
+
+    Returns:
+        np.ndarray of shape (n,) with final scores
+    """
+    final_scores = component_matrix(scores) @ weight_vector(weights)
+    if decimals is not None:
+        final_scores = np.round(final_scores, decimals)
+    return final_scores
+
+
+def score_tranche_array(final_scores: Union[Sequence[float], np.ndarray],
+                        cutoffs: Optional[Sequence[float]] = None,
+                        labels: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Assign tranches to an array of scores with np.digitize.
+
+    A score equal to a cutoff falls in the higher tranche, matching score_tranche.
+    Cutoffs and labels default to the active profile's.
+
+    Returns:
+        np.ndarray of tranche labels (object dtype), same shape as final_scores;
+        None where the score is NaN
+    """
+    if cutoffs is None or labels is None:
+        profile = get_profile()
+        cutoffs = profile.tranche_cutoffs if cutoffs is None else cutoffs
+        labels = profile.tranche_labels if labels is None else labels
+    if len(labels) != len(cutoffs) + 1:
+        raise ValueError("Need exactly one more tranche label than cutoffs")
+    values = np.asarray(final_scores, dtype=float)
+    tranches = np.asarray(labels, dtype=object)[np.digitize(values, np.asarray(cutoffs, dtype=float))]
+    tranches[np.isnan(values)] = None    # digitize would put NaN in the top tranche
+    return tranches
+
+
+def rescore(scores: ScoreBatch, profile: Optional[ScoringProfile] = None,
+            weights: Optional[Weights] = None) -> Dict[str, np.ndarray]:
+    """
+    Re-weight and re-tranche a batch of stored component scores.
+
+    Args:
+        scores: Batch of component scores (see component_matrix)
+        profile: Profile supplying weights and tranches; defaults to the active one
+        weights: Optional override of the profile's weights (e.g. when trying new weights)
+
+    Returns:
+        dict with 'final_score', 'tranche' and 'error' arrays. Rows that could not be
+        scored have a NaN score, no tranche and an error: the analysis's own error for
+        a failed result, otherwise the missing components. 'error' is None elsewhere.
+    """
+    profile = profile or get_profile()
+    matrix = component_matrix(scores)
+    final_scores = aggregate_scores_array(matrix, profile.weight_vector if weights is None else weights)
+    errors = np.full(len(matrix), None, dtype=object)
+    for i in np.flatnonzero(np.isnan(matrix).any(axis=1)):
+        result = scores[i] if isinstance(scores, Sequence) and isinstance(scores[i], dict) else {}
+        missing = [c for c, value in zip(COMPONENTS, matrix[i]) if np.isnan(value)]
+        errors[i] = result.get('error') or f"Missing component scores: {', '.join(missing)}"
+    return {
+        'final_score': final_scores,
+        'tranche': score_tranche_array(final_scores, profile.tranche_cutoffs, profile.tranche_labels),
+        'error': errors
+    }
@@ -0,0 +1,153 @@
+"""
+Component Result Store for URL Credibility Checker
+Persists each component result (credibility, fact_check, citations) per URL with the
+version tag of the code/config that produced it
+
+Backed by SQLite from the standard library, so the history survives restarts and can
+be shared by the chatbot, the CLI and offline re-scoring jobs. Re-scoring compares the
+stored version tags with the current ones and only recomputes what is stale.
+
+The store also keeps each page's HTTP validators (ETag, Last-Modified) and the hash of
+its extracted text, used by the fetch layer for conditional re-validation.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "CREDIBILITY_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "credibility_history.sqlite3")
+)
+
+
+def _decode(result: str) -> Optional[Dict]:
+    """Stored result JSON -> dict, or None for a corrupt row (treated as never stored)."""
+    try:
+        value = json.loads(result)
+    except (TypeError, ValueError):
+        return None
+    return value if isinstance(value, dict) else None
+
+
+class ComponentStore:
+    """
+    URL -> component -> (version, result) store.
+    Safe to share across threads; every call runs under one lock on one connection.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS components (
+                    url TEXT NOT NULL,
+                    component TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (url, component)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def get(self, url: str, component: str) -> Optional[Tuple[str, Dict]]:
+        """Return (version, result) for one component, or None if never stored or unreadable."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, result FROM components WHERE url = ? AND component = ?",
+                (url, component)
+            ).fetchone()
+        result = _decode(row[1]) if row else None
+        return (row[0], result) if result is not None else None
+
+    def get_all(self, url: str) -> Dict[str, Tuple[str, Dict]]:
+        """
+        Return {component: (version, result)} for every stored component of a URL.
+        Corrupt rows are left out, so callers recompute and overwrite them.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT component, version, result FROM components WHERE url = ?", (url,)
+            ).fetchall()
+        decoded = {component: (version, _decode(result)) for component, version, result in rows}
+        return {component: entry for component, entry in decoded.items() if entry[1] is not None}
+
+    def put(self, url: str, component: str, version: str, result: Dict) -> None:
+        """Store (or replace) one component result."""
+        self.put_many(url, {component: (version, result)})
+
+    def put_many(self, url: str, components: Dict[str, Tuple[str, Dict]]) -> None:
+        """Store several component results for a URL in one transaction."""
+        now = time.time()
+        rows = [(url, c, v, json.dumps(r), now) for c, (v, r) in components.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO components (url, component, version, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def urls(self) -> List[str]:
+        """Every URL with at least one stored component."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT url FROM components ORDER BY url")]
+
+    def iter_stale(self, component: str, version: str) -> Iterator[str]:
+        """URLs whose stored `component` was produced by a different version."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM components WHERE component = ? AND version != ?", (component, version)
+            ).fetchall()
+        return (row[0] for row in rows)
+
+    def get_page(self, url: str) -> Optional[Dict[str, Optional[str]]]:
+        """Stored {'etag', 'last_modified', 'content_hash'} for a page, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_hash FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(zip(('etag', 'last_modified', 'content_hash'), row)) if row else None
+
+    def put_page(self, url: str, validators: Dict[str, Optional[str]]) -> None:
+        """Store the validators and content hash from the latest fetch of a page."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, validators.get('etag'), validators.get('last_modified'),
+                 validators.get('content_hash'), time.time())
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ========== SHARED STORE (SINGLETON) ==========
+_store: Optional[ComponentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_component_store() -> ComponentStore:
+    """Lazily open the default store once per process and reuse it."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ComponentStore()
+    return _store
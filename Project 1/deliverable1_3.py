@@ -1,14 +1,18 @@
 from typing import Optional, Tuple
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlsplit, urlunsplit
 import requests
 import re
 from bs4 import BeautifulSoup
-from typing import Dict, Union
+from typing import Dict, List, Union
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from scoring_profile import COMPONENTS, ScoringProfile, get_profile
+from component_store import ComponentStore
+from fetch import FetchedPage, fetch_page
 
 # ========== MODEL LOADING (SINGLETON PATTERN) ==========
 # Load model once at module level for performance
+MODEL_NAME = "mrm8488/bert-tiny-finetuned-fake-news-detection"
 _model = None
 _tokenizer = None
 
@@ -21,8 +25,8 @@ def _get_model_and_tokenizer():
     
     if _model is None or _tokenizer is None:
         try:
-            _tokenizer = AutoTokenizer.from_pretrained("mrm8488/bert-tiny-finetuned-fake-news-detection")
-            _model = AutoModelForSequenceClassification.from_pretrained("mrm8488/bert-tiny-finetuned-fake-news-detection")
+            _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+            _model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
             _model.eval()
         except Exception as e:
             raise RuntimeError(f"Failed to load BERT model: {e}")
@@ -60,12 +64,25 @@ def prompt_for_url(prompt: str = "Enter a URL (scheme optional, e.g. example.com
 
         print("Invalid URL — enter a host (example.com) or a full URL including http:// or https://, or press Enter to cancel.")
 
+class URLValidationError(ValueError):
+    """The URL is malformed, or the page could not be fetched / answered with an error status."""
+
+def _check_url_format(url: str) -> Tuple[bool, str]:
+    """Syntactic check: http/https scheme and a host."""
+    parsed = urlparse(url)
+    if parsed.scheme.lower() not in ("http", "https") or not parsed.netloc:
+        return False, "Invalid URL format: must include http:// or https:// and a host"
+    return True, ""
+
 def validate_url(url: str, timeout: int = 10) -> Tuple[bool, str]:
     """
     Validate a URL by:
       1) Ensuring it has http/https scheme and a host.
-      2) Attempting a quick HTTP GET with the given timeout (seconds).
-         We use stream=True to avoid downloading the whole body.
+      2) Fetching it once through the shared fetch layer (robots.txt, rate limits,
+         negative cache and circuit breaker apply) with the given timeout.
+
+    Callers that go on to score the page should call fetch_page() and use
+    FetchedPage.reachability instead, so one GET serves both validation and scoring.
 
     Returns:
       (True, "") on success
@@ -75,49 +92,19 @@ def validate_url(url: str, timeout: int = 10) -> Tuple[bool, str]:
       - This will raise no exceptions to the caller; all network errors are converted to False + message.
       - timeout is the maximum number of seconds to wait for the connection + response.
     """
-    # Basic syntactic check
-    parsed = urlparse(url)
-    if parsed.scheme.lower() not in ("http", "https") or not parsed.netloc:
-        return False, "Invalid URL format: must include http:// or https:// and a host"
-
-    try:
-        # Prefer HEAD to be light; fallback to GET if HEAD not allowed/returns 405.
-        try:
-            resp = requests.head(url, timeout=timeout, allow_redirects=True)
-            # Some servers respond 405 Method Not Allowed to HEAD; treat as fallback
-            if resp.status_code == 405:
-                raise RuntimeError("HEAD not allowed, falling back to GET")
-        except (requests.exceptions.RequestException, RuntimeError):
-            # Fallback to GET (streamed) to avoid downloading full body
-            resp = requests.get(url, timeout=timeout, stream=True, allow_redirects=True)
-
-        # Consider successful if we got any 2xx or 3xx response
-        if 200 <= resp.status_code < 400:
-            return True, ""
-
-        # Treat 403 as "reachable but blocked" (many commercial sites block programmatic clients)
-        if resp.status_code == 403:
-            return True, f"Reachable but blocked (HTTP {resp.status_code})"
-
-        # Other non-success status codes are treated as failures
-        return False, f"Server returned HTTP {resp.status_code}"
-    except requests.exceptions.Timeout:
-        return False, f"Request timed out after {timeout} seconds"
-    except requests.exceptions.SSLError as e:
-        return False, f"SSL error: {e}"
-    except requests.exceptions.ConnectionError as e:
-        return False, f"Connection error: {e}"
-    except Exception as e:
-        return False, f"Unexpected error: {e}"
+    ok, reason = _check_url_format(url)
+    if not ok:
+        return ok, reason
+    return fetch_page(url, timeout=timeout).reachability
 
-def evaluate_reference_credibility(url: str) -> Dict[str, Union[float, str]]:
+def evaluate_reference_credibility(url: str, page: Optional[FetchedPage] = None) -> Dict[str, Union[float, str]]:
     """
     Simple credibility evaluator.
 
-    Fetches the HTML at a given URL, extracts visible text, and runs a tiny
-    BERT fake-news classifier (mrm8488/bert-tiny-finetuned-fake-news-detection)
-    on the content (max 512 tokens). Returns a dictionary with a probability
-    credibility_score and an explanation string.
+    Fetches the HTML at a given URL (or uses the already fetched `page`), extracts
+    visible text, and runs a tiny BERT fake-news classifier
+    (mrm8488/bert-tiny-finetuned-fake-news-detection) on the content (max 512 tokens).
+    Returns a dictionary with a probability credibility_score and an explanation string.
 
     Returns
     -------
@@ -130,11 +117,15 @@ def evaluate_reference_credibility(url: str) -> Dict[str, Union[float, str]]:
     except Exception as e:
         return {"credibility_score": 0.0, "explanation": f"Init error: {e}"}
 
-    # fetch
+    # fetch (unless the caller already fetched the page for all evaluators)
     try:
-        r = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        text = " ".join(BeautifulSoup(r.text, "html.parser").stripped_strings)
+        if page is None:
+            page = fetch_page(url, timeout=10)
+        if page.error:
+            raise RuntimeError(page.error)
+        if page.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{page.status_code} Error for url: {url}")
+        text = page.text
         if not text:
             return {"credibility_score": 0.0, "explanation": "No text extracted"}
     except Exception as e:
@@ -166,17 +157,21 @@ def evaluate_reference_credibility(url: str) -> Dict[str, Union[float, str]]:
     except Exception as e:
         return {"credibility_score": 0.0, "explanation": f"Model eval failed: {e}"}
 
-def evaluate_fact_check(url: str) -> Dict[str, Union[float, str]]:
+def evaluate_fact_check(url: str, profile: Optional[ScoringProfile] = None) -> Dict[str, Union[float, str]]:
     """
     Basic fact-checking evaluation based on known fact-checking sources and scientific journals.
+    The authoritative domain list and scores come from the active scoring profile.
     
     Args:
         url (str): The URL to evaluate
+        profile (ScoringProfile): Profile to score with (defaults to the active one)
         
     Returns:
         dict: Contains 'fact_check_score' (float) and 'explanation' (str)
     """
     try:
+        profile = profile or get_profile()
+
         # Parse the URL
         parsed_url = urlparse(url)
         domain = parsed_url.netloc.lower()
@@ -185,138 +180,30 @@ def evaluate_fact_check(url: str) -> Dict[str, Union[float, str]]:
         if domain.startswith('www.'):
             domain = domain[4:]
             
-        # Define authoritative sources and their scores
-        authoritative_sources = {
-            # Government Health & Science Organizations
-            'ncbi.nlm.nih.gov': 0.95,
-            'nih.gov': 0.9,
-            'cdc.gov': 0.7,
-            'fda.gov': 0.85,
-            'who.int': 0.8,
-            'hhs.gov': 0.8,
-            'health.gov': 0.8,
-            'europa.eu': 0.8,
-            'canada.ca': 0.8,
-            'gov.uk': 0.8,
-
-            # Academic & Research Institutions
-            'mayoclinic.org': 0.9,
-            'hopkinsmedicine.org': 0.9,
-            'medlineplus.gov': 0.9,
-            'clevelandclinic.org': 0.9,
-            'stanfordhealthcare.org': 0.9,
-            'mskcc.org': 0.9,
-            'massgeneral.org': 0.9,
-            'uchicagomedicine.org': 0.9,
-            'ucl.ac.uk': 0.9,
-            'ox.ac.uk': 0.9,
-            'harvard.edu': 0.9,
-            'mit.edu': 0.9,
-            'caltech.edu': 0.9,
-
-            # Scientific Journals & Publishers
-            'nature.com': 0.9,
-            'science.org': 0.9,
-            'thelancet.com': 0.9,
-            'nejm.org': 0.9,
-            'jamanetwork.com': 0.9,
-            'bmj.com': 0.9,
-            'cell.com': 0.9,
-            'plos.org': 0.9,
-            'springer.com': 0.9,
-            'sciencedirect.com': 0.85,
-
-            # Medical & Research Databases
-            'cochrane.org': 0.9,
-            'clinicaltrials.gov': 0.9,
-            'scopus.com': 0.85,
-            'pubmed.ncbi.nlm.nih.gov': 0.95,
-            'researchgate.net': 0.8,
-            'semanticscholar.org': 0.8,
-
-            # Technological Journals & Engineering Sources
-            'ieee.org': 0.9,
-            'acm.org': 0.9,
-            'computingreviews.com': 0.85,
-            'techscience.com': 0.85,
-            'arxiv.org': 0.85,
-            'engineering.com': 0.8,
-            'spectrum.ieee.org': 0.85,
-            'nasa.gov': 0.9,
-            'esa.int': 0.85,
-            'nist.gov': 0.9,
-            'usenix.org': 0.85,
-            'siggraph.org': 0.85,
-
-            # Finance & Economics
-            'imf.org': 0.9,
-            'worldbank.org': 0.9,
-            'bis.org': 0.9,
-            'oecd.org': 0.9,
-            'treasury.gov': 0.9,
-            'sec.gov': 0.9,
-            'federalreserve.gov': 0.9,
-            'bea.gov': 0.9,
-            'bls.gov': 0.9,
-            'edgar.sec.gov': 0.9,
-            'morningstar.com': 0.8,
-            'statista.com': 0.8,
-
-            # Law, Government & Policy
-            'supremecourt.gov': 0.9,
-            'gao.gov': 0.9,
-            'cbo.gov': 0.9,
-            'crsreports.congress.gov': 0.9,
-            'congress.gov': 0.9,
-            'justice.gov': 0.9,
-            'law.cornell.edu': 0.9,
-            'uscourts.gov': 0.9,
-
-            # Standards & Industry Bodies
-            'iso.org': 0.9,
-            'w3.org': 0.9,
-            'ietf.org': 0.9,
-            'icann.org': 0.85,
-            'etsi.org': 0.85,
-            'ansi.org': 0.85,
-
-            # General Reference & Encyclopedias
-            'britannica.com': 0.85,
-            'stanford.edu/entries': 0.85,
-            'internetencyclopediaofphilosophy.org': 0.85,
-
-            # Business & Market Intelligence
-            'forrester.com': 0.85,
-            'gartner.com': 0.85,
-            'pitchbook.com': 0.85,
-            'cbinsights.com': 0.85,
-            'crunchbase.com': 0.8
-        }        
         # Basic scoring logic
-        score = 0.5  # Default score
+        score = profile.fact_check_default
         explanation = []
         
-        # Check if it's a known authoritative source
-        for source, source_score in authoritative_sources.items():
-            if domain == source or domain.endswith('.' + source):
-                score = source_score
-                explanation.append(f"Recognized authoritative source ({source})")
-                break
+        # Check if it's a known authoritative source (indexed suffix lookup)
+        match = profile.match_domain(domain)
+        if match:
+            source, score = match
+            explanation.append(f"Recognized authoritative source ({source})")
                 
         # Additional score for .gov domains not in our list
-        if domain.endswith('.gov') and score == 0.5:
-            score = 0.8
+        if domain.endswith('.gov') and not match:
+            score = profile.gov_score
             explanation.append("Government domain")
             
         # Additional score for academic institutions
         if domain.endswith('.edu'):
-            score = max(score, 0.8)
+            score = max(score, profile.edu_score)
             explanation.append("Academic institution")
             
         # Check for scientific article indicators in URL
         path = parsed_url.path.lower()
-        if any(x in path for x in ['/article/', '/research/', '/study/', '/paper/']):
-            score = min(score + 0.05, 1.0)
+        if any(x in path for x in profile.article_markers):
+            score = min(score + profile.article_bonus, 1.0)
             explanation.append("Scientific article indicators")
             
         return {
@@ -330,28 +217,34 @@ def evaluate_fact_check(url: str) -> Dict[str, Union[float, str]]:
             "explanation": f"Error evaluating URL: {str(e)}"
         }
 
-def evaluate_citations(url: str) -> Dict[str, Union[float, str]]:
+def evaluate_citations(url: str, profile: Optional[ScoringProfile] = None,
+                       page: Optional[FetchedPage] = None) -> Dict[str, Union[float, str]]:
     """
     Evaluates citation count and reference quality from webpage content.
+    Citation thresholds and the DOI bonus come from the active scoring profile.
     
     Args:
         url (str): The URL to evaluate
+        profile (ScoringProfile): Profile to score with (defaults to the active one)
+        page (FetchedPage): Already fetched page to reuse instead of downloading again
         
     Returns:
         dict: Contains 'citation_score' (float) and 'explanation' (str)
     """
     try:
-        # Fetch the webpage content
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        profile = profile or get_profile()
+
+        # Fetch the webpage content (unless already fetched for all evaluators)
+        if page is None:
+            page = fetch_page(url, timeout=10)
+        if page.error:
+            raise RuntimeError(page.error)
+        html = page.html or ""
+        soup = BeautifulSoup(html, 'html.parser')
         
         # Initialize counters and score
         citation_count = 0
         reference_count = 0
-        score = 0.5  # Default score
         explanation = []
         
         # Find citations in different formats
@@ -360,7 +253,7 @@ def evaluate_citations(url: str) -> Dict[str, Union[float, str]]:
         citation_count += len(cite_tags)
         
         # Look for numbered references [1], [2], etc.
-        numbered_refs = re.findall(r'\[\d+\]', response.text)
+        numbered_refs = re.findall(r'\[\d+\]', html)
         citation_count += len(numbered_refs)
         
         # Look for reference or bibliography section
@@ -377,23 +270,14 @@ def evaluate_citations(url: str) -> Dict[str, Union[float, str]]:
         # Calculate score based on citations
         total_citations = max(citation_count, reference_count)
         
+        score = profile.citation_score(total_citations)
         if total_citations > 0:
-            # Adjust score based on number of citations
-            if total_citations >= 50:
-                score = 0.9
-            elif total_citations >= 30:
-                score = 0.8
-            elif total_citations >= 15:
-                score = 0.7
-            elif total_citations >= 5:
-                score = 0.6
-            
             explanation.append(f"Found {total_citations} citations/references")
             
         # Look for DOI references
-        doi_refs = re.findall(r'doi\.org/\d+\.\d+/\S+', response.text)
+        doi_refs = re.findall(r'doi\.org/\d+\.\d+/\S+', html)
         if doi_refs:
-            score += 0.1
+            score += profile.doi_bonus
             explanation.append(f"Found {len(doi_refs)} DOI references")
             score = min(score, 1.0)
             
@@ -410,16 +294,13 @@ def evaluate_citations(url: str) -> Dict[str, Union[float, str]]:
             "citation_count": 0
         }
 
-def aggregate_scores(result_credibility, result_fact_check, result_citations):
+def aggregate_scores(result_credibility, result_fact_check, result_citations,
+                     profile: Optional[ScoringProfile] = None):
     """
     Aggregates individual scores into a final weighted score.
+    Weights come from the active scoring profile.
     """
-    # Define weights for each score component
-    weights = {
-        'credibility': 0.35,
-        'fact_check': 0.35,
-        'citations': 0.3
-    }
+    weights = (profile or get_profile()).weights
     
     # Extract scores
     scores = {
@@ -436,40 +317,171 @@ def aggregate_scores(result_credibility, result_fact_check, result_citations):
         'individual_scores': scores
     }
 
-def score_tranche(score: float):
+def score_tranche(score: float, profile: Optional[ScoringProfile] = None):
     """
     Converts a numeric score into a qualitative tranche.
+    Cutoffs and labels come from the active scoring profile.
     
     Args:
         score (float): The numeric score (0.0 to 1.0)
+        profile (ScoringProfile): Profile to score with (defaults to the active one)
         
     Returns:
-        str: The qualitative tranche ("Poor", "Fair", "Good", "Very Good", "Excellent")
+        dict: {"score": score, "tranche": "Poor" | "Fair" | "Good" | "Very Good" | "Excellent"}
     """
-    tranche = ""
-    if score < 0.2:
-        tranche = "Poor"
-    elif score < 0.4:
-        tranche = "Fair"
-    elif score < 0.6:
-        tranche = "Good"
-    elif score < 0.8:
-        tranche = "Very Good"
-    else:
-        tranche = "Excellent"
+    tranche = (profile or get_profile()).tranche(score)
     
     final_result = {"score": score, "tranche": tranche}
     return final_result
 
+# ========== COMPONENT VERSIONS (INCREMENTAL RE-SCORING) ==========
+
+# Bump a component's code version whenever its scoring logic changes, so results
+# stored by the old logic are recomputed on the next re-score.
+COMPONENT_CODE_VERSIONS = {
+    'credibility': '1',
+    'fact_check': '1',
+    'citations': '1'
+}
+
+# Components that need the page itself; fact_check only looks at the URL
+NETWORK_COMPONENTS = ('credibility', 'citations')
+
+def component_versions(profile: Optional[ScoringProfile] = None) -> Dict[str, str]:
+    """
+    Version tag for each component: its code version plus the model or profile
+    section it depends on. Weights and tranches are not part of any tag because
+    aggregation is always recomputed from the stored component scores.
+    """
+    profile = profile or get_profile()
+    return {
+        'credibility': f"{COMPONENT_CODE_VERSIONS['credibility']}:{MODEL_NAME}",
+        'fact_check': f"{COMPONENT_CODE_VERSIONS['fact_check']}:{profile.section_versions['fact_check']}",
+        'citations': f"{COMPONENT_CODE_VERSIONS['citations']}:{profile.section_versions['citations']}"
+    }
+
+def _evaluate_component(component: str, url: str, profile: ScoringProfile,
+                        page: Optional[FetchedPage] = None) -> Dict[str, Union[float, str]]:
+    """Run a single component evaluator, sharing one fetched page across evaluators."""
+    if component == 'credibility':
+        return evaluate_reference_credibility(url, page)
+    if component == 'fact_check':
+        return evaluate_fact_check(url, profile)
+    return evaluate_citations(url, profile, page)
+
+def _evaluate_with_store(url: str, profile: ScoringProfile, store: Optional[ComponentStore],
+                         revalidate: bool) -> Tuple[Dict[str, Dict], List[str], Optional[FetchedPage]]:
+    """
+    Evaluate all components for a URL, reusing stored results where possible.
+
+    A stored component is reused when its version tag is current and, for components
+    that read the page, the page is unchanged: the server answered 304 to a conditional
+    request, or the extracted text hashes to the stored value. With revalidate=False
+    (offline re-score) current network components are reused without asking the server.
+
+    The page fetch doubles as URL validation: an unreachable page raises
+    URLValidationError before any component is evaluated.
+
+    Returns:
+        (components, recomputed component names, fetched page or None)
+    """
+    versions = component_versions(profile)
+    stored = store.get_all(url) if store is not None else {}
+    current = {c for c in COMPONENTS if c in stored and stored[c][0] == versions[c]}
+    needs_page = revalidate or any(c not in current for c in NETWORK_COMPONENTS)
+
+    page = None
+    page_unchanged = not revalidate
+    if needs_page:
+        validators = store.get_page(url) if store is not None else None
+        page = fetch_page(url, timeout=10, validators=validators)
+        page_unchanged = page.not_modified or (
+            page.ok and validators is not None and page.content_hash == validators.get('content_hash')
+        )
+        if page.not_modified and any(c not in current for c in NETWORK_COMPONENTS):
+            # Page unchanged but stored scores are outdated: fetch the body once
+            page = fetch_page(url, timeout=10)
+        ok, reason = page.reachability
+        if not ok:
+            raise URLValidationError(reason)
+
+    reusable = {c for c in current if page_unchanged or c not in NETWORK_COMPONENTS}
+    recomputed = [c for c in COMPONENTS if c not in reusable]
+    components = {c: stored[c][1] for c in reusable}
+    components.update({c: _evaluate_component(c, url, profile, page) for c in recomputed})
+
+    if store is not None:
+        # Never persist scores computed from a failed fetch, or they would be
+        # reused the next time the page hashes the same
+        fetched_ok = page is not None and page.ok
+        if fetched_ok and not page.not_modified:
+            store.put_page(url, page.validators)
+        fresh = {c: (versions[c], components[c]) for c in recomputed
+                 if fetched_ok or c not in NETWORK_COMPONENTS}
+        if fresh:
+            store.put_many(url, fresh)
+
+    return components, recomputed, page
+
+def _normalize_url(url: str) -> str:
+    """
+    Prepend https:// to host-only inputs such as example.com, and lower-case the scheme
+    and host and give an empty path "/", so every spelling of one page (HTTPS://X.com,
+    https://x.com/) shares one analysis and one store entry.
+    """
+    # Inputs with another scheme (ftp://...) are left for the format check to reject
+    if url and '://' not in url:
+        if '.' in url and ' ' not in url:
+            url = 'https://' + url
+    parts = urlsplit(url)
+    if parts.scheme.lower() in ('http', 'https') and parts.netloc:
+        userinfo, at, host = parts.netloc.rpartition('@')
+        url = urlunsplit((parts.scheme.lower(), userinfo + at + host.lower(), parts.path or '/',
+                          parts.query, parts.fragment))
+    return url
+
+def _build_result(url: str, components: Dict[str, Dict], profile: ScoringProfile,
+                  page: Optional[FetchedPage] = None) -> Dict[str, Union[float, str, dict]]:
+    """Aggregate component results into the analysis dict returned to callers."""
+    result_credibility = components['credibility']
+    result_fact_check = components['fact_check']
+    result_citations = components['citations']
+
+    # Aggregate scores
+    aggregated = aggregate_scores(result_credibility, result_fact_check, result_citations, profile)
+    final_score = aggregated['final_score']
+    tranche_result = score_tranche(final_score, profile)
+
+    result = {
+        "success": True,
+        "url": url,
+        "final_score": final_score,
+        "tranche": tranche_result['tranche'],
+        "individual_scores": aggregated['individual_scores'],
+        "explanations": {
+            "credibility": result_credibility.get('explanation', ''),
+            "fact_check": result_fact_check.get('explanation', ''),
+            "citations": result_citations.get('explanation', '')
+        }
+    }
+    if page is not None:
+        result["final_url"] = page.final_url or url
+        result["redirects"] = page.redirects or []
+    return result
+
 # ========== CHATBOT INTEGRATION FUNCTION ==========
 
-def analyze_url_credibility(url: str) -> Dict[str, Union[float, str, dict]]:
+def analyze_url_credibility(url: str, store: Optional[ComponentStore] = None) -> Dict[str, Union[float, str, dict]]:
     """
     Main integration function for chatbot usage.
     Validates URL, runs all credibility checks, and returns formatted results.
+    A single GET both validates the URL and supplies the page to every evaluator.
     
     Args:
         url (str): The URL to analyze (can be with or without http/https)
+        store (ComponentStore): Optional store of versioned component results and page
+            validators. With a store the page is fetched conditionally (If-None-Match /
+            If-Modified-Since) and unchanged pages reuse their stored scores
         
     Returns:
         dict: Complete analysis results with the following structure:
@@ -480,69 +492,109 @@ def analyze_url_credibility(url: str) -> Dict[str, Union[float, str, dict]]:
                 "tranche": str,
                 "individual_scores": dict,
                 "explanations": dict,
+                "final_url": str (after redirects, when the page was fetched),
+                "redirects": list of (status, url) hops (when the page was fetched),
+                "recomputed": list (only with a store),
                 "error": str (only if success=False)
             }
     """
     # Normalize URL if needed
-    if url and not url.startswith(('http://', 'https://')):
-        if '.' in url and ' ' not in url:
-            url = 'https://' + url
+    url = _normalize_url(url)
     
-    # Validate URL
-    ok, reason = validate_url(url, timeout=10)
-    if not ok:
+    # Run all credibility checks; the page fetch validates the URL
+    try:
+        ok, reason = _check_url_format(url)
+        if not ok:
+            raise URLValidationError(reason)
+
+        # One profile snapshot for the whole analysis, so a hot reload cannot mix profiles
+        profile = get_profile()
+
+        components, recomputed, page = _evaluate_with_store(url, profile, store, revalidate=True)
+
+        result = _build_result(url, components, profile, page)
+        if store is not None:
+            result["recomputed"] = recomputed
+        return result
+    except URLValidationError as e:
         return {
             "success": False,
             "url": url,
-            "error": f"URL validation failed: {reason}"
+            "error": f"URL validation failed: {e}"
         }
-    
-    # Run all credibility checks
+    except Exception as e:
+        return {
+            "success": False,
+            "url": url,
+            "error": f"Analysis failed: {str(e)}"
+        }
+
+def rescore_url(url: str, store: ComponentStore, profile: Optional[ScoringProfile] = None) -> Dict[str, Union[float, str, dict]]:
+    """
+    Re-score a URL, recomputing only the components whose version changed.
+
+    Stored components with a current version tag are reused as-is. The page is only
+    fetched (and the model only run) if a network component is stale, so a profile
+    change that only touches fact-check domains never goes to the network; that
+    fetch also validates the URL.
+
+    Returns:
+        dict: Same structure as analyze_url_credibility, plus "recomputed": list of
+        the components that had to be re-evaluated
+    """
+    url = _normalize_url(url)
     try:
-        result_credibility = evaluate_reference_credibility(url)
-        result_fact_check = evaluate_fact_check(url)
-        result_citations = evaluate_citations(url)
-        
-        # Aggregate scores
-        aggregated = aggregate_scores(result_credibility, result_fact_check, result_citations)
-        final_score = aggregated['final_score']
-        tranche_result = score_tranche(final_score)
-        
+        profile = profile or get_profile()
+        components, recomputed, page = _evaluate_with_store(url, profile, store, revalidate=False)
+
+        result = _build_result(url, components, profile, page)
+        result["recomputed"] = recomputed
+        return result
+    except URLValidationError as e:
         return {
-            "success": True,
+            "success": False,
             "url": url,
-            "final_score": final_score,
-            "tranche": tranche_result['tranche'],
-            "individual_scores": aggregated['individual_scores'],
-            "explanations": {
-                "credibility": result_credibility.get('explanation', ''),
-                "fact_check": result_fact_check.get('explanation', ''),
-                "citations": result_citations.get('explanation', '')
-            }
+            "error": f"URL validation failed: {e}"
         }
     except Exception as e:
         return {
             "success": False,
             "url": url,
-            "error": f"Analysis failed: {str(e)}"
+            "error": f"Re-score failed: {str(e)}"
         }
 
+def rescore_history(store: ComponentStore, profile: Optional[ScoringProfile] = None) -> List[Dict[str, Union[float, str, dict]]]:
+    """Re-score every URL in the store against one profile snapshot."""
+    profile = profile or get_profile()
+    return [rescore_url(url, store, profile) for url in store.urls()]
+
 # ========== MAIN (CLI MODE) ==========
 
-if __name__ == "__main__":
+def main():
+    """
+    Interactive CLI: prompt for a URL, validate it and print its credibility scores.
+    Shared by deliverable1.py so both entry points behave the same.
+    """
     url = prompt_for_url()
     if not url:
         print("No URL entered — exiting.")
     else:
-        ok, reason = validate_url(url, timeout=10)
+        # One GET validates the URL and feeds both page evaluators
+        ok, reason = _check_url_format(url)
+        page = fetch_page(url, timeout=10) if ok else None
+        if page is not None:
+            ok, reason = page.reachability
         if ok:
             print("URL is valid and reachable. Checking credibility now...")
-            result_credibility = evaluate_reference_credibility(url)
+            result_credibility = evaluate_reference_credibility(url, page)
             result_fact_check = evaluate_fact_check(url)
-            result_citations = evaluate_citations(url)
+            result_citations = evaluate_citations(url, page=page)
 
             results = aggregate_scores(result_credibility, result_fact_check, result_citations)
             print("Final Score:", score_tranche(results.get("final_score")))
             print("Individual Scores:", results.get("individual_scores"))
         else:
-            print("URL validation failed:", reason)
\ No newline at end of file
+            print("URL validation failed:", reason)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Fetch Layer for URL Credibility Checker
+One place where pages are downloaded, shared by every evaluator
+
+- One GET per analysis establishes reachability (status, final URL after redirects)
+  and feeds both evaluate_reference_credibility and evaluate_citations
+- Conditional requests: stored ETag / Last-Modified are sent back as
+  If-None-Match / If-Modified-Since, and a 304 means the stored scores still apply
+- Content hashing: a SHA-256 of the extracted text detects pages that were
+  re-served with a fresh timestamp but identical content
+- Connections are pooled per thread with requests.Session
+- Every request goes through the FetchScheduler (robots.txt, per-host rate limits,
+  Retry-After, global concurrency ceiling), including each hop of a redirect
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+import hashlib
+import threading
+
+import requests
+from bs4 import BeautifulSoup
+
+from fetch_scheduler import get_scheduler
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+MAX_REDIRECTS = 10
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Per-thread pooled session (requests.Session is not safe to share across threads)."""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        _local.session = session
+    return session
+
+
+def extract_text(html: str) -> str:
+    """Visible text of an HTML page, whitespace-normalized."""
+    return " ".join(BeautifulSoup(html, "html.parser").stripped_strings)
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of extracted page text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class FetchedPage:
+    """Result of fetching a page once for all evaluators."""
+    url: str
+    status_code: int
+    html: Optional[str] = None          # None when the server answered 304
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+    error: Optional[str] = None         # Set when the request itself failed
+    final_url: Optional[str] = None     # URL after following redirects
+    redirects: Optional[List[Tuple[int, str]]] = None   # (status, url) of each hop
+    _text: Optional[str] = None
+    _hash: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status_code < 400
+
+    @property
+    def reachability(self) -> Tuple[bool, str]:
+        """
+        Validation verdict for the page: (True, "") if it answered 2xx/3xx,
+        (True, note) for 403 (reachable but blocked), otherwise (False, reason).
+        """
+        if self.error:
+            return False, self.error
+        if 200 <= self.status_code < 400:
+            return True, ""
+        # Many commercial sites block programmatic clients; the page still exists
+        if self.status_code == 403:
+            return True, f"Reachable but blocked (HTTP {self.status_code})"
+        return False, f"Server returned HTTP {self.status_code}"
+
+    @property
+    def text(self) -> str:
+        """Extracted visible text, parsed lazily and only once."""
+        if self._text is None:
+            self._text = extract_text(self.html or "")
+        return self._text
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        if self._hash is None and self.html is not None:
+            self._hash = content_hash(self.text)
+        return self._hash
+
+    @property
+    def validators(self) -> Dict[str, Optional[str]]:
+        return {'etag': self.etag, 'last_modified': self.last_modified, 'content_hash': self.content_hash}
+
+
+def _gate(scheduler, url: str, timeout: int) -> Optional[str]:
+    """Scheduler checks before a request to `url`; returns the reason to give up, if any."""
+    failure = scheduler.check(url)
+    if failure:
+        return failure
+    if not scheduler.allowed(url, timeout=timeout):
+        # No request goes out, so a half-open circuit's probe must not stay taken
+        scheduler.release(url)
+        return "Disallowed by robots.txt"
+    return None
+
+
+def _get(scheduler, url: str, headers: Dict[str, str], timeout: int):
+    """
+    One GET without following redirects, through the host's slot.
+    Returns (response, None) or (None, error); failures are recorded with the scheduler.
+    """
+    # One retry when the server asks us to come back soon (429/503 + Retry-After);
+    # the scheduler holds every request to that host until then
+    for attempt in range(2):
+        error = None
+        try:
+            with scheduler.slot(url):
+                resp = get_session().get(url, headers=headers, timeout=timeout, allow_redirects=False)
+        except requests.exceptions.Timeout:
+            error, host_failure = f"Request timed out after {timeout} seconds", True
+        except requests.exceptions.SSLError as e:
+            error, host_failure = f"SSL error: {e}", True
+        except requests.exceptions.ConnectionError as e:
+            error, host_failure = f"Connection error: {e}", True
+        except Exception as e:
+            error, host_failure = f"Unexpected error: {e}", False
+        if error:
+            scheduler.record_failure(url, error, host_failure)
+            return None, error
+
+        retry_after = scheduler.note_response(url, resp.status_code, resp.headers)
+        if attempt == 1 or retry_after is None or retry_after > scheduler.max_retry_after:
+            break
+        resp.close()
+
+    # 5xx count against the host; other 4xx (except 403) only against this URL
+    if resp.status_code >= 400 and resp.status_code != 403:
+        scheduler.record_failure(url, f"Server returned HTTP {resp.status_code}",
+                                 host_failure=resp.status_code >= 500)
+    else:
+        scheduler.record_success(url)
+    return resp, None
+
+
+def fetch_page(url: str, timeout: int = 10, validators: Optional[Dict[str, Optional[str]]] = None) -> FetchedPage:
+    """
+    GET a page, conditionally if validators from a previous fetch are given.
+
+    Args:
+        url: Page to fetch
+        timeout: Seconds to wait for connect + response
+        validators: Stored {'etag', 'last_modified', 'content_hash'} for this URL
+
+    Returns:
+        FetchedPage; on 304 it carries the stored validators and no body.
+        Network errors are never raised: they come back as status_code 0 with `error` set.
+        Redirects are followed here, hop by hop, so every host on the way gets the
+        scheduler's checks (negative cache, circuit, robots.txt, rate limit); the hops
+        are recorded in `redirects` / `final_url`.
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    scheduler = get_scheduler()
+    redirects: List[Tuple[int, str]] = []
+    current = url
+    while True:
+        error = _gate(scheduler, current, timeout)
+        if error is None:
+            resp, error = _get(scheduler, current, headers, timeout)
+        if error:
+            return FetchedPage(url=url, status_code=0, error=error, final_url=current, redirects=redirects)
+        location = resp.headers.get('Location')
+        if resp.status_code not in REDIRECT_STATUSES or not location:
+            break
+        resp.close()
+        if len(redirects) == MAX_REDIRECTS:
+            return FetchedPage(url=url, status_code=0, error=f"More than {MAX_REDIRECTS} redirects",
+                               final_url=current, redirects=redirects)
+        redirects.append((resp.status_code, current))
+        current = urljoin(current, location)
+
+    try:
+        if resp.status_code == 304 and validators:
+            return FetchedPage(
+                url=url,
+                status_code=304,
+                etag=resp.headers.get('ETag') or validators.get('etag'),
+                last_modified=resp.headers.get('Last-Modified') or validators.get('last_modified'),
+                not_modified=True,
+                final_url=current,
+                redirects=redirects,
+                _hash=validators.get('content_hash')
+            )
+        return FetchedPage(
+            url=url,
+            status_code=resp.status_code,
+            html=resp.text,
+            etag=resp.headers.get('ETag'),
+            last_modified=resp.headers.get('Last-Modified'),
+            final_url=current,
+            redirects=redirects
+        )
+    finally:
+        resp.close()
@@ -0,0 +1,335 @@
+"""
+Fetch Scheduler for URL Credibility Checker
+Per-host politeness for every outgoing request
+
+- Token bucket per host: at most `per_host_rate` requests/second after a short burst
+- Per-host and global concurrency ceilings (semaphores)
+- robots.txt fetched once per host and cached for `robots_ttl` seconds
+- Retry-After on 429/503 blocks the host until the given time for all workers
+- Negative cache: a failed URL fails fast for `negative_ttl` seconds
+- Circuit breaker per host: opens after repeated timeouts / connection errors / 5xx,
+  then lets a single probe through once the cool-down has passed
+
+Waiting for a host's rate limit happens before taking a global slot, so a busy host
+never ties up slots that requests to other hosts could use.
+"""
+
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket using reservations: a caller takes a token now
+    (possibly driving the balance negative) and sleeps for the returned delay.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; return seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class NegativeCache:
+    """Short-TTL memory of failed URLs: key -> failure reason."""
+
+    def __init__(self, ttl: float = 60, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def put(self, key: str, reason: str) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= self.max_size:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (reason, time.monotonic() + self.ttl)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive host failures.
+    Open -> half-open after `cooldown` seconds: one probe request is let through;
+    its success closes the circuit, its failure re-opens it for another cool-down.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+            # Half-open: one probe at a time (a probe that never reports expires after a cool-down)
+            if self._probe_started is None or now - self._probe_started > self.cooldown:
+                self._probe_started = now
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """The half-open probe was let through but sent no request; let the next caller probe."""
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_started = None
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: int, concurrency: int,
+                 failure_threshold: int, cooldown: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.blocked_until = 0.0            # monotonic time set from Retry-After
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_expires = 0.0
+        self.robots_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class FetchScheduler:
+    """
+    Gatekeeper for outgoing requests. Share one instance per process (get_scheduler()).
+
+    Args:
+        per_host_rate: Sustained requests per second per host
+        per_host_burst: Requests allowed back-to-back before the rate applies
+        per_host_concurrency: Simultaneous requests per host
+        max_concurrency: Simultaneous requests overall
+        robots_ttl: Seconds to cache a host's robots.txt
+        respect_robots: Check robots.txt before fetching
+        max_retry_after: Longest Retry-After (seconds) worth waiting for inline
+        user_agent: Agent name matched against robots.txt rules
+        negative_ttl: Seconds a failed URL keeps failing fast
+        failure_threshold: Consecutive host failures that open its circuit
+        cooldown: Seconds an open circuit waits before letting a probe through
+    """
+
+    def __init__(self, per_host_rate: float = 2.0, per_host_burst: int = 4,
+                 per_host_concurrency: int = 2, max_concurrency: int = 16,
+                 robots_ttl: float = 3600, respect_robots: bool = True,
+                 max_retry_after: float = 30, user_agent: str = "*",
+                 negative_ttl: float = 60, failure_threshold: int = 3, cooldown: float = 30):
+        self.per_host_rate = per_host_rate
+        self.per_host_burst = per_host_burst
+        self.per_host_concurrency = per_host_concurrency
+        self.robots_ttl = robots_ttl
+        self.respect_robots = respect_robots
+        self.max_retry_after = max_retry_after
+        self.user_agent = user_agent
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._negative = NegativeCache(negative_ttl)
+        self._global = threading.BoundedSemaphore(max_concurrency)
+        self._hosts: Dict[str, _HostState] = {}
+        self._hosts_lock = threading.Lock()
+
+    def _host(self, url: str) -> Tuple[str, _HostState]:
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc.lower()}"
+        with self._hosts_lock:
+            state = self._hosts.get(key)
+            if state is None:
+                state = _HostState(self.per_host_rate, self.per_host_burst, self.per_host_concurrency,
+                                   self.failure_threshold, self.cooldown)
+                self._hosts[key] = state
+        return key, state
+
+    @contextmanager
+    def slot(self, url: str):
+        """Wait for the host's Retry-After block and rate limit, then hold host + global slots."""
+        _, state = self._host(url)
+
+        blocked = state.blocked_until - time.monotonic()
+        if blocked > 0:
+            time.sleep(blocked)
+        delay = state.bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        with state.semaphore:
+            with self._global:
+                yield
+
+    def note_response(self, url: str, status_code: int, headers) -> Optional[float]:
+        """
+        Record a response; on 429/503 with Retry-After, block the host for that long.
+        Returns the Retry-After delay in seconds, if any.
+        """
+        if status_code not in (429, 503):
+            return None
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if delay is None:
+            return None
+        _, state = self._host(url)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+        return delay
+
+    def check(self, url: str) -> Optional[str]:
+        """
+        Fail-fast gate, called before any network work.
+        Returns a failure reason if the URL failed recently or its host's circuit is open.
+        """
+        cached = self._negative.get(url)
+        if cached is not None:
+            return f"{cached} (cached failure)"
+        _, state = self._host(url)
+        if not state.breaker.allow():
+            return "Host temporarily unavailable (circuit open after repeated failures)"
+        return None
+
+    def release(self, url: str) -> None:
+        """check() passed but no request was sent (e.g. robots.txt said no): free the host's probe."""
+        self._host(url)[1].breaker.release_probe()
+
+    def record_success(self, url: str) -> None:
+        """The host answered; close its circuit and forget any cached failure for the URL."""
+        self._host(url)[1].breaker.record_success()
+        self._negative.discard(url)
+
+    def record_failure(self, url: str, reason: str, host_failure: bool = True) -> None:
+        """
+        Remember a failed URL. host_failure marks timeouts, connection errors and 5xx,
+        which count towards opening the host's circuit; other failures (e.g. 404)
+        prove the host is alive.
+        """
+        self._negative.put(url, reason)
+        breaker = self._host(url)[1].breaker
+        if host_failure:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def allowed(self, url: str, timeout: int = 10) -> bool:
+        """Check robots.txt (fetched at most once per host per robots_ttl)."""
+        if not self.respect_robots:
+            return True
+        key, state = self._host(url)
+        with state.robots_lock:
+            if state.robots is None or time.monotonic() > state.robots_expires:
+                state.robots = self._load_robots(key + "/robots.txt", timeout)
+                state.robots_expires = time.monotonic() + self.robots_ttl
+            return state.robots.can_fetch(self.user_agent, url)
+
+    def _load_robots(self, robots_url: str, timeout: int) -> RobotFileParser:
+        # Local import: fetch.py imports this module
+        from fetch import get_session
+
+        parser = RobotFileParser(robots_url)
+        try:
+            with self.slot(robots_url):
+                resp = get_session().get(robots_url, timeout=timeout)
+            breaker = self._host(robots_url)[1].breaker
+            if resp.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            try:
+                self.note_response(robots_url, resp.status_code, resp.headers)
+                # A robots.txt behind 401/403 says nothing about crawling: sites that block
+                # bots still get their page fetched and scored as reachable but blocked
+                if resp.status_code >= 400:
+                    parser.allow_all = True
+                else:
+                    parser.parse(resp.text.splitlines())
+            finally:
+                resp.close()
+        except Exception:
+            # Unreachable robots.txt: don't let it block scoring, but count it against the host
+            self._host(robots_url)[1].breaker.record_failure()
+            parser.allow_all = True
+        return parser
+
+
+# ========== SHARED SCHEDULER (SINGLETON) ==========
+_scheduler: Optional[FetchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FetchScheduler:
+    """Lazily create the process-wide scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FetchScheduler()
+    return _scheduler
+
+
+def set_scheduler(scheduler: FetchScheduler) -> None:
+    """Replace the process-wide scheduler (e.g. with different limits for batch runs)."""
+    global _scheduler
+    _scheduler = scheduler
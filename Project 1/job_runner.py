@@ -0,0 +1,283 @@
+"""
+Background Job Runner for URL Credibility Checker
+Runs analysis and search jobs on a thread pool so callers never block on them
+
+A Job fans its URLs out to the pool (one task per URL) and records per-URL status
+and partial results as they finish. Callers poll the job (the Streamlit app does so
+between reruns), cancel it, or let it time out; cancelling drops queued URLs and
+ignores results that arrive afterwards. Threads rather than processes are used so
+every worker shares the singleton model, the fetch sessions and the result store.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+import threading
+import time
+import uuid
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+FINAL_STATES = (DONE, CANCELLED, TIMED_OUT)
+
+# Per-URL states
+URL_QUEUED = "queued"
+URL_RUNNING = "running"
+URL_DONE = "done"
+URL_FAILED = "failed"
+URL_SKIPPED = "skipped"
+URL_FINAL_STATES = (URL_DONE, URL_FAILED, URL_SKIPPED)
+
+
+class Job:
+    """
+    One analysis or search request and its progress.
+    All mutation happens under a lock; read through snapshot() or the helpers.
+    """
+
+    def __init__(self, kind: str, timeout: Optional[float] = None, meta: Optional[dict] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind                    # 'analyze' or 'search'
+        self.meta = meta or {}              # Caller context (e.g. intent type)
+        self.created_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.deadline = self.created_at + timeout if timeout else None
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.search_results: Optional[List[Dict[str, str]]] = None
+        self.urls: List[str] = []
+        self.url_status: Dict[str, str] = {}
+        self.results: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._futures: List[Future] = []
+
+    # ----- state transitions (called by JobRunner) -----
+
+    def _add_urls(self, urls: Iterable[str]) -> List[str]:
+        added = []
+        with self._lock:
+            for url in urls:
+                if url not in self.url_status:
+                    self.urls.append(url)
+                    self.url_status[url] = URL_QUEUED
+                    added.append(url)
+            if self.status == PENDING:
+                self.status = RUNNING
+        return added
+
+    def _start_url(self, url: str) -> bool:
+        """Mark a URL as running; False if the job was stopped meanwhile."""
+        with self._lock:
+            if self.status in FINAL_STATES:
+                return False
+            self.url_status[url] = URL_RUNNING
+            return True
+
+    def _record(self, url: str, result: dict) -> None:
+        with self._lock:
+            if self.status in FINAL_STATES:
+                return
+            self.results[url] = result
+            self.url_status[url] = URL_DONE if result.get('success') else URL_FAILED
+            self._maybe_finish()
+
+    def _fail(self, error: str) -> None:
+        with self._lock:
+            if self.status not in FINAL_STATES:
+                self.error = error
+                self._finish(DONE)
+
+    def _maybe_finish(self) -> None:
+        if self.status == RUNNING and all(s in URL_FINAL_STATES for s in self.url_status.values()):
+            self._finish(DONE)
+
+    def _finish(self, status: str) -> None:
+        self.finished_at = time.monotonic()    # Set first: eviction reads it once status is final
+        self.status = status
+        self._finished.set()
+
+    def _stop(self, status: str) -> None:
+        with self._lock:
+            if self.status in FINAL_STATES:
+                return
+            for url, state in self.url_status.items():
+                if state not in URL_FINAL_STATES:
+                    self.url_status[url] = URL_SKIPPED
+            self._finish(status)
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+    # ----- public API -----
+
+    def cancel(self) -> None:
+        """Stop the job: queued URLs are dropped and late results ignored."""
+        self._stop(CANCELLED)
+
+    def poll(self) -> "Job":
+        """Enforce the timeout; call this whenever the job is checked."""
+        if self.deadline is not None and not self.done and time.monotonic() > self.deadline:
+            self._stop(TIMED_OUT)
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job reaches a final state (for scripts and tests)."""
+        end = None if timeout is None else time.monotonic() + timeout
+        while not self._finished.is_set():
+            remaining = None if end is None else end - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            step = 0.1 if remaining is None else min(0.1, remaining)
+            self._finished.wait(step)
+            self.poll()
+        return self.done
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_STATES
+
+    @property
+    def progress(self) -> tuple:
+        """(finished URLs, total URLs)"""
+        with self._lock:
+            finished = sum(1 for s in self.url_status.values() if s in URL_FINAL_STATES)
+            return finished, len(self.url_status)
+
+    def ordered_results(self) -> List[dict]:
+        """Results received so far, in submission order."""
+        with self._lock:
+            return [self.results[u] for u in self.urls if u in self.results]
+
+    def snapshot(self) -> dict:
+        """JSON-friendly view of the job."""
+        self.poll()
+        with self._lock:
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "error": self.error,
+                "url_status": dict(self.url_status),
+                "completed": sum(1 for s in self.url_status.values() if s in URL_FINAL_STATES),
+                "total": len(self.url_status),
+                "results": [self.results[u] for u in self.urls if u in self.results],
+                "search_results": self.search_results,
+            }
+
+
+class JobRunner:
+    """
+    Thread pool that executes Jobs. Share one runner per process.
+
+    Finished jobs stay available through get() for finished_ttl seconds; past that,
+    or once more than max_jobs are registered, the oldest finished jobs are dropped
+    so a long-running server does not keep every result it ever produced. Running
+    jobs are never evicted, and callers holding a Job keep it regardless.
+
+    Args:
+        analyze_fn: url -> analysis dict; defaults to analyze_url_credibility with the shared store
+        max_workers: Concurrent URL analyses across all jobs
+        finished_ttl: Seconds a finished job stays registered
+        max_jobs: Registered jobs kept before the oldest finished ones are dropped
+    """
+
+    def __init__(self, analyze_fn: Optional[Callable[[str], dict]] = None, max_workers: int = 4,
+                 finished_ttl: float = 600, max_jobs: int = 200):
+        if analyze_fn is None:
+            from deliverable1_3 import analyze_url_credibility
+            from component_store import get_component_store
+
+            def analyze_fn(url):
+                return analyze_url_credibility(url, store=get_component_store())
+        self.analyze_fn = analyze_fn
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="credibility-job")
+        self.finished_ttl = finished_ttl
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = {}     # Insertion order = submission order
+        self._jobs_lock = threading.Lock()
+
+    def _evict(self) -> None:
+        """Drop expired finished jobs, then the oldest finished ones over max_jobs. Caller holds _jobs_lock."""
+        cutoff = time.monotonic() - self.finished_ttl
+        finished = [job for job in self._jobs.values() if job.poll().done]
+        excess = len(self._jobs) - self.max_jobs
+        for job in finished:
+            if job.finished_at <= cutoff or excess > 0:
+                del self._jobs[job.id]
+                excess -= 1
+
+    def _register(self, job: Job) -> Job:
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._jobs_lock:
+            self._evict()
+            job = self._jobs.get(job_id)
+        return job.poll() if job else None
+
+    def forget(self, job_id: str) -> None:
+        """Drop a finished job from the registry."""
+        with self._jobs_lock:
+            self._jobs.pop(job_id, None)
+
+    def _submit_urls(self, job: Job, urls: Iterable[str]) -> None:
+        added = job._add_urls(urls)
+        for url in added:
+            future = self._pool.submit(self._run_url, job, url)
+            with job._lock:
+                job._futures.append(future)
+        with job._lock:
+            job._maybe_finish()
+
+    def _run_url(self, job: Job, url: str) -> None:
+        if not job._start_url(url):
+            return
+        try:
+            result = self.analyze_fn(url)
+        except Exception as e:
+            result = {"success": False, "url": url, "error": f"Analysis failed: {e}"}
+        job._record(url, result)
+
+    def submit_analysis(self, urls: List[str], timeout: Optional[float] = 120,
+                        meta: Optional[dict] = None) -> Job:
+        """Analyze URLs concurrently; duplicates are analyzed once."""
+        job = self._register(Job("analyze", timeout, meta))
+        self._submit_urls(job, urls)
+        return job
+
+    def submit_search(self, query: str, search_fn: Callable[[str], List[Dict[str, str]]],
+                      timeout: Optional[float] = 180, meta: Optional[dict] = None) -> Job:
+        """Run a search, then analyze every result URL concurrently."""
+        job = self._register(Job("search", timeout, meta))
+        with job._lock:
+            job.status = RUNNING
+
+        def run_search():
+            try:
+                results = search_fn(query) or []
+            except Exception as e:
+                job._fail(f"Search failed: {e}")
+                return
+            with job._lock:
+                if job.status in FINAL_STATES:
+                    return
+                job.search_results = results
+                if not results:
+                    job._finish(DONE)
+                    return
+            self._submit_urls(job, [r['url'] for r in results])
+
+        future = self._pool.submit(run_search)
+        with job._lock:
+            job._futures.append(future)
+        return job
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
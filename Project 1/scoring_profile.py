@@ -0,0 +1,291 @@
+"""
+Scoring Profile Module for URL Credibility Checker
+Loads weights, tranche cutoffs, citation thresholds and the authoritative domain list
+from scoring_profile.json, with hot reload
+
+A profile is validated once when loaded and turned into an immutable ScoringProfile
+with its lookup indexes already built. Workers read the active profile through
+get_profile(); a watcher thread reloads the file when it changes and swaps the
+reference in one assignment, so a running worker never sees a half-built profile
+and never has to restart (or reload the model) to pick up new scoring.
+"""
+
+from dataclasses import dataclass, field
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Component order shared with batch_scoring's score matrices
+COMPONENTS = ('credibility', 'fact_check', 'citations')
+
+DEFAULT_PROFILE_PATH = os.environ.get(
+    "CREDIBILITY_PROFILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_profile.json")
+)
+
+
+def _fingerprint(data) -> str:
+    """Short stable hash of a JSON-serializable config section."""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """Validated, immutable scoring configuration plus its derived indexes."""
+    weights: Mapping[str, float]
+    tranche_cutoffs: Tuple[float, ...]
+    tranche_labels: Tuple[str, ...]
+    citation_default: float
+    citation_thresholds: Tuple[Tuple[int, float], ...]  # (min_count, score), highest first
+    doi_bonus: float
+    fact_check_default: float
+    gov_score: float
+    edu_score: float
+    article_bonus: float
+    article_markers: Tuple[str, ...]
+    authoritative_sources: Mapping[str, float]
+    version: str
+    section_versions: Mapping[str, str]
+    source: Optional[str] = None
+    # Derived indexes, rebuilt on every load
+    weight_vector: np.ndarray = field(init=False, repr=False, compare=False)
+    _domain_index: Mapping[str, Tuple[int, str, float]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        vector = np.array([self.weights[c] for c in COMPONENTS], dtype=float)
+        vector.setflags(write=False)
+        object.__setattr__(self, 'weight_vector', vector)
+
+        # domain -> (priority, source, score); priority keeps the original
+        # "first listed source wins" behaviour of the linear scan
+        index = {
+            source: (rank, source, score)
+            for rank, (source, score) in enumerate(self.authoritative_sources.items())
+        }
+        object.__setattr__(self, '_domain_index', MappingProxyType(index))
+
+    def match_domain(self, domain: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the authoritative source matching `domain` or one of its parent domains.
+
+        Walks the domain's suffixes (a.b.org, b.org, org) through a dict index
+        instead of scanning every source. Returns (source, score) or None.
+        """
+        best = None
+        labels = domain.split('.')
+        for i in range(len(labels)):
+            hit = self._domain_index.get('.'.join(labels[i:]))
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
+        return (best[1], best[2]) if best else None
+
+    def citation_score(self, total_citations: int) -> float:
+        """Score for a citation count using the configured thresholds."""
+        for min_count, score in self.citation_thresholds:
+            if total_citations >= min_count:
+                return score
+        return self.citation_default
+
+    def tranche(self, score: float) -> str:
+        """Qualitative tranche for a score; a score equal to a cutoff falls in the higher tranche."""
+        return self.tranche_labels[bisect_right(self.tranche_cutoffs, score)]
+
+
+def _require_unit(name: str, value) -> float:
+    if not isinstance(value, (int, float)) or not 0.0 <= value <= 1.0:
+        raise ValueError(f"{name} must be a number between 0 and 1, got {value!r}")
+    return float(value)
+
+
+def build_profile(config: Dict, source: Optional[str] = None) -> ScoringProfile:
+    """
+    Validate a raw profile dict and build the immutable ScoringProfile.
+
+    Raises:
+        ValueError: if any section is missing or invalid
+    """
+    try:
+        weights_cfg = config['weights']
+        tranches_cfg = config['tranches']
+        citations_cfg = config['citations']
+        fact_cfg = config['fact_check']
+    except KeyError as e:
+        raise ValueError(f"Scoring profile is missing section {e}")
+
+    # Weights
+    if set(weights_cfg) != set(COMPONENTS):
+        raise ValueError(f"weights must define exactly {list(COMPONENTS)}, got {sorted(weights_cfg)}")
+    weights = {c: _require_unit(f"weights.{c}", weights_cfg[c]) for c in COMPONENTS}
+    if abs(sum(weights.values()) - 1.0) > 1e-6:
+        raise ValueError(f"weights must sum to 1.0, got {sum(weights.values()):.4f}")
+
+    # Tranches
+    cutoffs = tuple(_require_unit("tranches.cutoffs", c) for c in tranches_cfg['cutoffs'])
+    labels = tuple(str(label) for label in tranches_cfg['labels'])
+    if any(a >= b for a, b in zip(cutoffs, cutoffs[1:])):
+        raise ValueError(f"tranches.cutoffs must be strictly increasing, got {list(cutoffs)}")
+    if len(labels) != len(cutoffs) + 1:
+        raise ValueError("tranches.labels must have exactly one more entry than tranches.cutoffs")
+
+    # Citations
+    thresholds = []
+    for entry in citations_cfg['thresholds']:
+        min_count, score = entry
+        if not isinstance(min_count, int) or min_count < 0:
+            raise ValueError(f"citation threshold count must be a non-negative integer, got {min_count!r}")
+        thresholds.append((min_count, _require_unit("citations.thresholds score", score)))
+    thresholds.sort(key=lambda t: t[0], reverse=True)
+
+    # Fact-check domains, flattened in file order (groups are for readability only)
+    sources = {}
+    for group, entries in fact_cfg['authoritative_sources'].items():
+        if not isinstance(entries, dict):
+            raise ValueError(f"authoritative_sources group {group!r} must map domains to scores")
+        for domain, score in entries.items():
+            sources.setdefault(domain.lower(), _require_unit(f"authoritative_sources.{domain}", score))
+
+    return ScoringProfile(
+        weights=MappingProxyType(weights),
+        tranche_cutoffs=cutoffs,
+        tranche_labels=labels,
+        citation_default=_require_unit("citations.default_score", citations_cfg['default_score']),
+        citation_thresholds=tuple(thresholds),
+        doi_bonus=_require_unit("citations.doi_bonus", citations_cfg['doi_bonus']),
+        fact_check_default=_require_unit("fact_check.default_score", fact_cfg['default_score']),
+        gov_score=_require_unit("fact_check.gov_score", fact_cfg['gov_score']),
+        edu_score=_require_unit("fact_check.edu_score", fact_cfg['edu_score']),
+        article_bonus=_require_unit("fact_check.article_bonus", fact_cfg['article_bonus']),
+        article_markers=tuple(m.lower() for m in fact_cfg['article_markers']),
+        authoritative_sources=MappingProxyType(sources),
+        version=_fingerprint(config),
+        section_versions=MappingProxyType({
+            'weights': _fingerprint(weights_cfg),
+            'tranches': _fingerprint(tranches_cfg),
+            'citations': _fingerprint(citations_cfg),
+            'fact_check': _fingerprint(fact_cfg),
+        }),
+        source=source
+    )
+
+
+def load_profile(path: str = DEFAULT_PROFILE_PATH) -> ScoringProfile:
+    """Read, validate and build a profile from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return build_profile(config, source=os.path.abspath(path))
+
+
+# ========== ACTIVE PROFILE (SINGLETON + HOT RELOAD) ==========
+
+_profile: Optional[ScoringProfile] = None
+_profile_lock = threading.Lock()
+_watcher: Optional["ProfileWatcher"] = None
+
+
+def get_profile() -> ScoringProfile:
+    """
+    Return the active profile, loading the default file on first use.
+    Callers should take one snapshot per analysis so a reload cannot mix profiles.
+    """
+    global _profile
+    if _profile is None:
+        with _profile_lock:
+            if _profile is None:
+                try:
+                    _profile = load_profile()
+                except Exception as e:
+                    raise RuntimeError(f"Failed to load scoring profile: {e}")
+    return _profile
+
+
+def set_profile(profile: ScoringProfile) -> None:
+    """Atomically replace the active profile."""
+    global _profile
+    _profile = profile
+
+
+def reload_profile(path: Optional[str] = None) -> ScoringProfile:
+    """
+    Reload the profile from disk and swap it in.
+    If the new file fails validation the current profile stays active and the error is raised.
+    """
+    current = _profile
+    path = path or (current.source if current and current.source else DEFAULT_PROFILE_PATH)
+    profile = load_profile(path)
+    set_profile(profile)
+    return profile
+
+
+class ProfileWatcher(threading.Thread):
+    """
+    Daemon thread that polls the profile file and hot-reloads it on change.
+    Polling os.stat keeps this dependency-free and works on every platform.
+    A failed reload is logged and kept in last_error (None once a reload succeeds)
+    so the app can show why its edits did not take effect.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH, interval: float = 2.0):
+        super().__init__(name="scoring-profile-watcher", daemon=True)
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._last_stat = self._stat()
+        self.last_error: Optional[str] = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last check. Returns True if a new profile was swapped in."""
+        current = self._stat()
+        if current is None or current == self._last_stat:
+            return False
+        self._last_stat = current
+        try:
+            reload_profile(self.path)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Scoring profile reload failed, keeping previous profile: %s", self.last_error)
+            return False
+        self.last_error = None
+        return True
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_watching(path: str = DEFAULT_PROFILE_PATH, interval: float = 2.0) -> ProfileWatcher:
+    """Start (once per process) the background watcher for the profile file."""
+    global _watcher
+    with _profile_lock:
+        if _watcher is None or not _watcher.is_alive():
+            _watcher = ProfileWatcher(path, interval)
+            _watcher.start()
+    get_profile()
+    return _watcher
+
+
+def stop_watching() -> None:
+    """Stop the background watcher if it is running."""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
@@ -0,0 +1,121 @@
+"""
+Session History Module for URL Credibility Checker
+Bounded, indexed containers for the chatbot's per-session state
+
+- AnalysisHistory: recent analyses keyed by URL (O(1) lookup, oldest evicted first)
+- MessageLog: capped chat transcript with a rolling summary of trimmed messages
+  and windowed rendering, so each Streamlit rerun only draws the latest messages
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class AnalysisHistory:
+    """
+    Most recent analysis per URL, in insertion order, capped at max_size entries.
+    Re-analyzing a URL replaces its entry and moves it to the end.
+    """
+
+    def __init__(self, max_size: int = 100):
+        self.max_size = max_size
+        self._by_url: "OrderedDict[str, dict]" = OrderedDict()
+
+    def add(self, result: dict) -> None:
+        url = result['url']
+        self._by_url.pop(url, None)
+        self._by_url[url] = result
+        while len(self._by_url) > self.max_size:
+            self._by_url.popitem(last=False)
+
+    def get(self, url: str) -> Optional[dict]:
+        return self._by_url.get(url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._by_url
+
+    def last(self, n: int) -> List[dict]:
+        """The n most recent analyses, oldest first."""
+        if n <= 0:
+            return []
+        results = []
+        for url in reversed(self._by_url):
+            results.append(self._by_url[url])
+            if len(results) == n:
+                break
+        return results[::-1]
+
+    def urls(self) -> List[str]:
+        return list(self._by_url)
+
+    def clear(self) -> None:
+        self._by_url.clear()
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self._by_url.values())
+
+
+class MessageLog:
+    """
+    Chat transcript that keeps at most max_messages messages.
+
+    Older messages are dropped from memory and folded into a short summary
+    (message counts and the URLs they mentioned) shown at the top of the chat.
+    """
+
+    def __init__(self, max_messages: int = 200, max_summary_urls: int = 20,
+                 url_extractor: Optional[Callable[[str], List[str]]] = None):
+        self.max_messages = max_messages
+        self.max_summary_urls = max_summary_urls
+        self.url_extractor = url_extractor
+        self._messages: List[Dict[str, str]] = []
+        self.archived_count = 0
+        self._archived_urls: "OrderedDict[str, None]" = OrderedDict()
+
+    def append(self, message: Dict[str, str]) -> None:
+        self._messages.append(message)
+        overflow = len(self._messages) - self.max_messages
+        if overflow > 0:
+            self._archive(self._messages[:overflow])
+            del self._messages[:overflow]
+
+    def _archive(self, messages: List[Dict[str, str]]) -> None:
+        self.archived_count += len(messages)
+        if self.url_extractor is None:
+            return
+        for message in messages:
+            if message["role"] != "user":
+                continue
+            for url in self.url_extractor(message["content"]):
+                self._archived_urls.pop(url, None)
+                self._archived_urls[url] = None
+        while len(self._archived_urls) > self.max_summary_urls:
+            self._archived_urls.popitem(last=False)
+
+    @property
+    def summary(self) -> Optional[str]:
+        """One-paragraph summary of trimmed messages, or None if nothing was trimmed."""
+        if not self.archived_count:
+            return None
+        text = f"🗂️ {self.archived_count} earlier messages were archived to keep this session fast."
+        if self._archived_urls:
+            text += " URLs discussed earlier: " + ", ".join(f"`{u}`" for u in self._archived_urls)
+        return text
+
+    def window(self, limit: int) -> List[Dict[str, str]]:
+        """The last `limit` retained messages, for rendering."""
+        return self._messages[-limit:] if limit > 0 else []
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self.archived_count = 0
+        self._archived_urls.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(self._messages)
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("torch")    # api_server imports deliverable1_3, which loads the model code
+
+import api_server
+from fastapi.testclient import TestClient
+
+URLS = ["https://a.org/", "https://b.org/", "https://c.org/"]
+
+
+class StubScorer:
+    """Replaces the analysis behind the endpoints; the slower URLs finish last."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url):
+        with self._lock:
+            self.calls.append(url)
+        time.sleep(self.delays.get(url, 0))
+        # Same shape as a successful analyze_url_credibility result
+        return {
+            "success": True, "url": url, "final_score": 0.5, "tranche": "Good",
+            "individual_scores": {"credibility": 0.5, "fact_check": 0.5, "citations": 0.5},
+            "explanations": {"credibility": "stub", "fact_check": "stub", "citations": "stub"},
+            "final_url": url, "redirects": [],
+        }
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    scorer = StubScorer({URLS[0]: 0.3})
+    monkeypatch.setattr(api_server, "_analyze", scorer)
+    return scorer
+
+
+@pytest.fixture
+def client(scorer):
+    # Not used as a context manager, so the lifespan (model loading) does not run
+    return TestClient(api_server.app)
+
+
+def test_health_and_single_analysis(client, scorer):
+    health = client.get("/health").json()
+    assert health["status"] == "ok" and "profile_version" in health
+
+    response = client.post("/analyze", json={"url": URLS[1]})
+    assert response.status_code == 200 and response.json()["url"] == URLS[1]
+    assert client.post("/analyze", json={}).status_code == 422
+
+
+def test_batch_keeps_request_order_and_is_bounded(client, scorer, monkeypatch):
+    response = client.post("/analyze/batch", json={"urls": URLS})
+    assert [result["url"] for result in response.json()["results"]] == URLS
+
+    assert client.post("/analyze/batch", json={"urls": []}).status_code == 422
+    monkeypatch.setattr(api_server, "MAX_BATCH_SIZE", 2)
+    assert client.post("/analyze/batch", json={"urls": URLS}).status_code == 413
+
+
+def test_stream_yields_results_as_they_finish(client, scorer):
+    response = client.post("/analyze/stream", json={"urls": URLS})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    urls = [json.loads(line)["url"] for line in response.text.splitlines()]
+    assert sorted(urls) == sorted(URLS) and urls[-1] == URLS[0]
+
+
+def test_concurrent_requests_for_one_url_share_an_analysis(client, scorer):
+    response = client.post("/analyze/batch", json={"urls": [URLS[0]] * 3})
+    assert [result["url"] for result in response.json()["results"]] == [URLS[0]] * 3
+    assert scorer.calls == [URLS[0]]
+    assert api_server._in_flight == {}
+
+
+def test_spellings_of_one_url_share_an_analysis(client, scorer):
+    spellings = ["https://a.org", "https://a.org/", "HTTPS://A.org"]
+    response = client.post("/analyze/batch", json={"urls": spellings})
+    assert [result["url"] for result in response.json()["results"]] == ["https://a.org/"] * 3
+    assert scorer.calls == ["https://a.org/"]
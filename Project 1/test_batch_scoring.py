@@ -0,0 +1,96 @@
+import json
+
+import numpy as np
+import pytest
+
+import fetch
+from batch_scoring import aggregate_scores_array, score_tranche_array, rescore
+from fetch_scheduler import FetchScheduler
+from scoring_profile import DEFAULT_PROFILE_PATH, build_profile, load_profile, set_profile
+
+
+def test_aggregate_matches_default_weights():
+    scores = np.array([[0.8, 0.6, 0.5], [0.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    result = aggregate_scores_array(scores)
+    assert np.allclose(result, [0.64, 0.0, 1.0])
+
+
+def test_column_batch_and_custom_weights():
+    columns = {'credibility': [1.0, 0.0], 'fact_check': [0.0, 1.0], 'citations': [0.0, 0.0]}
+    result = aggregate_scores_array(columns, weights={'credibility': 0.5, 'fact_check': 0.25, 'citations': 0.25})
+    assert np.allclose(result, [0.5, 0.25])
+
+
+def test_tranche_boundaries_match_score_tranche():
+    tranches = score_tranche_array([0.0, 0.19, 0.2, 0.4, 0.59, 0.6, 0.8, 1.0])
+    assert list(tranches) == ["Poor", "Poor", "Fair", "Good", "Good", "Very Good", "Excellent", "Excellent"]
+
+
+def test_rescore_analysis_results():
+    results = [
+        {'individual_scores': {'credibility': 0.9, 'fact_check': 0.9, 'citations': 0.9}},
+        {'individual_scores': {'credibility': 0.1, 'fact_check': 0.5, 'citations': 0.5}},
+    ]
+    out = rescore(results)
+    assert list(out['tranche']) == ["Excellent", "Fair"]
+
+
+def test_failed_and_partial_results_are_errors_not_low_scores():
+    results = [
+        {'success': True, 'individual_scores': {'credibility': 0.9, 'fact_check': 0.9, 'citations': 0.9}},
+        {'success': False, 'url': 'https://gone.org/', 'error': 'URL validation failed: Server returned HTTP 404'},
+        {'success': True, 'individual_scores': {'credibility': 0.8, 'fact_check': 0.7}},
+    ]
+    out = rescore(results)
+    assert out['final_score'][0] == 0.9 and np.isnan(out['final_score'][1:]).all()
+    assert list(out['tranche']) == ["Excellent", None, None]
+    assert list(out['error']) == [None, 'URL validation failed: Server returned HTTP 404',
+                                  'Missing component scores: citations']
+
+
+def test_rescore_with_weight_override():
+    out = rescore(np.array([[1.0, 0.0, 0.0]]), weights=[1.0, 0.0, 0.0])
+    assert list(out['tranche']) == ["Excellent"]
+
+
+def test_batch_matches_single_url_scoring(monkeypatch):
+    pytest.importorskip("torch")    # deliverable1_3 imports torch for the credibility model
+    import deliverable1_3
+    from test_fetch import StubServer
+
+    scheduler = FetchScheduler(respect_robots=False, per_host_rate=1000, per_host_burst=1000)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(fetch, "get_session", lambda: StubServer())
+
+    # Stub model: deterministic per-URL component scores, including tranche boundaries
+    rng = np.random.default_rng(7)
+    urls = [f"https://site{i}.org/page" for i in range(200)]
+    component_scores = dict(zip(urls, np.round(rng.uniform(0, 1, (len(urls), 3)), 2)))
+    component_scores[urls[0]] = np.array([0.2, 0.2, 0.2])
+    keys = {'credibility': 'credibility_score', 'fact_check': 'fact_check_score', 'citations': 'citation_score'}
+
+    def evaluate(component, url, profile, page=None):
+        score = float(component_scores[url][list(keys).index(component)])
+        return {keys[component]: score, 'explanation': 'stub'}
+
+    monkeypatch.setattr(deliverable1_3, "_evaluate_component", evaluate)
+
+    with open(DEFAULT_PROFILE_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config['weights'] = {'credibility': 0.5, 'fact_check': 0.2, 'citations': 0.3}
+    profile = build_profile(config)
+    set_profile(profile)
+    try:
+        singles = [deliverable1_3.analyze_url_credibility(url) for url in urls + ["not a url"]]
+        assert all(result['success'] for result in singles[:-1]) and not singles[-1]['success']
+        batch = rescore(singles, profile)
+    finally:
+        set_profile(load_profile())
+
+    # Both round to cents; a sum sitting on a midpoint may round either way
+    single_scores = np.array([result['final_score'] for result in singles[:-1]])
+    np.testing.assert_allclose(batch['final_score'][:-1], single_scores, rtol=0, atol=0.01 + 1e-9)
+    same = batch['final_score'][:-1] == single_scores
+    assert same.mean() > 0.9
+    assert list(batch['tranche'][:-1][same]) == [r['tranche'] for r, s in zip(singles, same) if s]
+    assert batch['error'][-1] == singles[-1]['error'] and batch['tranche'][-1] is None
@@ -0,0 +1,54 @@
+import sqlite3
+
+from component_store import ComponentStore
+
+URL = "https://example.org/article"
+CREDIBILITY = {"score": 0.8, "explanation": "Model score 0.80"}
+
+
+def test_put_get_and_persist_across_reopen(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = ComponentStore(path)
+    assert store.get(URL, "credibility") is None and store.get_all(URL) == {}
+
+    store.put(URL, "credibility", "1:model", CREDIBILITY)
+    store.put_many(URL, {"fact_check": ("1:abc", {"score": 0.5}), "citations": ("1:def", {"score": 0.6})})
+    assert store.get(URL, "credibility") == ("1:model", CREDIBILITY)
+    store.put(URL, "citations", "1:def", {"score": 0.9})    # Replaces, not duplicates
+    store.put_page(URL, {"etag": '"v1"', "last_modified": None, "content_hash": "abc123"})
+    store.close()
+
+    reopened = ComponentStore(path)
+    assert reopened.get_all(URL) == {
+        "credibility": ("1:model", CREDIBILITY),
+        "fact_check": ("1:abc", {"score": 0.5}),
+        "citations": ("1:def", {"score": 0.9}),
+    }
+    assert reopened.get_page(URL) == {"etag": '"v1"', "last_modified": None, "content_hash": "abc123"}
+    assert reopened.get_page("https://example.org/other") is None
+    assert reopened.urls() == [URL]
+
+
+def test_version_tag_mismatch_marks_stale(tmp_path):
+    store = ComponentStore(str(tmp_path / "history.sqlite3"))
+    store.put(URL, "fact_check", "1:old-domains", {"score": 0.5})
+    store.put("https://example.org/b", "fact_check", "1:new-domains", {"score": 0.5})
+    store.put("https://example.org/c", "citations", "1:old-domains", {"score": 0.5})
+    assert list(store.iter_stale("fact_check", "1:new-domains")) == [URL]
+
+    store.put(URL, "fact_check", "1:new-domains", {"score": 0.7})
+    assert list(store.iter_stale("fact_check", "1:new-domains")) == []
+
+
+def test_corrupt_row_reads_as_missing_until_overwritten(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    store = ComponentStore(path)
+    store.put_many(URL, {"credibility": ("1:model", CREDIBILITY), "citations": ("1:def", {"score": 0.6})})
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE components SET result = '{truncated' WHERE component = 'credibility'")
+        conn.execute("UPDATE components SET result = '[0.6]' WHERE component = 'citations'")
+
+    assert store.get(URL, "credibility") is None and store.get(URL, "citations") is None
+    assert store.get_all(URL) == {}
+    store.put(URL, "credibility", "1:model", CREDIBILITY)
+    assert store.get_all(URL) == {"credibility": ("1:model", CREDIBILITY)}
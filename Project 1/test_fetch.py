@@ -0,0 +1,107 @@
+import pytest
+
+import fetch
+from fetch_scheduler import FetchScheduler
+
+URL = "https://example.org/article"
+PAGE = "<html><body><h1>Aspirin</h1><p>Trial results.</p></body></html>"
+
+
+class StubResponse:
+    def __init__(self, status_code, text="", headers=None, url=URL):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.url = url
+        self.history = []
+
+    def close(self):
+        pass
+
+
+class StubServer:
+    """Session stand-in that answers conditional GETs like a server with one page."""
+
+    def __init__(self, html=PAGE, etag='"v1"', last_modified="Mon, 05 Jan 2026 10:00:00 GMT"):
+        self.html, self.etag, self.last_modified = html, etag, last_modified
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, allow_redirects=True):
+        headers = headers or {}
+        self.requests.append(headers)
+        validators = {"ETag": self.etag, "Last-Modified": self.last_modified}
+        if headers.get("If-None-Match") == self.etag:
+            return StubResponse(304, headers=validators)
+        return StubResponse(200, self.html, validators)
+
+
+class RoutingSession:
+    """Session stand-in serving fixed responses per URL; a URL not in `routes` fails the test."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, allow_redirects=True):
+        assert not allow_redirects or url.endswith("/robots.txt"), "fetch_page must follow redirects itself"
+        self.requests.append(url)
+        status_code, text, headers = self.routes[url]
+        return StubResponse(status_code, text, headers, url)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StubServer()
+    scheduler = FetchScheduler(respect_robots=False, per_host_rate=1000, per_host_burst=100)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(fetch, "get_session", lambda: server)
+    return server
+
+
+def test_first_fetch_returns_body_and_validators(server):
+    page = fetch.fetch_page(URL)
+    assert page.ok and not page.not_modified
+    assert page.text == "Aspirin Trial results."
+    assert page.validators == {"etag": '"v1"', "last_modified": "Mon, 05 Jan 2026 10:00:00 GMT",
+                               "content_hash": fetch.content_hash("Aspirin Trial results.")}
+    assert server.requests == [{}]
+
+
+def test_conditional_fetch_gets_304_with_stored_hash(server):
+    validators = fetch.fetch_page(URL).validators
+    page = fetch.fetch_page(URL, validators=validators)
+    assert server.requests[1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 05 Jan 2026 10:00:00 GMT"}
+    assert page.status_code == 304 and page.not_modified and page.ok and page.html is None
+    assert page.validators == validators
+    assert page.reachability == (True, "")
+
+
+def test_new_etag_same_text_hashes_the_same(server):
+    validators = fetch.fetch_page(URL).validators
+    # Re-served with a fresh ETag and markup, but the same visible text
+    server.etag = '"v2"'
+    server.html = PAGE.replace("<h1>", '<h1 class="title">')
+    page = fetch.fetch_page(URL, validators=validators)
+    assert page.status_code == 200 and page.etag == '"v2"'
+    assert page.content_hash == validators["content_hash"]
+
+    server.etag = '"v3"'
+    server.html = PAGE.replace("Trial results.", "Trial retracted.")
+    assert fetch.fetch_page(URL, validators=page.validators).content_hash != validators["content_hash"]
+
+
+def test_redirects_are_followed_once_and_recorded(monkeypatch):
+    moved, final = "https://example.org/moved", "https://www.example.org/final"
+    session = RoutingSession({
+        URL: (301, "", {"Location": "/moved"}),
+        moved: (302, "", {"Location": final}),
+        final: (200, PAGE, {}),
+    })
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: FetchScheduler(respect_robots=False))
+    monkeypatch.setattr(fetch, "get_session", lambda: session)
+
+    page = fetch.fetch_page(URL)
+    assert page.url == URL and page.final_url == final
+    assert page.redirects == [(301, URL), (302, moved)]
+    assert page.reachability == (True, "") and page.text == "Aspirin Trial results."
+    assert session.requests == [URL, moved, final]    # One GET per hop, nothing repeated
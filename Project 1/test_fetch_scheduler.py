@@ -0,0 +1,242 @@
+from email.utils import formatdate
+
+import pytest
+
+import fetch
+import fetch_scheduler
+from fetch_scheduler import CircuitBreaker, FetchScheduler, NegativeCache, TokenBucket, parse_retry_after
+
+URL = "https://example.org/article"
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() only moves the clock forward."""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class StubResponse:
+    def __init__(self, status_code=200, text="", headers=None, url=URL):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.url = url
+        self.history = []
+
+    def close(self):
+        pass
+
+
+class StubSession:
+    """Answers GETs from a list of responses per URL and records the requests."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, allow_redirects=True):
+        self.requests.append((url, headers))
+        answer = self.responses[url].pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(fetch_scheduler, "time", clock)
+    return clock
+
+
+def stub_session(monkeypatch, responses):
+    session = StubSession(responses)
+    monkeypatch.setattr(fetch, "get_session", lambda: session)
+    return session
+
+
+def test_token_bucket_allows_burst_then_paces(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Reservations queue up behind each other at 1/rate
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 10    # Refills, but never beyond the burst
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_slot_sleeps_for_rate_limit(clock):
+    scheduler = FetchScheduler(per_host_rate=1.0, per_host_burst=1)
+    for _ in range(3):
+        with scheduler.slot(URL):
+            pass
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+    # Another host has its own bucket
+    with scheduler.slot("https://other.org/"):
+        pass
+    assert len(clock.sleeps) == 2
+
+
+def test_negative_cache_expires_and_bounds_size(clock):
+    cache = NegativeCache(ttl=60, max_size=2)
+    cache.put("a", "HTTP 404")
+    assert cache.get("a") == "HTTP 404"
+    clock.now += 60
+    assert cache.get("a") is None
+
+    cache.put("a", "HTTP 404")
+    cache.put("b", "HTTP 404")
+    cache.put("c", "HTTP 404")    # Full and nothing expired: the oldest entry goes
+    assert cache.get("a") is None and cache.get("c") == "HTTP 404"
+    cache.discard("c")
+    assert cache.get("c") is None
+
+
+def test_circuit_breaker_opens_probes_and_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()          # The single probe
+    assert not breaker.allow()
+    breaker.record_failure()        # A failed probe re-opens for another cool-down
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow() and breaker.allow()
+
+
+def test_check_fails_fast_on_recent_failures(clock):
+    scheduler = FetchScheduler(negative_ttl=60, failure_threshold=2, cooldown=30)
+    scheduler.record_failure(URL, "Server returned HTTP 404", host_failure=False)
+    assert scheduler.check(URL) == "Server returned HTTP 404 (cached failure)"
+    assert scheduler.check("https://example.org/other") is None
+
+    scheduler.record_failure("https://example.org/a", "Connection error", host_failure=True)
+    scheduler.record_failure("https://example.org/b", "Connection error", host_failure=True)
+    assert scheduler.check("https://example.org/other") == \
+        "Host temporarily unavailable (circuit open after repeated failures)"
+
+    clock.now += 60
+    assert scheduler.check("https://example.org/other") is None    # The probe
+    scheduler.record_success("https://example.org/other")
+    assert scheduler.check(URL) is None
+
+
+def test_retry_after_blocks_the_host(clock):
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(formatdate(clock.now + 30, usegmt=True)) == pytest.approx(30)
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+    scheduler = FetchScheduler(per_host_burst=10)
+    assert scheduler.note_response(URL, 200, {"Retry-After": "5"}) is None
+    assert scheduler.note_response(URL, 429, {}) is None
+    assert scheduler.note_response(URL, 429, {"Retry-After": "5"}) == 5.0
+    with scheduler.slot("https://example.org/other"):
+        pass
+    assert clock.sleeps == [pytest.approx(5.0)]
+    with scheduler.slot("https://another.org/"):
+        pass
+    assert len(clock.sleeps) == 1
+
+
+def test_fetch_page_retries_once_after_retry_after(clock, monkeypatch):
+    scheduler = FetchScheduler(respect_robots=False)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+    session = stub_session(monkeypatch, {URL: [
+        StubResponse(503, headers={"Retry-After": "2"}),
+        StubResponse(200, "<p>Back again</p>"),
+    ]})
+    page = fetch.fetch_page(URL)
+    assert page.ok and page.text == "Back again"
+    assert len(session.requests) == 2 and clock.sleeps == [pytest.approx(2.0)]
+
+    # A wait beyond max_retry_after is not taken inline
+    session.responses[URL] = [StubResponse(429, headers={"Retry-After": "600"})]
+    page = fetch.fetch_page(URL)
+    assert page.status_code == 429 and len(session.requests) == 3
+
+
+def test_robots_fetched_once_per_host_and_cached(clock, monkeypatch):
+    robots = "https://example.org/robots.txt"
+    session = stub_session(monkeypatch, {
+        robots: [StubResponse(200, "User-agent: *\nDisallow: /private/\n"),
+                 StubResponse(200, "User-agent: *\nDisallow: /\n")],
+        "https://blocked.org/robots.txt": [StubResponse(403)],
+        "https://down.org/robots.txt": [StubResponse(500)],
+    })
+    scheduler = FetchScheduler(robots_ttl=3600, failure_threshold=1)
+    assert scheduler.allowed(URL)
+    assert not scheduler.allowed("https://example.org/private/page")
+    assert [url for url, _ in session.requests] == [robots]
+
+    clock.now += 3601    # Expired: fetched again
+    assert not scheduler.allowed(URL)
+    assert [url for url, _ in session.requests] == [robots, robots]
+
+    # A robots.txt behind 403 does not block the site (its pages are scored as blocked instead)
+    assert scheduler.allowed("https://blocked.org/page")
+    # An erroring robots.txt does not block scoring, but counts against the host
+    assert scheduler.allowed("https://down.org/page")
+    assert scheduler.check("https://down.org/page") is not None
+    assert FetchScheduler(respect_robots=False).allowed("https://blocked.org/page")
+    assert len(session.requests) == 4
+
+
+def test_site_that_403s_bots_stays_reachable_but_blocked(clock, monkeypatch):
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: FetchScheduler())
+    stub_session(monkeypatch, {
+        "https://example.org/robots.txt": [StubResponse(403)],
+        URL: [StubResponse(403)],
+    })
+    page = fetch.fetch_page(URL)
+    assert page.status_code == 403
+    assert page.reachability == (True, "Reachable but blocked (HTTP 403)")
+
+
+def test_redirect_to_another_host_is_checked_against_that_host(clock, monkeypatch):
+    scheduler = FetchScheduler(per_host_rate=1.0, per_host_burst=1)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+    moved = "https://mirror.org/article"
+    session = stub_session(monkeypatch, {
+        "https://example.org/robots.txt": [StubResponse(404)],
+        "https://mirror.org/robots.txt": [StubResponse(200, "User-agent: *\nDisallow: /\n")],
+        URL: [StubResponse(301, headers={"Location": moved})],
+    })
+    page = fetch.fetch_page(URL)
+    assert page.error == "Disallowed by robots.txt"
+    assert page.final_url == moved and page.redirects == [(301, URL)]
+    assert moved not in [url for url, _ in session.requests]
+
+
+def test_robots_block_releases_half_open_probe(clock, monkeypatch):
+    scheduler = FetchScheduler(failure_threshold=1, cooldown=30)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+    stub_session(monkeypatch, {"https://example.org/robots.txt": [StubResponse(200, "User-agent: *\nDisallow: /private/\n")]})
+    assert scheduler.allowed(URL)
+    scheduler.record_failure("https://example.org/down", "Connection error")
+
+    clock.now += 30
+    page = fetch.fetch_page("https://example.org/private/page")
+    assert page.error == "Disallowed by robots.txt"
+    # The probe sent no request, so the next caller may still probe the host
+    assert scheduler.check(URL) is None
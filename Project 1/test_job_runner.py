@@ -0,0 +1,114 @@
+import threading
+
+from job_runner import (
+    CANCELLED, DONE, TIMED_OUT, URL_DONE, URL_FAILED, URL_SKIPPED, JobRunner
+)
+
+URLS = ["https://a.org/", "https://b.org/", "https://c.org/"]
+
+
+def stub_analyze(url):
+    if "fail" in url:
+        raise RuntimeError("page exploded")
+    return {
+        "success": True, "url": url, "final_score": 0.5, "tranche": "Good",
+        "individual_scores": {"credibility": 0.5, "fact_check": 0.5, "citations": 0.5},
+        "explanations": {"credibility": "stub", "fact_check": "stub", "citations": "stub"},
+        "final_url": url, "redirects": [],
+    }
+
+
+class BlockingAnalyze:
+    """Holds every analysis until release() so tests can act while the job is running."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        self.started.set()
+        self.release.wait(5)
+        return stub_analyze(url)
+
+
+def test_analysis_runs_each_url_once_and_keeps_order():
+    runner = JobRunner(stub_analyze, max_workers=2)
+    job = runner.submit_analysis(URLS + [URLS[0], "https://fail.org/"], meta={"intent": "analyze"})
+    assert job.wait(5)
+    assert job.status == DONE and job.progress == (4, 4)
+    assert [result["url"] for result in job.ordered_results()] == URLS + ["https://fail.org/"]
+    assert job.url_status["https://fail.org/"] == URL_FAILED
+    assert job.results["https://fail.org/"]["error"] == "Analysis failed: page exploded"
+
+    snapshot = runner.get(job.id).snapshot()
+    assert snapshot["status"] == DONE and snapshot["completed"] == snapshot["total"] == 4
+    runner.forget(job.id)
+    assert runner.get(job.id) is None
+    runner.shutdown()
+
+
+def test_cancel_skips_queued_urls_and_ignores_late_results():
+    analyze = BlockingAnalyze()
+    runner = JobRunner(analyze, max_workers=1)
+    job = runner.submit_analysis(URLS)
+    assert analyze.started.wait(5)
+    job.cancel()
+    analyze.release.set()
+    runner.shutdown(wait=True)
+
+    assert job.status == CANCELLED and job.done
+    assert analyze.calls == [URLS[0]]    # Queued URLs never ran
+    assert set(job.url_status.values()) == {URL_SKIPPED}
+    assert job.results == {}             # The running URL's result came too late
+
+
+def test_timeout_stops_the_job_on_poll():
+    analyze = BlockingAnalyze()
+    runner = JobRunner(analyze, max_workers=1)
+    job = runner.submit_analysis(URLS[:1], timeout=0.05)
+    assert not job.wait(0.01)
+    assert job.wait(5) and job.status == TIMED_OUT
+    analyze.release.set()
+    runner.shutdown(wait=True)
+    assert job.url_status == {URLS[0]: URL_SKIPPED}
+
+
+def test_finished_jobs_are_evicted_but_running_ones_kept():
+    runner = JobRunner(stub_analyze, max_workers=2, max_jobs=2)
+    first, second, third = (runner.submit_analysis(URLS[:1]) for _ in range(3))
+    assert all(job.wait(5) for job in (first, second, third))
+    runner.submit_analysis(URLS[1:2]).wait(5)
+    assert runner.get(first.id) is None and runner.get(second.id) is None
+    assert runner.get(third.id) is third
+    runner.shutdown()
+
+    analyze = BlockingAnalyze()
+    runner = JobRunner(analyze, max_workers=1, finished_ttl=0, max_jobs=1)
+    running = runner.submit_analysis(URLS[:1])
+    assert analyze.started.wait(5)
+    finished = runner.submit_analysis([])       # Nothing to analyze: done at once
+    assert finished.done and runner.get(finished.id) is None
+    assert runner.get(running.id) is running    # Over the cap, but still running
+    analyze.release.set()
+    assert running.wait(5) and runner.get(running.id) is None
+    runner.shutdown(wait=True)
+
+
+def test_search_job_analyzes_every_result():
+    runner = JobRunner(stub_analyze, max_workers=2)
+    job = runner.submit_search("cancer", lambda query: [{"title": query, "url": url} for url in URLS])
+    assert job.wait(5) and job.status == DONE
+    assert job.search_results[0]["title"] == "cancer"
+    assert all(state == URL_DONE for state in job.url_status.values()) and len(job.results) == 3
+
+    empty = runner.submit_search("nothing", lambda query: [])
+    assert empty.wait(5) and empty.status == DONE and empty.results == {}
+
+    def broken_search(query):
+        raise ConnectionError("search engine down")
+
+    failed = runner.submit_search("cancer", broken_search)
+    assert failed.wait(5) and failed.error == "Search failed: search engine down"
+    runner.shutdown()
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import time
+
+import pytest
+
+from scoring_profile import (
+    DEFAULT_PROFILE_PATH, ProfileWatcher, build_profile, get_profile, load_profile, set_profile, start_watching,
+    stop_watching
+)
+
+
+def _config():
+    with open(DEFAULT_PROFILE_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_default_profile_matches_original_constants():
+    profile = load_profile()
+    assert dict(profile.weights) == {'credibility': 0.35, 'fact_check': 0.35, 'citations': 0.3}
+    assert profile.tranche(0.19) == "Poor" and profile.tranche(0.2) == "Fair" and profile.tranche(0.8) == "Excellent"
+    assert profile.citation_score(0) == 0.5 and profile.citation_score(5) == 0.6 and profile.citation_score(50) == 0.9
+
+
+def test_domain_index_keeps_first_listed_source():
+    profile = load_profile()
+    assert profile.match_domain('cdc.gov') == ('cdc.gov', 0.7)
+    assert profile.match_domain('pubmed.ncbi.nlm.nih.gov') == ('ncbi.nlm.nih.gov', 0.95)
+    # ieee.org is listed before spectrum.ieee.org, so the linear scan matched it first
+    assert profile.match_domain('spectrum.ieee.org') == ('ieee.org', 0.9)
+    assert profile.match_domain('example.com') is None
+
+
+def test_invalid_weights_rejected():
+    config = _config()
+    config['weights']['citations'] = 0.9
+    with pytest.raises(ValueError):
+        build_profile(config)
+
+
+def test_watcher_swaps_profile_and_keeps_old_on_error(tmp_path, caplog):
+    path = tmp_path / "profile.json"
+    config = _config()
+    path.write_text(json.dumps(config))
+    set_profile(load_profile(str(path)))
+    watcher = ProfileWatcher(str(path), interval=60)
+
+    config['weights'] = {'credibility': 0.5, 'fact_check': 0.25, 'citations': 0.25}
+    path.write_text(json.dumps(config))
+    os.utime(path, ns=(1, 1))
+    assert watcher.check()
+    assert get_profile().weights['credibility'] == 0.5
+
+    assert watcher.last_error is None
+    path.write_text("{not json")
+    os.utime(path, ns=(2, 2))
+    with caplog.at_level(logging.WARNING, logger="scoring_profile"):
+        assert not watcher.check()
+    assert get_profile().weights['credibility'] == 0.5
+    assert watcher.last_error.startswith("JSONDecodeError") and watcher.last_error in caplog.text
+
+    path.write_text(json.dumps(config))
+    os.utime(path, ns=(3, 3))
+    assert watcher.check() and watcher.last_error is None
+    set_profile(load_profile())
+
+
+def test_background_watcher_reloads_edited_file(tmp_path):
+    path = tmp_path / "profile.json"
+    config = _config()
+    path.write_text(json.dumps(config))
+    set_profile(load_profile(str(path)))
+    before = get_profile()
+    start_watching(str(path), interval=0.01)
+    try:
+        config['citations']['default_score'] = 0.4
+        path.write_text(json.dumps(config))
+        os.utime(path, ns=(3, 3))
+        deadline = time.monotonic() + 5
+        while get_profile() is before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        profile = get_profile()
+        assert profile.citation_score(0) == 0.4
+        assert profile.version != before.version
+        # Only the edited section gets a new tag, so only citations are re-scored
+        assert profile.section_versions['citations'] != before.section_versions['citations']
+        assert profile.section_versions['fact_check'] == before.section_versions['fact_check']
+    finally:
+        stop_watching()
+        set_profile(load_profile())
@@ -0,0 +1,50 @@
+import re
+
+from session_history import AnalysisHistory, MessageLog
+
+
+def result(url, score=0.5):
+    return {"success": True, "url": url, "final_score": score}
+
+
+def find_urls(text):
+    return re.findall(r"https?://\S+", text)
+
+
+def test_analysis_history_reads_back_and_is_bounded():
+    history = AnalysisHistory(max_size=3)
+    for i in range(5):
+        history.add(result(f"https://site{i}.org/"))
+    assert len(history) == 3
+    assert history.urls() == ["https://site2.org/", "https://site3.org/", "https://site4.org/"]
+    assert "https://site0.org/" not in history and history.get("https://site0.org/") is None
+
+    # Re-analyzing replaces the entry and makes it the most recent
+    history.add(result("https://site2.org/", 0.9))
+    assert history.get("https://site2.org/")["final_score"] == 0.9
+    assert [r["url"] for r in history.last(2)] == ["https://site4.org/", "https://site2.org/"]
+    assert history.last(10) == list(history) and history.last(0) == []
+    history.add(result("https://site5.org/"))
+    assert "https://site3.org/" not in history
+
+    history.clear()
+    assert len(history) == 0
+
+
+def test_message_log_caps_messages_and_summarizes_archived_urls():
+    log = MessageLog(max_messages=4, max_summary_urls=2, url_extractor=find_urls)
+    assert log.summary is None
+    for i in range(10):
+        log.append({"role": "user", "content": f"Check https://site{i}.org/ please"})
+        log.append({"role": "assistant", "content": f"Scored https://reply{i}.org/"})
+
+    assert len(log) == 4 and log.archived_count == 16
+    assert [m["content"] for m in log.window(2)] == ["Check https://site9.org/ please", "Scored https://reply9.org/"]
+    assert list(log)[0]["content"] == "Check https://site8.org/ please"
+    assert log.window(100) == list(log) and log.window(0) == []
+    # Only user URLs are kept, the most recent ones
+    assert log.summary == ("🗂️ 16 earlier messages were archived to keep this session fast. "
+                           "URLs discussed earlier: `https://site6.org/`, `https://site7.org/`")
+
+    log.clear()
+    assert len(log) == 0 and log.summary is None
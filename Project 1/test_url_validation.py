@@ -0,0 +1,69 @@
+import pytest
+
+pytest.importorskip("torch")    # deliverable1_3 imports torch for the credibility model
+
+import deliverable1_3
+import fetch
+from fetch_scheduler import FetchScheduler
+from test_fetch import PAGE, URL, RoutingSession
+
+ROBOTS = "https://example.org/robots.txt"
+CITED = PAGE.replace("</body>", "<p>As shown [1] and [2].</p></body>")
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route the fetch layer to a stub session; only the model evaluator is stubbed."""
+    pages = []
+
+    def credibility(url, page=None):
+        pages.append(page)
+        return {"credibility_score": 0.5, "explanation": "stub model"}
+
+    monkeypatch.setattr(deliverable1_3, "evaluate_reference_credibility", credibility)
+    scheduler = FetchScheduler(per_host_rate=1000, per_host_burst=100)
+    monkeypatch.setattr(fetch, "get_scheduler", lambda: scheduler)
+
+    def serve(routes):
+        session = RoutingSession(dict({ROBOTS: (404, "", {})}, **routes))
+        monkeypatch.setattr(fetch, "get_session", lambda: session)
+        return session, pages
+
+    return serve
+
+
+@pytest.mark.parametrize("url", ["ftp://example.org/file", "http://", "not a url"])
+def test_malformed_url_is_rejected_before_any_request(serve, url):
+    session, pages = serve({})
+    result = deliverable1_3.analyze_url_credibility(url)
+    assert not result["success"]
+    assert result["error"].startswith("URL validation failed: Invalid URL format")
+    assert session.requests == [] and pages == []
+    assert deliverable1_3.validate_url(url)[0] is False and session.requests == []
+
+
+def test_one_get_validates_and_feeds_every_evaluator(serve):
+    session, pages = serve({URL: (200, CITED, {})})
+    result = deliverable1_3.analyze_url_credibility(URL)
+    assert result["success"]
+    assert session.requests == [ROBOTS, URL]
+    # The page fetched for validation is the one the evaluators scored
+    assert pages[0].url == URL and pages[0].html == CITED
+    assert result["explanations"]["citations"] == "Found 2 citations/references"
+    assert result["final_url"] == URL and result["redirects"] == []
+
+
+def test_redirect_is_reported_in_the_result(serve):
+    final = "https://example.org/final"
+    session, pages = serve({URL: (301, "", {"Location": final}), final: (200, PAGE, {})})
+    result = deliverable1_3.analyze_url_credibility(URL)
+    assert result["success"]
+    assert result["final_url"] == final and result["redirects"] == [(301, URL)]
+    assert session.requests == [ROBOTS, URL, final]
+
+
+def test_unreachable_page_fails_validation_without_scoring(serve):
+    session, pages = serve({URL: (404, "", {})})
+    result = deliverable1_3.analyze_url_credibility(URL)
+    assert result["error"] == "URL validation failed: Server returned HTTP 404"
+    assert session.requests == [ROBOTS, URL] and pages == []
@@ -0,0 +1,245 @@
+"""
+Conversation Memory for LisaTheDataScientist
+Token-budgeted chat context: sliding window of recent turns plus a rolling summary
+
+Each message's token count is computed once, when it is added, and the running total
+is kept up to date, so checking the budget never re-tokenizes the history. When the
+context would exceed `budget - reply_tokens`, the oldest turns are evicted down to a
+low-water mark (so eviction happens in batches, not on every turn) and folded into
+the rolling summary by the summarizer. The request sent to the model is always:
+
+    system prompt + summary of older turns (if any) + recent turns
+
+and is guaranteed to fit the budget: the summary is capped at `summary_tokens` and
+an oversized latest message is truncated.
+
+Summarizing runs inside add(), so a summarizer that calls a model blocks the
+caller for that call (once per eviction batch). Async callers use aadd(), which
+awaits an async summarizer (allm_summarizer) or runs a plain one in a worker
+thread, so the event loop keeps serving other conversations meanwhile.
+
+Token counts use tiktoken when it is installed and its encoding is available,
+otherwise a 4-characters-per-token estimate.
+"""
+
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Union
+import asyncio
+import inspect
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD = 4
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+Message = Dict[str, str]
+Summarizer = Callable[[str, List[Message]], str]
+AsyncSummarizer = Callable[[str, List[Message]], Awaitable[str]]
+
+
+class TokenCounter:
+    """Counts and truncates text in model tokens (or estimated tokens without tiktoken)."""
+
+    def __init__(self, model: str = "gpt-4o"):
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except Exception:
+                # Unknown model or encoding files not downloadable (offline)
+                self._encoding = None
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text) + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Keep the first max_tokens tokens of text."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text)
+            return text if len(tokens) <= max_tokens else self._encoding.decode(tokens[:max_tokens])
+        return text[:max_tokens * 4]
+
+
+def extractive_summarizer(summary: str, evicted: List[Message]) -> str:
+    """
+    Default summarizer, no model call: appends the first sentence of each evicted
+    message to the running summary. ConversationMemory caps its length.
+    """
+    lines = [summary] if summary else []
+    for message in evicted:
+        first = message["content"].strip().split("\n")[0]
+        first = first.split(". ")[0].strip()
+        if first:
+            lines.append(f"{message['role']}: {first}")
+    return "\n".join(lines)
+
+
+def _summary_request(summary: str, evicted: List[Message]) -> List[Message]:
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in evicted)
+    return [
+        {"role": "system", "content": "You maintain a concise running summary of a conversation. "
+                                      "Keep facts, names, decisions and open questions."},
+        {"role": "user", "content": f"Current summary:\n{summary or '(none)'}\n\n"
+                                    f"New turns to fold in:\n{transcript}\n\nUpdated summary:"}
+    ]
+
+
+def llm_summarizer(complete: Callable[[List[Message]], str]) -> Summarizer:
+    """
+    Summarizer that asks the model to fold evicted turns into the summary.
+    `complete` takes a message list and returns the reply text (e.g. a cached
+    chat completion call), so it runs once per eviction batch, not per turn.
+    The call blocks: add() waits for it, aadd() runs it in a worker thread.
+    """
+    def summarize(summary: str, evicted: List[Message]) -> str:
+        return complete(_summary_request(summary, evicted))
+    return summarize
+
+
+def allm_summarizer(acomplete: Callable[[List[Message]], Awaitable[str]]) -> AsyncSummarizer:
+    """llm_summarizer for an async `acomplete` (e.g. acached_chat_completion); use with aadd()."""
+    async def summarize(summary: str, evicted: List[Message]) -> str:
+        return await acomplete(_summary_request(summary, evicted))
+    return summarize
+
+
+class ConversationMemory:
+    """
+    Chat context that always fits a token budget.
+
+    Args:
+        system_prompt: Sent first on every request
+        budget: Maximum tokens of context plus reply
+        reply_tokens: Tokens reserved for the model's reply
+        summary_tokens: Cap on the rolling summary
+        low_water: After eviction the context is at most this fraction of its limit
+        summarizer: (summary, evicted messages) -> new summary; may be async if
+            only aadd() is used
+        model: Model name, for the tokenizer
+    """
+
+    def __init__(self, system_prompt: str, budget: int = 8000, reply_tokens: int = 1000,
+                 summary_tokens: int = 500, low_water: float = 0.75,
+                 summarizer: Optional[Union[Summarizer, AsyncSummarizer]] = None, model: str = "gpt-4o"):
+        self.counter = TokenCounter(model)
+        self.system = {"role": "system", "content": system_prompt}
+        self.system_tokens = self.counter.count(system_prompt) + MESSAGE_OVERHEAD
+        self.limit = budget - reply_tokens
+        summary_max = self.counter.count(SUMMARY_HEADER) + summary_tokens + MESSAGE_OVERHEAD
+        if self.limit <= self.system_tokens + summary_max + MESSAGE_OVERHEAD:
+            raise ValueError("Token budget too small for the system prompt, summary and one message")
+        self.summary_tokens = summary_tokens
+        self.low_water = low_water
+        self.summarizer = summarizer or extractive_summarizer
+        self.summary = ""
+        self._summary_cost = 0
+        self._window: Deque[Tuple[Message, int]] = deque()
+        self._window_tokens = 0
+        self.evicted_count = 0
+
+    @property
+    def tokens(self) -> int:
+        """Tokens of the context that messages() would send."""
+        return self.system_tokens + self._summary_cost + self._window_tokens
+
+    def add(self, role: str, content: str) -> None:
+        """
+        Append a message, evicting and summarizing older turns if over budget.
+        Blocks for the summarizer call; async code should use aadd().
+        """
+        if inspect.iscoroutinefunction(self.summarizer):
+            raise ValueError("An async summarizer needs aadd()")
+        if self._append(role, content):
+            target = int(self.limit * self.low_water)
+            while True:
+                evicted = self._pop_batch(target)
+                if not evicted:
+                    break
+                self._set_summary(self.summarizer(self.summary, evicted))
+            self._truncate_latest()
+
+    async def aadd(self, role: str, content: str) -> None:
+        """add() for async code: the summarizer is awaited, or run in a worker thread if it is not async."""
+        if self._append(role, content):
+            target = int(self.limit * self.low_water)
+            while True:
+                evicted = self._pop_batch(target)
+                if not evicted:
+                    break
+                if inspect.iscoroutinefunction(self.summarizer):
+                    summary = await self.summarizer(self.summary, evicted)
+                else:
+                    summary = await asyncio.to_thread(self.summarizer, self.summary, evicted)
+                self._set_summary(summary)
+            self._truncate_latest()
+
+    def _append(self, role: str, content: str) -> bool:
+        """Add a message to the window; True if the context is now over its limit."""
+        message = {"role": role, "content": content}
+        cost = self.counter.count(content) + MESSAGE_OVERHEAD
+        self._window.append((message, cost))
+        self._window_tokens += cost
+        return self.tokens > self.limit
+
+    def _pop_batch(self, target: int) -> List[Message]:
+        """
+        Oldest messages to evict to reach the low-water mark. Always keeps the latest
+        message; it is what the model must answer. The summary grows as batches are
+        folded in, so callers repeat until this returns nothing.
+        """
+        evicted = []
+        while len(self._window) > 1 and self.tokens > target:
+            message, cost = self._window.popleft()
+            self._window_tokens -= cost
+            evicted.append(message)
+        self.evicted_count += len(evicted)
+        return evicted
+
+    def _truncate_latest(self) -> None:
+        if self.tokens > self.limit:
+            # Only the latest message is left and it is larger than the budget: truncate it
+            message, cost = self._window.pop()
+            room = self.limit - self.system_tokens - self._summary_cost - MESSAGE_OVERHEAD
+            message = {"role": message["role"], "content": self.counter.truncate(message["content"], room)}
+            cost = self.counter.count(message["content"]) + MESSAGE_OVERHEAD
+            self._window.append((message, cost))
+            self._window_tokens = cost
+
+    def _set_summary(self, summary: str) -> None:
+        # Over the cap, keep the most recent part of the summary
+        if self.counter.count(summary) > self.summary_tokens:
+            lines = summary.split("\n")
+            while len(lines) > 1 and self.counter.count("\n".join(lines)) > self.summary_tokens:
+                lines.pop(0)
+            summary = self.counter.truncate("\n".join(lines), self.summary_tokens)
+        self.summary = summary
+        self._summary_cost = self.counter.count(self._summary_text()) + MESSAGE_OVERHEAD if summary else 0
+
+    def _summary_text(self) -> str:
+        return SUMMARY_HEADER + self.summary
+
+    def messages(self) -> List[Message]:
+        """The request context: system prompt, summary of older turns, recent turns."""
+        messages = [self.system]
+        if self.summary:
+            messages.append({"role": "system", "content": self._summary_text()})
+        messages.extend(message for message, _ in self._window)
+        return messages
+
+    def clear(self) -> None:
+        self.summary = ""
+        self._summary_cost = 0
+        self._window.clear()
+        self._window_tokens = 0
+        self.evicted_count = 0
+
+    def __len__(self) -> int:
+        return len(self._window)
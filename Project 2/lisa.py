@@ -1,33 +1,134 @@
+import argparse
+import asyncio
 import openai
 import os
-from tinytroupe.factory import TinyPersonFactory
-from tinytroupe.environment import TinyWorld
-from tinytroupe.examples import create_lisa_the_data_scientist
+import weakref
+from llm_cache import (
+    acached_chat_completion, acached_chat_stream, cached_chat_completion, cached_chat_stream,
+    get_llm_cache, install_tinytroupe_cache
+)
+from conversation_memory import ConversationMemory
 
 class LisaTheDataScientist:
-    def __init__(self):
+    # One async client (and connection pool) per event loop and endpoint, shared by every
+    # conversation on that loop. A client's connections belong to the loop that opened them,
+    # so a later asyncio.run() gets its own; entries go away with their loop.
+    _async_clients = weakref.WeakKeyDictionary()
+
+    def __init__(self, model="gpt-4o", cache=None, token_budget=8000, reply_tokens=1000, summarizer=None,
+                 base_url=None):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("Missing OpenAI API key. Set OPENAI_API_KEY in your environment variables.")
         
-        self.client = openai.OpenAI(api_key=api_key)  # Initialize OpenAI client
+        # base_url (or OPENAI_BASE_URL) points both clients at another endpoint, e.g. a local mock
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url)  # Initialize OpenAI client
+        self._api_key = api_key
+        self._base_url = base_url
+        self.model = model
+        self.cache = cache if cache is not None else get_llm_cache()  # None when disabled in config.ini
         self.system_prompt = (
             "You are Lisa, a data scientist who is helpful, knowledgeable, and slightly sarcastic. "
             "You specialize in Python, pandas, and SQL."
         )
-        self.chat_history = [{"role": "system", "content": self.system_prompt}]
+        # Sliding window of recent turns + rolling summary, always within token_budget
+        self.memory = ConversationMemory(
+            self.system_prompt, budget=token_budget, reply_tokens=reply_tokens,
+            summarizer=summarizer, model=model
+        )
+
+    @property
+    def chat_history(self):
+        """The context sent on the next request (not the full transcript)."""
+        return self.memory.messages()
     
     def listen_and_act(self, user_input):
-        self.chat_history.append({"role": "user", "content": user_input})
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=self.chat_history
+        self.memory.add("user", user_input)
+        response = cached_chat_completion(
+            self.client, self.cache,
+            model=self.model,
+            messages=self.memory.messages()
+        )
+        reply = response.choices[0].message.content
+        self.memory.add("assistant", reply)
+        return reply
+
+    def stream_listen_and_act(self, user_input):
+        """Like listen_and_act, but yields the reply in pieces as they arrive."""
+        self.memory.add("user", user_input)
+        parts = []
+        try:
+            for text in cached_chat_stream(self.client, self.cache, model=self.model,
+                                           messages=self.memory.messages()):
+                parts.append(text)
+                yield text
+        finally:
+            # Keep whatever was received, even if the caller stopped reading early
+            if parts:
+                self.memory.add("assistant", "".join(parts))
+
+    # ----- async variants: many conversations can share one event loop -----
+
+    @property
+    def async_client(self):
+        clients = self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        key = (self._api_key, self._base_url)
+        if key not in clients:
+            clients[key] = openai.AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+        return clients[key]
+
+    # Memory updates use aadd, so summarizing evicted turns never blocks the event loop
+    async def alisten_and_act(self, user_input):
+        await self.memory.aadd("user", user_input)
+        response = await acached_chat_completion(
+            self.async_client, self.cache,
+            model=self.model,
+            messages=self.memory.messages()
         )
         reply = response.choices[0].message.content
-        self.chat_history.append({"role": "assistant", "content": reply})
+        await self.memory.aadd("assistant", reply)
         return reply
 
+    async def astream_listen_and_act(self, user_input):
+        await self.memory.aadd("user", user_input)
+        parts = []
+        try:
+            async for text in acached_chat_stream(self.async_client, self.cache, model=self.model,
+                                                  messages=self.memory.messages()):
+                parts.append(text)
+                yield text
+        finally:
+            if parts:
+                await self.memory.aadd("assistant", "".join(parts))
+
+
+def chat_with_lisa(lisa=None):
+    """Interactive chat that prints Lisa's reply as it streams in."""
+    lisa = lisa or LisaTheDataScientist()
+    print("Chat with Lisa (type 'quit' or 'exit' to end the conversation)\n")
+
+    while True:
+        user_input = input("You: ").strip()
+
+        if user_input.lower() in ['quit', 'exit']:
+            print("Lisa: Goodbye! May your data always be clean and your queries always be fast.")
+            break
+
+        if not user_input:
+            continue
+
+        print("Lisa: ", end="", flush=True)
+        for text in lisa.stream_listen_and_act(user_input):
+            print(text, end="", flush=True)
+        print("\n")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lisa the data scientist.")
+    parser.add_argument("--chat", action="store_true",
+                        help="Chat with Lisa interactively, streaming her replies, instead of the Lisa/Danilo conversation")
+    parser.add_argument("--base-url", default=None,
+                        help="OpenAI-compatible endpoint for --chat (default: OPENAI_BASE_URL or api.openai.com)")
+    args = parser.parse_args()
 
     '''
     # Original Lisa conversation code - DO NOT MODIFY
@@ -48,6 +149,19 @@ if __name__ == "__main__":
         print(f"Lisa: {response}\n")
     '''
 
+    if args.chat:
+        chat_with_lisa(LisaTheDataScientist(base_url=args.base_url))
+        raise SystemExit
+
+    # TinyTroupe is only needed for the Lisa/Danilo conversation, so
+    # LisaTheDataScientist and chat_with_lisa import (and test) without it
+    from tinytroupe.factory import TinyPersonFactory
+    from tinytroupe.environment import TinyWorld
+    from tinytroupe.examples import create_lisa_the_data_scientist
+
+    # Replay cached replies on reruns of an unchanged scenario
+    install_tinytroupe_cache()
+
     # Use pre-packaged Lisa persona
     lisa = create_lisa_the_data_scientist()
     
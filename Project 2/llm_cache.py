@@ -0,0 +1,390 @@
+"""
+LLM Response Cache for the Lisa / Danilo persona simulations
+Persistent, content-addressed cache for chat completion calls
+
+Every request is keyed by a SHA-256 of its canonical JSON (model, sampling parameters
+and the full message list), so rerunning an unchanged scenario replays the stored
+replies without calling the API, while any change to a prompt, a persona or a
+parameter misses the cache from that turn on.
+
+Backed by SQLite from the standard library: each new reply is one INSERT (no rewriting
+a whole pickle as TinyTroupe's built-in cache does), and old entries are evicted by
+age and by least-recent use. Used by LisaTheDataScientist directly and by TinyTroupe
+agents through install_tinytroupe_cache().
+
+Streaming and async (AsyncOpenAI) calls share the same entries: a completed stream is
+stored as a regular completion, and a cache hit is replayed as a single chunk. The async
+functions run the SQLite reads and writes in a worker thread, off the event loop.
+
+Cache misses, and only misses, wait for the provider's rate limiter if one is set
+(set_rate_limiter), so replayed turns never count against the API quota.
+
+Configured by the [Cache] section of config.ini; LLM_CACHE_PATH overrides the file.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+import asyncio
+import configparser
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.ini")
+
+# How many inserts between eviction passes
+EVICT_EVERY = 100
+# last_used is only refreshed when older than this, so cache hits are (almost always)
+# read-only and processes sharing the file do not queue for the write lock
+LAST_USED_RESOLUTION = 3600
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """Content address of a request: hash of its canonical JSON."""
+    canonical = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """
+    Request key -> stored response (the completion's JSON dump).
+    Safe to share across threads; every call runs under one lock on one connection.
+
+    Args:
+        path: SQLite file
+        max_entries: Keep at most this many responses (least recently used go first)
+        max_age: Drop responses older than this many seconds (None keeps them forever)
+    """
+
+    def __init__(self, path: str, max_entries: Optional[int] = 10000, max_age: Optional[float] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored response for a key, or None. Expired entries count as misses."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at, last_used FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            if now - row[2] > LAST_USED_RESOLUTION:
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model: Optional[str], response: Dict[str, Any]) -> None:
+        """Store a response; every EVICT_EVERY inserts, evict old entries."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response, default=str), now, now)
+            )
+            self._puts += 1
+            if self._puts % EVICT_EVERY == 0:
+                self._evict()
+
+    def evict(self) -> int:
+        """Apply max_age and max_entries now; returns the number of entries removed."""
+        with self._lock, self._conn:
+            return self._evict()
+
+    def _evict(self) -> int:
+        removed = 0
+        if self.max_age is not None:
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+        if self.max_entries is not None:
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+        return removed
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ========== RATE LIMITING ==========
+# provider -> object with reserve() -> seconds to wait before the call
+_rate_limiters: Dict[str, Any] = {}
+
+
+def set_rate_limiter(provider: str, limiter) -> None:
+    """Throttle API calls (cache misses) to `provider`; limiter=None removes the limit."""
+    if limiter is None:
+        _rate_limiters.pop(provider, None)
+    else:
+        _rate_limiters[provider] = limiter
+
+
+def _wait_for_rate_limit(provider: str) -> None:
+    limiter = _rate_limiters.get(provider)
+    if limiter is not None:
+        delay = limiter.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def _await_rate_limit(provider: str) -> None:
+    limiter = _rate_limiters.get(provider)
+    if limiter is not None:
+        delay = limiter.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# ========== CACHED CALLS ==========
+
+def cached_chat_completion(client, cache: Optional[LLMCache], *, provider: str = "openai", **params):
+    """
+    client.chat.completions.create(**params), answered from the cache when the exact
+    same request was made before. Returns an openai ChatCompletion either way.
+    """
+    if cache is None:
+        _wait_for_rate_limit(provider)
+        return client.chat.completions.create(**params)
+
+    from openai.types.chat import ChatCompletion
+
+    key = cache_key(params)
+    stored = cache.get(key)
+    if stored is not None:
+        return ChatCompletion.model_validate(stored)
+    _wait_for_rate_limit(provider)
+    response = client.chat.completions.create(**params)
+    cache.put(key, params.get("model"), response.model_dump())
+    return response
+
+
+def _completion_dict(model: Optional[str], text: str, finish_reason: str) -> Dict[str, Any]:
+    """A streamed reply stored in the shape of a non-streamed ChatCompletion."""
+    return {
+        "id": "cached-stream",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model or "",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                     "finish_reason": finish_reason}]
+    }
+
+
+def _stored_text(stored: Dict[str, Any]) -> str:
+    return stored["choices"][0]["message"].get("content") or ""
+
+
+def cached_chat_stream(client, cache: Optional[LLMCache], *, provider: str = "openai",
+                       **params) -> Iterator[str]:
+    """
+    Stream the reply text of client.chat.completions.create(stream=True, **params)
+    as it arrives. A cached reply is yielded at once; a stream that finishes is cached
+    (an abandoned one is not).
+    """
+    key = cache_key(params) if cache is not None else None
+    if cache is not None:
+        stored = cache.get(key)
+        if stored is not None:
+            yield _stored_text(stored)
+            return
+
+    parts, finish_reason = [], None
+    _wait_for_rate_limit(provider)
+    stream = client.chat.completions.create(stream=True, **params)
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                yield choice.delta.content
+            finish_reason = choice.finish_reason or finish_reason
+    finally:
+        stream.close()
+    if cache is not None and finish_reason is not None:
+        cache.put(key, params.get("model"), _completion_dict(params.get("model"), "".join(parts), finish_reason))
+
+
+async def acached_chat_completion(client, cache: Optional[LLMCache], *, provider: str = "openai", **params):
+    """cached_chat_completion for an openai.AsyncOpenAI client."""
+    if cache is None:
+        await _await_rate_limit(provider)
+        return await client.chat.completions.create(**params)
+
+    from openai.types.chat import ChatCompletion
+
+    key = cache_key(params)
+    stored = await asyncio.to_thread(cache.get, key)
+    if stored is not None:
+        return ChatCompletion.model_validate(stored)
+    await _await_rate_limit(provider)
+    response = await client.chat.completions.create(**params)
+    await asyncio.to_thread(cache.put, key, params.get("model"), response.model_dump())
+    return response
+
+
+async def acached_chat_stream(client, cache: Optional[LLMCache], *, provider: str = "openai",
+                              **params) -> AsyncIterator[str]:
+    """cached_chat_stream for an openai.AsyncOpenAI client."""
+    key = cache_key(params) if cache is not None else None
+    if cache is not None:
+        stored = await asyncio.to_thread(cache.get, key)
+        if stored is not None:
+            yield _stored_text(stored)
+            return
+
+    parts, finish_reason = [], None
+    await _await_rate_limit(provider)
+    stream = await client.chat.completions.create(stream=True, **params)
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                yield choice.delta.content
+            finish_reason = choice.finish_reason or finish_reason
+    finally:
+        await stream.close()
+    if cache is not None and finish_reason is not None:
+        await asyncio.to_thread(cache.put, key, params.get("model"),
+                                _completion_dict(params.get("model"), "".join(parts), finish_reason))
+
+
+# ========== CONFIGURATION ==========
+
+def load_cache_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """Read the [Cache] section of config.ini (all keys optional)."""
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    cache_path = parser.get("Cache", "path", fallback="llm_cache.sqlite3")
+    max_entries = parser.get("Cache", "max_entries", fallback="")
+    max_age_days = parser.get("Cache", "max_age_days", fallback="")
+    if not os.path.isabs(cache_path):
+        cache_path = os.path.join(os.path.dirname(os.path.abspath(path)), cache_path)
+    return {
+        "enabled": parser.getboolean("Cache", "enabled", fallback=True),
+        "path": os.environ.get("LLM_CACHE_PATH", cache_path),
+        "max_entries": int(max_entries) if max_entries else None,
+        "max_age": float(max_age_days) * 86400 if max_age_days else None,
+    }
+
+
+# ========== SHARED CACHE (SINGLETON) ==========
+_cache: Optional[LLMCache] = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Lazily open the configured cache once per process; None if disabled in config.ini."""
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        with _cache_lock:
+            if not _cache_loaded:
+                config = load_cache_config()
+                if config["enabled"]:
+                    _cache = LLMCache(config["path"], config["max_entries"], config["max_age"])
+                _cache_loaded = True
+    return _cache
+
+
+# ========== TINYTROUPE INTEGRATION ==========
+
+def _dump_response(response) -> Dict[str, Any]:
+    """Completion -> stored dict, marking replies of structured-output (parse) calls."""
+    from openai.types.chat import ParsedChatCompletion
+
+    stored = response.model_dump()
+    if isinstance(response, ParsedChatCompletion):
+        stored["response_type"] = "parsed"
+    return stored
+
+
+def _load_response(stored: Dict[str, Any], response_format: Any = None):
+    """
+    Stored dict -> the completion type it was stored from. A parse reply comes back as
+    ParsedChatCompletion with message.parsed rebuilt as the request's response_format model.
+    """
+    from openai.types.chat import ChatCompletion, ParsedChatCompletion
+
+    stored = dict(stored)
+    if stored.pop("response_type", None) == "parsed":
+        content_type = response_format if isinstance(response_format, type) else object
+        return ParsedChatCompletion[content_type].model_validate(stored)
+    return ChatCompletion.model_validate(stored)
+
+
+def install_tinytroupe_cache(cache: Optional[LLMCache] = None, api_type: str = "openai") -> None:
+    """
+    Route TinyTroupe's model calls (TinyPerson.listen_and_act, TinyPersonFactory, ...)
+    through the cache and the `api_type` rate limiter by registering a client for it.
+    TinyTroupe's own pickle cache stays off (cache_api_calls = False in config.ini).
+    Structured-output calls are keyed on their response_format's JSON schema and
+    replayed as ParsedChatCompletion, so .parsed survives a cache hit.
+    """
+    if cache is None:    # Not `cache or ...`: an empty LLMCache is falsy (__len__)
+        cache = get_llm_cache()
+
+    from tinytroupe import openai_utils
+
+    base = openai_utils.AzureClient if api_type == "azure" else openai_utils.OpenAIClient
+
+    class CachedClient(base):
+        def _raw_model_call(self, model, chat_api_params):
+            if cache is None:
+                _wait_for_rate_limit(api_type)
+                return super()._raw_model_call(model, chat_api_params)
+            response_format = chat_api_params.get("response_format")
+            params = dict(chat_api_params, model=model)
+            if hasattr(response_format, "model_json_schema"):
+                params["response_format"] = response_format.model_json_schema()
+            key = cache_key(params)
+            stored = cache.get(key)
+            if stored is not None:
+                return _load_response(stored, response_format)
+            _wait_for_rate_limit(api_type)
+            response = super()._raw_model_call(model, chat_api_params)
+            cache.put(key, model, _dump_response(response))
+            return response
+
+    openai_utils.register_client(api_type, CachedClient(cache_api_calls=False))
@@ -0,0 +1,392 @@
+"""
+Scenario Runner for TinyTroupe persona simulations
+Runs many declarative conversations concurrently, with resumable JSONL transcripts
+
+A scenario file (a JSON list, or JSONL with one scenario per line) describes each
+conversation instead of hand-writing it in lisa.py:
+
+    {
+      "id": "lisa-danilo",
+      "matrix": {"topic": ["heavy metal", "pets"]},
+      "agents": {
+        "lisa":   {"type": "example", "name": "create_lisa_the_data_scientist"},
+        "danilo": {"type": "factory", "context": "A hospital in São Paulo, Brazil.",
+                   "description": "Create a Brazilian man named Danilo that is a radiologist..."}
+      },
+      "turns": [
+        {"speaker": "lisa", "prompt": "Introduce yourself to Danilo.", "as": "lisa_intro"},
+        {"speaker": "danilo", "prompt": "Lisa just said: '{lisa_intro}'. Tell her about {topic}."}
+      ]
+    }
+
+Agent types: "example" (a tinytroupe.examples function), "factory"
+(TinyPersonFactory(context).generate_person(description)) and "lisa"
+(LisaTheDataScientist). Prompts, contexts and descriptions are str.format templates
+over the matrix values, earlier replies named with "as", and {last} (the previous
+reply). The optional "matrix" expands a scenario into one variant per combination.
+
+Scenarios run in a bounded pool of worker processes, one scenario per process at a
+time: TinyTroupe keeps a global registry of agent names, so two conversations with
+the same persona cannot share a process. API calls are throttled per provider, with
+the requests-per-minute budget split evenly across workers; cache hits are never
+throttled (see llm_cache.py).
+
+Each turn is appended to the transcript JSONL as soon as it completes, followed by a
+"done" (or "failed") record for the scenario. Rerunning with the same transcript
+skips finished scenarios; interrupted ones start over and replay their completed
+turns from the LLM cache at no cost.
+
+Run with:
+    python scenario_runner.py scenarios.json --out transcripts.jsonl --workers 8 --rpm openai=500
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import argparse
+import configparser
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+
+AGENT_TYPES = ("example", "factory", "lisa")
+
+
+class RateLimiter:
+    """
+    Token bucket in requests per minute, using reservations: a caller takes a token
+    now (possibly driving the balance negative) and sleeps for the returned delay.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[int] = None):
+        self.rate = per_minute / 60.0
+        self.burst = burst or max(1, int(self.rate))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token; return seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+# ========== SCENARIO FILES ==========
+
+def _validate(spec: Dict[str, Any]) -> None:
+    if not spec.get("id"):
+        raise ValueError("Every scenario needs an 'id'")
+    agents = spec.get("agents") or {}
+    if not agents:
+        raise ValueError(f"Scenario {spec['id']}: 'agents' must not be empty")
+    for name, agent in agents.items():
+        if agent.get("type", "factory") not in AGENT_TYPES:
+            raise ValueError(f"Scenario {spec['id']}: agent '{name}' has unknown type '{agent.get('type')}'")
+    if not spec.get("turns"):
+        raise ValueError(f"Scenario {spec['id']}: 'turns' must not be empty")
+    for turn in spec["turns"]:
+        if turn.get("speaker") not in agents:
+            raise ValueError(f"Scenario {spec['id']}: turn speaker '{turn.get('speaker')}' is not an agent")
+        if "prompt" not in turn:
+            raise ValueError(f"Scenario {spec['id']}: every turn needs a 'prompt'")
+
+
+def expand_scenario(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One scenario per combination of matrix values (the scenario itself if no matrix)."""
+    _validate(spec)
+    matrix = spec.get("matrix") or {}
+    if not matrix:
+        return [dict(spec, vars=dict(spec.get("vars", {})))]
+    keys = list(matrix)
+    variants = []
+    for values in itertools.product(*(matrix[k] for k in keys)):
+        variables = dict(spec.get("vars", {}), **dict(zip(keys, values)))
+        suffix = ",".join(f"{k}={v}" for k, v in zip(keys, values))
+        variant = {k: v for k, v in spec.items() if k != "matrix"}
+        variants.append(dict(variant, id=f"{spec['id']}[{suffix}]", vars=variables))
+    return variants
+
+
+def load_scenarios(path: str) -> List[Dict[str, Any]]:
+    """Read a JSON list or JSONL scenario file and expand every matrix."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        specs = json.loads(text)
+    else:
+        specs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    scenarios = [s for spec in specs for s in expand_scenario(spec)]
+    seen = set()
+    for scenario in scenarios:
+        if scenario["id"] in seen:
+            raise ValueError(f"Duplicate scenario id: {scenario['id']}")
+        seen.add(scenario["id"])
+    return scenarios
+
+
+def completed_scenarios(transcript_path: str) -> Set[str]:
+    """Ids of scenarios with a 'done' record in the transcript."""
+    done = set()
+    if not os.path.exists(transcript_path):
+        return done
+    with open(transcript_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partial last line from an interrupted run
+            if record.get("event") == "done":
+                done.add(record["scenario"])
+    return done
+
+
+def load_transcripts(transcript_path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """scenario id -> its turn records, from the run that completed it."""
+    turns: Dict[tuple, List[Dict[str, Any]]] = {}
+    finished: Dict[str, str] = {}
+    with open(transcript_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            key = (record.get("scenario"), record.get("run"))
+            if record.get("event") == "turn":
+                turns.setdefault(key, []).append(record)
+            elif record.get("event") == "done":
+                finished[record["scenario"]] = record["run"]
+    return {scenario: turns.get((scenario, run), []) for scenario, run in finished.items()}
+
+
+# ========== RUNNING ONE SCENARIO ==========
+
+def _talk_text(actions) -> str:
+    """Reply text from TinyPerson.listen_and_act(..., return_actions=True)."""
+    if actions is None:
+        return ""
+    if isinstance(actions, str):
+        return actions
+    talks = []
+    for item in actions:
+        action = item.get("action", item) if isinstance(item, dict) else {}
+        if action.get("type") == "TALK" and action.get("content"):
+            talks.append(action["content"])
+    return "\n".join(talks)
+
+
+_tinytroupe_ready = False
+
+
+def _ensure_tinytroupe() -> None:
+    """Route TinyTroupe through the LLM cache and rate limiter (once per process)."""
+    global _tinytroupe_ready
+    if not _tinytroupe_ready:
+        from llm_cache import CONFIG_PATH, install_tinytroupe_cache
+
+        parser = configparser.ConfigParser()
+        parser.read(CONFIG_PATH)
+        install_tinytroupe_cache(api_type=parser.get("OpenAI", "api_type", fallback="openai"))
+        _tinytroupe_ready = True
+
+
+def _build_agent(spec: Dict[str, Any], variables: Dict[str, Any]) -> Callable[[str], str]:
+    """An agent as a prompt -> reply function."""
+    kind = spec.get("type", "factory")
+    if kind == "lisa":
+        from lisa import LisaTheDataScientist
+
+        lisa = LisaTheDataScientist(model=spec.get("model", "gpt-4o"))
+        return lisa.listen_and_act
+
+    _ensure_tinytroupe()
+    if kind == "example":
+        from tinytroupe import examples
+
+        person = getattr(examples, spec["name"])()
+    else:
+        from tinytroupe.factory import TinyPersonFactory
+
+        factory = TinyPersonFactory(spec["context"].format_map(variables))
+        person = factory.generate_person(spec["description"].format_map(variables))
+    return lambda prompt: _talk_text(person.listen_and_act(prompt, return_actions=True))
+
+
+def _reset_tinytroupe() -> None:
+    """Forget this scenario's agents so the next one can reuse their names."""
+    if not _tinytroupe_ready:
+        return
+    from tinytroupe.agent import TinyPerson
+
+    clear = getattr(TinyPerson, "clear_agents", None)
+    if clear is not None:
+        clear()
+
+
+AgentBuilder = Callable[[Dict[str, Any], Dict[str, Any]], Callable[[str], str]]
+
+
+def run_scenario(scenario: Dict[str, Any], emit: Callable[[Dict[str, Any]], None], run_id: str = "",
+                 build_agent: Optional[AgentBuilder] = None) -> int:
+    """
+    Play one scenario turn by turn, emitting a record after each turn.
+    build_agent(agent spec, variables) -> prompt -> reply defaults to the TinyTroupe/Lisa agents.
+    Returns the number of turns played.
+    """
+    build_agent = build_agent or _build_agent
+    variables = dict(scenario.get("vars", {}))
+    agents = {name: build_agent(spec, variables) for name, spec in scenario["agents"].items()}
+    variables["last"] = ""
+    for index, turn in enumerate(scenario["turns"]):
+        prompt = turn["prompt"].format_map(variables)
+        start = time.monotonic()
+        reply = agents[turn["speaker"]](prompt)
+        emit({
+            "run": run_id,
+            "scenario": scenario["id"],
+            "event": "turn",
+            "turn": index,
+            "speaker": turn["speaker"],
+            "prompt": prompt,
+            "reply": reply,
+            "elapsed": round(time.monotonic() - start, 3),
+            "time": time.time()
+        })
+        variables["last"] = reply
+        if turn.get("as"):
+            variables[turn["as"]] = reply
+    return len(scenario["turns"])
+
+
+# ========== WORKER PROCESSES ==========
+_events = None
+_agent_builder: Optional[AgentBuilder] = None
+
+
+def _init_worker(events, rate_limits: Dict[str, float], build_agent: Optional[AgentBuilder]) -> None:
+    global _events, _agent_builder
+    from llm_cache import set_rate_limiter
+
+    _events = events
+    _agent_builder = build_agent
+    for provider, per_minute in rate_limits.items():
+        set_rate_limiter(provider, RateLimiter(per_minute))
+
+
+def _run_in_worker(scenario: Dict[str, Any], run_id: str) -> Dict[str, Any]:
+    start = time.monotonic()
+    try:
+        turns = run_scenario(scenario, _events.put, run_id, _agent_builder)
+        status = {"event": "done", "turns": turns}
+    except Exception as e:
+        status = {"event": "failed", "error": f"{type(e).__name__}: {e}"}
+    finally:
+        try:
+            _reset_tinytroupe()
+        except Exception:
+            pass
+    status.update(run=run_id, scenario=scenario["id"], elapsed=round(time.monotonic() - start, 3), time=time.time())
+    # Sent through the same queue as the turns, so it is always written after them
+    _events.put(status)
+    return status
+
+
+def _write_events(events, path: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        while True:
+            record = events.get()
+            if record is None:
+                break
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+
+
+def run_scenarios(scenarios: Iterable[Dict[str, Any]], transcript_path: str, max_workers: int = 4,
+                  rate_limits: Optional[Dict[str, float]] = None, resume: bool = True,
+                  build_agent: Optional[AgentBuilder] = None) -> Dict[str, str]:
+    """
+    Run scenarios concurrently, appending every turn to transcript_path.
+
+    Args:
+        scenarios: Expanded scenarios (load_scenarios())
+        transcript_path: JSONL transcript, appended to
+        max_workers: Scenarios running at once
+        rate_limits: provider -> requests per minute, shared by all workers
+        resume: Skip scenarios already marked done in the transcript
+        build_agent: Replaces the TinyTroupe/Lisa agents (see run_scenario); it is sent
+            to the spawned workers, so it must be a module-level function
+
+    Returns:
+        {scenario id: 'done' | 'failed' | 'skipped'}
+    """
+    scenarios = list(scenarios)
+    done = completed_scenarios(transcript_path) if resume else set()
+    statuses = {s["id"]: "skipped" for s in scenarios if s["id"] in done}
+    pending = [s for s in scenarios if s["id"] not in done]
+    if not pending:
+        return statuses
+
+    run_id = uuid.uuid4().hex[:12]
+    per_worker = {p: rpm / max_workers for p, rpm in (rate_limits or {}).items()}
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    writer = threading.Thread(target=_write_events, args=(events, transcript_path), daemon=True)
+    writer.start()
+
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               initializer=_init_worker, initargs=(events, per_worker, build_agent))
+    try:
+        futures = {pool.submit(_run_in_worker, s, run_id): s["id"] for s in pending}
+        for finished, future in enumerate(as_completed(futures), start=1):
+            scenario_id = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                # The worker process itself died; nothing was recorded for this scenario
+                status = {"event": "failed", "error": str(e), "elapsed": 0}
+            statuses[scenario_id] = status["event"]
+            detail = f"{status['turns']} turns" if status["event"] == "done" else status["error"]
+            print(f"[{finished}/{len(pending)}] {scenario_id}: {status['event']} ({detail}, {status['elapsed']:.1f}s)")
+    finally:
+        # On Ctrl+C, drop queued scenarios; finished turns are already on disk
+        pool.shutdown(wait=True, cancel_futures=True)
+        events.put(None)
+        writer.join()
+    return statuses
+
+
+def _parse_rate_limits(values: List[str]) -> Dict[str, float]:
+    limits = {}
+    for value in values:
+        provider, _, per_minute = value.rpartition("=")
+        limits[provider or "openai"] = float(per_minute)
+    return limits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run TinyTroupe conversation scenarios in parallel.")
+    parser.add_argument("scenarios", help="Scenario file (JSON list or JSONL)")
+    parser.add_argument("--out", default="transcripts.jsonl", help="Transcript JSONL (appended to)")
+    parser.add_argument("--workers", type=int, default=4, help="Scenarios running at once")
+    parser.add_argument("--rpm", action="append", default=[], metavar="PROVIDER=N",
+                        help="Requests per minute for a provider (repeatable; default openai=500)")
+    parser.add_argument("--no-resume", action="store_true", help="Rerun scenarios already done")
+    args = parser.parse_args()
+
+    statuses = run_scenarios(load_scenarios(args.scenarios), args.out, max_workers=args.workers,
+                             rate_limits=_parse_rate_limits(args.rpm or ["openai=500"]),
+                             resume=not args.no_resume)
+    counts = {s: list(statuses.values()).count(s) for s in ("done", "failed", "skipped")}
+    print(f"Done: {counts['done']}, failed: {counts['failed']}, skipped (already done): {counts['skipped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+
+from conversation_memory import (
+    MESSAGE_OVERHEAD, ConversationMemory, allm_summarizer, extractive_summarizer, llm_summarizer
+)
+
+SYSTEM = "You are Lisa, a data scientist."
+
+
+def recount(memory):
+    return sum(memory.counter.count(m["content"]) + MESSAGE_OVERHEAD for m in memory.messages())
+
+
+def turn(i):
+    return f"Turn {i} is about topic {i}. " + "More detail follows here. " * (i % 7 + 1)
+
+
+def test_token_count_is_incremental_and_within_budget():
+    memory = ConversationMemory(SYSTEM, budget=1200, reply_tokens=200, summary_tokens=100)
+    for i in range(200):
+        memory.add("user" if i % 2 == 0 else "assistant", turn(i))
+        assert memory.tokens == recount(memory)
+        assert memory.tokens <= memory.limit
+    assert memory.evicted_count > 0
+    assert memory.messages()[0] == {"role": "system", "content": SYSTEM}
+
+
+def test_eviction_batches_down_to_low_water_and_keeps_latest():
+    memory = ConversationMemory(SYSTEM, budget=1200, reply_tokens=200, summary_tokens=100, low_water=0.5)
+    while memory.evicted_count == 0:
+        memory.add("user", turn(len(memory)))
+    assert memory.tokens <= int(memory.limit * 0.5)
+    before = len(memory)
+    # A short turn now fits without another eviction
+    memory.add("user", "Short question.")
+    assert len(memory) == before + 1
+
+    oversized = "word " * 10_000
+    memory.add("user", oversized)
+    latest = memory.messages()[-1]
+    assert latest["role"] == "user" and oversized.startswith(latest["content"])
+    assert memory.tokens <= memory.limit
+
+
+def test_rolling_summary_folds_evicted_turns_and_is_capped():
+    memory = ConversationMemory(SYSTEM, budget=1200, reply_tokens=200, summary_tokens=200)
+    memory.add("user", "My name is Danilo. I am a radiologist in São Paulo.")
+    for i in range(1, 60):
+        memory.add("assistant" if i % 2 else "user", turn(i))
+        if memory.evicted_count:
+            break
+    assert memory.summary.startswith("user: My name is Danilo\nassistant: Turn 1 is about topic 1")
+    assert memory.messages()[1]["content"].endswith(memory.summary)
+
+    for i in range(60, 300):
+        memory.add("user", turn(i))
+    assert memory.counter.count(memory.summary) <= 200
+    assert "Danilo" not in memory.summary    # The oldest lines are dropped first
+
+
+def test_llm_summarizer_runs_once_per_eviction_batch():
+    requests = []
+
+    def complete(messages):
+        requests.append(messages)
+        return f"summary {len(requests)}"
+
+    memory = ConversationMemory(SYSTEM, budget=1200, reply_tokens=200, summarizer=llm_summarizer(complete))
+    for i in range(40):
+        memory.add("user", turn(i))
+    assert 0 < len(requests) < memory.evicted_count
+    assert memory.summary == f"summary {len(requests)}"
+    assert "Turn 0 is about topic 0" in requests[0][1]["content"]
+    assert "summary 1" in requests[1][1]["content"]
+
+
+def test_aadd_does_not_block_the_event_loop():
+    async def acomplete(messages):
+        await asyncio.sleep(0.05)
+        return "async summary"
+
+    def slow_complete(messages):
+        time.sleep(0.05)
+        return "thread summary"
+
+    async def conversation(memory):
+        for i in range(40):
+            await memory.aadd("user", turn(i))
+        return memory.summary
+
+    async def ticker(ticks):
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.005)
+
+    async def main():
+        ticks = []
+        task = asyncio.ensure_future(ticker(ticks))
+        summaries = await asyncio.gather(
+            conversation(ConversationMemory(SYSTEM, budget=1200, reply_tokens=200,
+                                            summarizer=allm_summarizer(acomplete))),
+            conversation(ConversationMemory(SYSTEM, budget=1200, reply_tokens=200,
+                                            summarizer=llm_summarizer(slow_complete))),
+        )
+        task.cancel()
+        return summaries, max(b - a for a, b in zip(ticks, ticks[1:]))
+
+    summaries, longest_gap = asyncio.run(main())
+    assert summaries == ["async summary", "thread summary"]
+    # Both summarizers take 50 ms; the loop kept running while they did
+    assert longest_gap < 0.04
+
+    memory = ConversationMemory(SYSTEM, summarizer=allm_summarizer(acomplete))
+    with pytest.raises(ValueError):
+        memory.add("user", "Hi")
+
+
+def test_budget_too_small():
+    with pytest.raises(ValueError):
+        ConversationMemory(SYSTEM, budget=300, reply_tokens=200, summary_tokens=100)
+    assert extractive_summarizer("", [{"role": "user", "content": "First. Second."}]) == "user: First"
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from lisa import LisaTheDataScientist, chat_with_lisa
+from llm_cache import LLMCache
+
+REPLY = ["Use ", "merge ", "on indexed keys."]
+
+
+def _chunk(text, finish_reason=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text),
+                                                    finish_reason=finish_reason)])
+
+
+class StubStream:
+    def __init__(self, pieces):
+        self.chunks = [_chunk(piece) for piece in pieces] + [_chunk(None, "stop")]
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class StubCompletions:
+    """chat.completions of a stubbed openai.OpenAI client."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.calls = []
+
+    def create(self, stream=False, **params):
+        assert stream
+        self.calls.append(params)
+        return StubStream(self.pieces)
+
+
+class AsyncStubStream(StubStream):
+    def __init__(self, pieces, log, name):
+        super().__init__(pieces)
+        self.log, self.name = log, name
+
+    async def _chunks(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)    # Hand control back to the event loop between chunks
+            self.log.append(self.name)
+            yield chunk
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncStubCompletions:
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.log = []
+
+    async def create(self, stream=False, **params):
+        assert stream
+        return AsyncStubStream(self.pieces, self.log, params["messages"][-1]["content"])
+
+
+def make_lisa(tmp_path, monkeypatch, completions=None, **kwargs):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    lisa = LisaTheDataScientist(cache=LLMCache(str(tmp_path / "cache.sqlite3")), **kwargs)
+    if completions is not None:
+        lisa.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return lisa
+
+
+def test_chat_with_lisa_streams_and_replays_from_cache(tmp_path, monkeypatch, capsys):
+    questions = iter(["How do I join two DataFrames?", "", "quit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(questions))
+    completions = StubCompletions(REPLY)
+    lisa = make_lisa(tmp_path, monkeypatch, completions)
+    chat_with_lisa(lisa)
+
+    assert "Lisa: Use merge on indexed keys.\n" in capsys.readouterr().out
+    assert len(completions.calls) == 1    # The empty input is skipped
+    assert lisa.chat_history[-1] == {"role": "assistant", "content": "Use merge on indexed keys."}
+
+    # Same question in a fresh conversation: replayed from the cache, no API call
+    questions = iter(["How do I join two DataFrames?", "exit"])
+    replay = StubCompletions(REPLY)
+    chat_with_lisa(make_lisa(tmp_path, monkeypatch, replay))
+    assert "Lisa: Use merge on indexed keys.\n" in capsys.readouterr().out
+    assert replay.calls == []
+
+
+def test_stream_yields_pieces_and_keeps_partial_reply(tmp_path, monkeypatch):
+    lisa = make_lisa(tmp_path, monkeypatch, StubCompletions(REPLY))
+    assert list(lisa.stream_listen_and_act("Fastest join?")) == REPLY
+
+    stream = lisa.stream_listen_and_act("And in SQL?")
+    assert next(stream) == "Use "
+    stream.close()
+    assert lisa.chat_history[-1] == {"role": "assistant", "content": "Use "}
+
+
+def test_async_conversations_share_one_event_loop(tmp_path, monkeypatch):
+    completions = AsyncStubCompletions(REPLY)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr("lisa.openai.AsyncOpenAI", lambda **kwargs: client)
+    first = make_lisa(tmp_path, monkeypatch)
+    second = make_lisa(tmp_path, monkeypatch)
+
+    async def collect(lisa, question):
+        return [text async for text in lisa.astream_listen_and_act(question)]
+
+    async def main():
+        return await asyncio.gather(collect(first, "A?"), collect(second, "B?"))
+
+    assert asyncio.run(main()) == [REPLY, REPLY]
+    # The two streams were read interleaved, not one after the other
+    assert completions.log[:2] == ["A?", "B?"]
+
+
+def test_stream_against_local_mock_endpoint(tmp_path, monkeypatch):
+    requests = []
+
+    class MockChatCompletions(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"    # Keep-alive, so clients reuse pooled connections
+
+        def do_POST(self):
+            requests.append(json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+            body = b""
+            for piece in REPLY + [None]:
+                chunk = {"id": "mock", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o",
+                         "choices": [{"index": 0, "delta": {"content": piece} if piece else {},
+                                      "finish_reason": None if piece else "stop"}]}
+                body += f"data: {json.dumps(chunk)}\n\n".encode()
+            body += b"data: [DONE]\n\n"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockChatCompletions)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}/v1"
+        lisa = make_lisa(tmp_path, monkeypatch, base_url=base_url)
+        assert list(lisa.stream_listen_and_act("Fastest join?")) == REPLY
+
+        async def collect(question):
+            return [text async for text in lisa.astream_listen_and_act(question)]
+
+        assert asyncio.run(collect("And in SQL?")) == REPLY
+        # A second event loop gets its own client instead of the closed loop's connections
+        assert asyncio.run(collect("And in Spark?")) == REPLY
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [request["stream"] for request in requests] == [True, True, True]
+    assert requests[1]["messages"][-2] == {"role": "assistant", "content": "Use merge on indexed keys."}
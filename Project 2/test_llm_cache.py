@@ -0,0 +1,166 @@
+import asyncio
+import sys
+import threading
+from types import ModuleType, SimpleNamespace
+
+from openai.types.chat import ChatCompletion, ParsedChatCompletion
+from pydantic import BaseModel
+
+from llm_cache import LLMCache, acached_chat_completion, cache_key, cached_chat_completion, install_tinytroupe_cache
+
+MESSAGES = [{"role": "system", "content": "You are Lisa."}, {"role": "user", "content": "Hi!"}]
+
+
+def completion(text):
+    return ChatCompletion.model_validate({
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": text}}],
+    })
+
+
+class StubCompletions:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def create(self, **params):
+        self.calls += 1
+        return completion(self.text)
+
+
+def stub_client(text="Hello, Danilo."):
+    return SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions(text)))
+
+
+def test_miss_then_hit(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+    client = stub_client()
+    first = cached_chat_completion(client, cache, model="gpt-4o", messages=MESSAGES)
+    second = cached_chat_completion(client, cache, model="gpt-4o", messages=MESSAGES)
+    assert client.chat.completions.calls == 1
+    assert second.choices[0].message.content == first.choices[0].message.content == "Hello, Danilo."
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert cache.get(cache_key({"model": "gpt-4o", "messages": MESSAGES[:1]})) is None
+
+
+def test_key_depends_on_model_parameters_and_messages():
+    base = {"model": "gpt-4o", "messages": MESSAGES, "temperature": 1.2}
+    key = cache_key(base)
+    # Dict order does not matter, content does
+    assert cache_key(dict(reversed(list(base.items())))) == key
+    assert cache_key(dict(base, model="gpt-4o-mini")) != key
+    assert cache_key(dict(base, temperature=0.7)) != key
+    assert cache_key(dict(base, max_tokens=100)) != key
+    assert cache_key(dict(base, messages=MESSAGES + [{"role": "user", "content": "More"}])) != key
+
+
+def test_entries_persist_across_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path)
+    cached_chat_completion(stub_client(), cache, model="gpt-4o", messages=MESSAGES)
+    cache.close()
+
+    reopened = LLMCache(path)
+    client = stub_client("A different reply")
+    response = cached_chat_completion(client, reopened, model="gpt-4o", messages=MESSAGES)
+    assert client.chat.completions.calls == 0
+    assert response.choices[0].message.content == "Hello, Danilo."
+    assert len(reopened) == 1
+
+
+def test_eviction_by_count_and_age(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("llm_cache.time.time", lambda: clock[0])
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_entries=2, max_age=60)
+    for i in range(3):
+        clock[0] += 1
+        cache.put(f"key-{i}", "gpt-4o", {"n": i})
+    # The least recently used entry goes first
+    assert cache.evict() == 1
+    assert cache.get("key-0") is None and cache.get("key-2") == {"n": 2}
+
+    clock[0] += 120
+    assert cache.get("key-2") is None    # Expired entries are misses before eviction runs
+    assert cache.evict() == 2 and len(cache) == 0
+
+
+def test_async_path_keeps_sqlite_off_the_event_loop(tmp_path):
+    threads = []
+
+    class RecordingCache(LLMCache):
+        def get(self, key):
+            threads.append(threading.current_thread())
+            return super().get(key)
+
+        def put(self, key, model, response):
+            threads.append(threading.current_thread())
+            super().put(key, model, response)
+
+    class AsyncCompletions:
+        async def create(self, **params):
+            return completion("Hello, Danilo.")
+
+    cache = RecordingCache(str(tmp_path / "cache.sqlite3"))
+    client = SimpleNamespace(chat=SimpleNamespace(completions=AsyncCompletions()))
+
+    async def ask_twice():
+        first = await acached_chat_completion(client, cache, model="gpt-4o", messages=MESSAGES)
+        second = await acached_chat_completion(client, cache, model="gpt-4o", messages=MESSAGES)
+        return first, second
+
+    first, second = asyncio.run(ask_twice())
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    # get (miss), put, get (hit): none of them on the loop's thread
+    assert len(threads) == 3 and threading.main_thread() not in threads
+
+
+class Verdict(BaseModel):
+    answer: str
+    confidence: float
+
+
+class StubTinyTroupeClient:
+    """Stands in for tinytroupe.openai_utils.OpenAIClient; parse calls return ParsedChatCompletion."""
+    calls = 0
+
+    def __init__(self, cache_api_calls=True):
+        pass
+
+    def _raw_model_call(self, model, chat_api_params):
+        StubTinyTroupeClient.calls += 1
+        response_format = chat_api_params.get("response_format")
+        if response_format is None:
+            return completion("Hello, Danilo.")
+        return ParsedChatCompletion[response_format].model_validate({
+            "id": "chatcmpl-2", "object": "chat.completion", "created": 0, "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {
+                "role": "assistant", "content": '{"answer": "yes", "confidence": 0.9}',
+                "parsed": {"answer": "yes", "confidence": 0.9}}}],
+        })
+
+
+def test_tinytroupe_replays_keep_the_response_type(tmp_path, monkeypatch):
+    clients = {}
+    openai_utils = ModuleType("tinytroupe.openai_utils")
+    openai_utils.OpenAIClient = openai_utils.AzureClient = StubTinyTroupeClient
+    openai_utils.register_client = clients.__setitem__
+    tinytroupe = ModuleType("tinytroupe")
+    tinytroupe.openai_utils = openai_utils
+    monkeypatch.setitem(sys.modules, "tinytroupe", tinytroupe)
+    monkeypatch.setitem(sys.modules, "tinytroupe.openai_utils", openai_utils)
+    monkeypatch.setattr(StubTinyTroupeClient, "calls", 0)
+
+    install_tinytroupe_cache(LLMCache(str(tmp_path / "cache.sqlite3")))
+    client = clients["openai"]
+    structured = {"messages": MESSAGES, "response_format": Verdict}
+    first = client._raw_model_call("gpt-4o", structured)
+    replay = client._raw_model_call("gpt-4o", structured)
+    assert StubTinyTroupeClient.calls == 1
+    assert isinstance(replay, ParsedChatCompletion) and replay == first
+    assert replay.choices[0].message.parsed == Verdict(answer="yes", confidence=0.9)
+
+    plain = client._raw_model_call("gpt-4o", {"messages": MESSAGES})
+    replay = client._raw_model_call("gpt-4o", {"messages": MESSAGES})
+    assert StubTinyTroupeClient.calls == 2
+    assert type(replay) is ChatCompletion and replay == plain
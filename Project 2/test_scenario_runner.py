@@ -0,0 +1,68 @@
+import json
+import os
+
+from scenario_runner import load_scenarios, load_transcripts, run_scenarios
+
+SCENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json")
+
+
+def stub_agent(spec, variables):
+    """Replies with the agent type and the first sentence of the prompt, no model call."""
+    def reply(prompt):
+        if "FAIL" in prompt:
+            raise RuntimeError("provider error")
+        return f"<{spec.get('type')}> {prompt.split('.')[0]}"
+    return reply
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_two_scenarios_write_ordered_jsonl_and_resume(tmp_path):
+    scenarios = load_scenarios(SCENARIOS)
+    assert len(scenarios) == 4    # Three topics of lisa-danilo plus lisa-chat-pandas
+    chosen = [scenarios[0], scenarios[-1]]
+    transcript = str(tmp_path / "transcripts.jsonl")
+
+    statuses = run_scenarios(chosen, transcript, max_workers=2, build_agent=stub_agent)
+    assert statuses == {chosen[0]["id"]: "done", chosen[1]["id"]: "done"}
+
+    records = read_records(transcript)
+    assert len({record["run"] for record in records}) == 1
+    for scenario in chosen:
+        own = [record for record in records if record["scenario"] == scenario["id"]]
+        # Every turn in order, then the scenario's done record
+        assert [record["event"] for record in own] == ["turn"] * len(scenario["turns"]) + ["done"]
+        assert [record["turn"] for record in own[:-1]] == list(range(len(scenario["turns"])))
+        assert [record["speaker"] for record in own[:-1]] == [turn["speaker"] for turn in scenario["turns"]]
+        assert own[-1]["turns"] == len(scenario["turns"])
+
+    danilo = load_transcripts(transcript)[chosen[0]["id"]]
+    assert danilo[0]["reply"] == "<example> Introduce yourself to Danilo, a radiologist you just met"
+    # Later prompts are filled in with earlier replies and the matrix value
+    assert danilo[1]["prompt"].startswith(f"Lisa just said: '{danilo[0]['reply']}'")
+    assert chosen[0]["vars"]["topic"] in danilo[3]["prompt"]
+    pandas = load_transcripts(transcript)[chosen[1]["id"]]
+    assert pandas[1]["prompt"] == f"You said: '{pandas[0]['reply']}'. How would that look in SQL?"
+
+    # A rerun skips finished scenarios and appends nothing
+    assert run_scenarios(chosen, transcript, max_workers=2, build_agent=stub_agent) == {
+        chosen[0]["id"]: "skipped", chosen[1]["id"]: "skipped"}
+    assert len(read_records(transcript)) == len(records)
+
+
+def test_failed_scenario_is_recorded_and_rerun(tmp_path):
+    scenario = dict(load_scenarios(SCENARIOS)[-1])
+    scenario["turns"] = [{"speaker": "lisa", "prompt": "Hello."}, {"speaker": "lisa", "prompt": "FAIL now."}]
+    transcript = str(tmp_path / "transcripts.jsonl")
+
+    assert run_scenarios([scenario], transcript, max_workers=1, build_agent=stub_agent) == {scenario["id"]: "failed"}
+    records = read_records(transcript)
+    assert [record["event"] for record in records] == ["turn", "failed"]
+    assert records[-1]["error"] == "RuntimeError: provider error"
+
+    # Not marked done, so resuming runs it again
+    assert run_scenarios([scenario], transcript, max_workers=1, build_agent=stub_agent) == {scenario["id"]: "failed"}
+    assert load_transcripts(transcript) == {}
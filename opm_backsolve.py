@@ -0,0 +1,176 @@
+"""
+Backsolve Engine for the OPM
+Solves for the total equity value implied by a transaction price, in bulk
+
+A class's value is a non-negative combination of slice values,
+    value(E) = Σ_i w_i · (C(K[i-1]) - C(K[i]))    (see opm_pricing.slice_values)
+so it is increasing in the equity value E and its derivative is the same
+combination of the call deltas. The solver brackets the root (value(0) = 0, the
+upper end is expanded until the class is worth at least the target) and takes
+Newton steps with the analytic delta, falling back to bisection whenever a step
+would leave the bracket. Strike-dependent terms (log K, K·e^(-rT), the call
+weights) are computed once per round, not per iteration, and every round is
+solved in the same array pass.
+
+No printing; each round reports its iterations and status:
+- "converged": |value(E) - target| within tolerance
+- "unreachable": the class is capped below the target value at any equity value
+- "max_iter": iteration limit hit (equity value is the last iterate, inside the bracket)
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy.special import ndtr
+
+CONVERGED = "converged"
+UNREACHABLE = "unreachable"
+MAX_ITER = "max_iter"
+
+# Bracket expansion: hi *= 4 up to 40 times covers any realistic equity value
+_EXPANSIONS = 40
+
+
+class BacksolveResult(NamedTuple):
+    """Per-round backsolve output, each shaped like the broadcast inputs."""
+    equity_value: np.ndarray  # NaN where unreachable
+    iterations: np.ndarray
+    converged: np.ndarray
+    status: np.ndarray        # object array of status strings
+    residual: np.ndarray      # value(E) - target class value
+
+
+class _Rounds:
+    """Strike-dependent terms, computed once per round."""
+
+    def __init__(self, breakpoints, weights, T, r, sigma, q, shape):
+        n = breakpoints.shape[-1]
+        K = np.broadcast_to(breakpoints, shape + (n,)).reshape(-1, n)
+        w = np.broadcast_to(weights, shape + (n + 1,)).reshape(-1, n + 1)
+        T, r, sigma, q = (np.broadcast_to(a, shape).reshape(-1, 1) for a in (T, r, sigma, q))
+
+        # value = Σ_j c_j · C(K_j) over strikes [0, K...], with c_j = w_j - w_(j-1)
+        self.call_weights = w - np.concatenate([np.zeros((w.shape[0], 1)), w[:, :-1]], axis=1)
+        K = np.concatenate([np.zeros((K.shape[0], 1)), K], axis=1)
+        with np.errstate(divide='ignore'):
+            self.log_k = np.log(K)
+        self.discounted_k = K * np.exp(-r * T)
+        self.vol_sqrt_t = sigma * np.sqrt(T)
+        self.drift = (r - q + 0.5 * sigma ** 2) * T
+        self.df_q = np.exp(-q * T)
+
+        # As E → ∞ every bounded slice is worth its discounted width; the top slice is unbounded
+        widths = np.diff(self.discounted_k, axis=1)
+        self.value_limit = np.where(w[:, -1] > 0, np.inf, np.einsum('ij,ij->i', w[:, :-1], widths))
+
+    def value_and_delta(self, equity_value, rows):
+        """Class value and its derivative at equity_value (one per row in rows)."""
+        S = equity_value[:, None]
+        vst = self.vol_sqrt_t[rows]
+        with np.errstate(divide='ignore'):
+            d1 = (np.log(S) - self.log_k[rows] + self.drift[rows]) / vst
+        n_d1 = ndtr(d1)
+        calls = S * self.df_q[rows] * n_d1 - self.discounted_k[rows] * ndtr(d1 - vst)
+        deltas = self.df_q[rows] * n_d1
+        c = self.call_weights[rows]
+        return np.einsum('ij,ij->i', c, calls), np.einsum('ij,ij->i', c, deltas)
+
+
+def backsolve_equity_value(target_pps, breakpoints, weights, shares, T, r, sigma, q=0.0,
+                           initial_guess=None, tol=1e-10, max_iter=50) -> BacksolveResult:
+    """
+    Total equity value at which the target class is worth target_pps per share.
+
+    Args:
+        target_pps: Transaction price per share, scalar or one per round
+        breakpoints: Sorted breakpoints, (n,) or (*rounds, n)
+        weights: Target class share of each slice, (n + 1,) or (*rounds, n + 1)
+        shares: Target class shares outstanding
+        T, r, sigma, q: OPM inputs (time to exit, rate, volatility, dividend yield)
+        initial_guess: Optional starting equity value(s)
+        tol: Relative tolerance on the class value
+        max_iter: Newton/bisection iterations per round
+
+    Raises:
+        ValueError: on unsorted breakpoints, negative weights, non-positive
+            prices/shares or zero volatility/term
+    """
+    breakpoints = np.atleast_1d(np.asarray(breakpoints, dtype=float))
+    weights = np.atleast_1d(np.asarray(weights, dtype=float))
+    if weights.shape[-1] != breakpoints.shape[-1] + 1:
+        raise ValueError("weights need one entry per slice (len(breakpoints) + 1)")
+    if np.any(np.diff(breakpoints, axis=-1) < 0) or np.any(breakpoints < 0):
+        raise ValueError("breakpoints must be non-negative and sorted in ascending order")
+    if np.any(weights < 0):
+        raise ValueError("slice weights must be non-negative")
+
+    target_pps, shares, T, r, sigma, q = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (target_pps, shares, T, r, sigma, q)))
+    shape = np.broadcast_shapes(target_pps.shape, breakpoints.shape[:-1], weights.shape[:-1])
+    if np.any(target_pps <= 0) or np.any(shares <= 0):
+        raise ValueError("target price and shares must be positive")
+    if np.any(sigma * T <= 0):
+        raise ValueError("volatility and time to exit must be positive")
+
+    rounds = _Rounds(breakpoints, weights, T, r, sigma, q, shape)
+    target = np.broadcast_to(target_pps * shares, shape).reshape(-1)
+    top = np.broadcast_to(breakpoints[..., -1], shape).reshape(-1)
+    size = target.size
+    all_rows = np.arange(size)
+    atol = tol * target
+
+    # Bracket: value(0) = 0 < target; expand hi until value(hi) >= target. A class with
+    # no share of the top slice never exceeds its limit, so don't chase those targets.
+    lo = np.zeros(size)
+    hi = 2.0 * np.maximum(target, top) + 1.0
+    f_hi = rounds.value_and_delta(hi, all_rows)[0] - target
+    capped = rounds.value_limit <= target
+    for _ in range(_EXPANSIONS):
+        short = (f_hi < 0) & ~capped
+        if not short.any():
+            break
+        lo[short] = hi[short]
+        hi[short] *= 4.0
+        f_hi[short] = rounds.value_and_delta(hi[short], all_rows[short])[0] - target[short]
+    reachable = (f_hi >= 0) & ~capped
+
+    x = 0.5 * (lo + hi)
+    if initial_guess is not None:
+        guess = np.broadcast_to(np.asarray(initial_guess, dtype=float), shape).reshape(-1)
+        inside = (guess > lo) & (guess < hi)
+        x = np.where(inside, guess, x)
+
+    iterations = np.zeros(size, dtype=int)
+    residual = np.full(size, np.nan)
+    converged = np.zeros(size, dtype=bool)
+    active = all_rows[reachable]
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        value, delta = rounds.value_and_delta(x[active], active)
+        f = value - target[active]
+        iterations[active] += 1
+        residual[active] = f
+
+        done = np.abs(f) <= atol[active]
+        converged[active[done]] = True
+
+        # Shrink the bracket, then Newton; bisect when the step leaves it
+        below = f < 0
+        lo[active] = np.where(below, x[active], lo[active])
+        hi[active] = np.where(below, hi[active], x[active])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = x[active] - f / delta
+        a, b = lo[active], hi[active]
+        safe = (delta > 0) & (step > a) & (step < b)
+        x[active] = np.where(done, x[active], np.where(safe, step, 0.5 * (a + b)))
+        active = active[~done]
+
+    status = np.full(size, MAX_ITER, dtype=object)
+    status[converged] = CONVERGED
+    status[~reachable] = UNREACHABLE
+    equity_value = np.where(reachable, x, np.nan)
+    return BacksolveResult(
+        equity_value.reshape(shape), iterations.reshape(shape), converged.reshape(shape),
+        status.reshape(shape), residual.reshape(shape)
+    )
@@ -0,0 +1,243 @@
+"""
+Breakpoint Engine for the OPM
+Builds the full breakpoint schedule from a cap table, memoized per cap-table version
+
+Breakpoints are the exit values where any security's payoff changes slope:
+- the preference stack: debt, then each seniority tier of liquidation preferences
+- above it, events at a common price per share p:
+    non-participating preferred converts        p = L / m
+    participating preferred reaches its cap     p = (cap - L) / m
+    capped participating preferred converts     p = cap / m
+    options/warrants become exercisable         p = strike
+  (L = liquidation preference, m = shares × conversion_ratio)
+
+Each event's p does not depend on any other security, but the exit value at which
+it happens does: it depends on who is already sharing the residual. Events are
+collected in one pass, sorted once by p, then swept in that order while
+tracking the number of shares sharing each extra dollar (the slope dX/dp):
+    X(p_k) = X(p_(k-1)) + slope × (p_k - p_(k-1))
+and each event then adds or removes its shares from the slope. Total cost
+O(n log n) for n securities and option tiers (the sort dominates).
+
+Schedules are cached by a hash of the normalized cap table, so repeated
+valuations of the same cap table (backsolves, sensitivity grids, scenarios)
+reuse the schedule instead of rebuilding it.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['security_name', 'shares_outstanding']
+DEFAULTS = {
+    'liquidation_preference': 0.0,
+    'seniority': 1.0,
+    'participation_cap': 0.0,
+    'conversion_ratio': 1.0,
+    'strike_price': 0.0,
+    'debt_amount': 0.0,
+}
+WATERFALL_COLUMNS = REQUIRED_COLUMNS + list(DEFAULTS) + ['participating']
+
+CACHE_SIZE = 128
+
+# ========== Cap Tables ==========
+
+
+def normalize_cap_table(cap_table) -> pd.DataFrame:
+    """Cap table as a DataFrame with every waterfall column filled and validated."""
+    if isinstance(cap_table, dict):
+        table = pd.DataFrame(cap_table)
+    elif isinstance(cap_table, pd.DataFrame):
+        table = cap_table.copy()
+    else:
+        raise ValueError("Cap table must be dict or DataFrame")
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in table.columns]
+    if missing:
+        raise ValueError(f"Cap table is missing columns: {', '.join(missing)}")
+    if table['security_name'].duplicated().any():
+        raise ValueError("Security names must be unique")
+
+    for column, default in DEFAULTS.items():
+        if column not in table.columns:
+            table[column] = default
+        table[column] = pd.to_numeric(table[column]).fillna(default).astype(float)
+    table['shares_outstanding'] = pd.to_numeric(table['shares_outstanding']).fillna(0).astype(float)
+    if 'participating' not in table.columns:
+        table['participating'] = table['participation_cap'] > 0
+    table['participating'] = table['participating'].fillna(False).astype(bool)
+
+    numeric = table[['shares_outstanding', 'liquidation_preference', 'participation_cap',
+                     'strike_price', 'debt_amount']]
+    if (numeric < 0).any().any():
+        raise ValueError("Shares, preferences, caps, strikes and debt must be non-negative")
+    if (table['conversion_ratio'] <= 0).any():
+        raise ValueError("Conversion ratios must be positive")
+    capped = table['participating'] & (table['participation_cap'] > 0)
+    if (table.loc[capped, 'participation_cap'] < table.loc[capped, 'liquidation_preference']).any():
+        raise ValueError("A participation cap cannot be below the liquidation preference")
+    if table['shares_outstanding'].sum() <= 0:
+        raise ValueError("Cap table has no equity shares")
+    return table.reset_index(drop=True)
+
+
+def cap_table_version(table: pd.DataFrame) -> str:
+    """Content hash of the waterfall columns of a normalized cap table."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(table[WATERFALL_COLUMNS], index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def with_option_tiers(cap_table, securities: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Cap table plus the option/warrant tiers of a CSEEngine (its `securities` dict).
+
+    Each option tier becomes a row with its strike price, so its exercise point
+    enters the schedule. Non-option securities are expected in cap_table already.
+    """
+    table = cap_table.copy() if isinstance(cap_table, pd.DataFrame) else pd.DataFrame(cap_table)
+    rows = [
+        {'security_name': name,
+         'shares_outstanding': security['shares'],
+         'conversion_ratio': security.get('conversion_ratio', 1.0),
+         'strike_price': security.get('strike_price') or 0.0}
+        for name, security in securities.items()
+        if security.get('is_option')
+    ]
+    if not rows:
+        return table
+    return pd.concat([table, pd.DataFrame(rows)], ignore_index=True)
+
+
+# ========== Schedule ==========
+
+
+class BreakpointSchedule(NamedTuple):
+    """Everything the waterfall needs that depends only on the cap table."""
+    version: str
+    table: pd.DataFrame
+    breakpoints: np.ndarray       # unique sorted exit values
+    schedule: List[Dict]          # one labelled entry per event, sorted by value
+    tier_starts: np.ndarray       # preference stack
+    tier_sizes: np.ndarray
+    tier_shares: np.ndarray       # (n_tiers, n_securities), rows sum to 1
+    preference_total: float
+    knots_pps: np.ndarray         # residual regime: X(p) is linear between knots
+    knots_exit: np.ndarray
+    slopes: np.ndarray            # dX/dp from each knot to the next
+
+
+_cache: "OrderedDict[str, BreakpointSchedule]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def build_schedule(cap_table) -> BreakpointSchedule:
+    """Breakpoint schedule for a cap table, from the cache when this version was seen before."""
+    table = normalize_cap_table(cap_table)
+    version = cap_table_version(table)
+    with _cache_lock:
+        if version in _cache:
+            _cache.move_to_end(version)
+            return _cache[version]
+    schedule = _compile(table, version)
+    with _cache_lock:
+        _cache[version] = schedule
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return schedule
+
+
+def clear_schedule_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+def _compile(table: pd.DataFrame, version: str) -> BreakpointSchedule:
+    names = table['security_name'].tolist()
+    m = (table['shares_outstanding'] * table['conversion_ratio']).to_numpy()
+    preference = table['liquidation_preference'].to_numpy()
+    participating = table['participating'].to_numpy()
+    cap = table['participation_cap'].to_numpy()
+    capped = participating & (cap > 0)
+    strike = table['strike_price'].to_numpy()
+    debt = table['debt_amount'].to_numpy()
+    seniority = table['seniority'].to_numpy()
+    is_preferred = preference > 0
+
+    # Preference stack: debt, then seniority tiers, most senior first
+    tiers = [(debt, "Debt Repayment", 'debt')]
+    for rank in sorted(set(seniority[is_preferred]), reverse=True):
+        amounts = np.where(is_preferred & (seniority == rank), preference, 0.0)
+        members = ', '.join(name for name, amount in zip(names, amounts) if amount > 0)
+        tiers.append((amounts, f"{members} Liquidation Preference", 'liquidation_preference'))
+    tiers = [tier for tier in tiers if tier[0].sum() > 0]
+    tier_sizes = np.array([amounts.sum() for amounts, _, _ in tiers])
+    tier_starts = np.concatenate([[0.0], np.cumsum(tier_sizes)[:-1]])
+    tier_shares = (np.array([amounts for amounts, _, _ in tiers]).reshape(-1, len(names))
+                   / np.maximum(tier_sizes, 1e-300)[:, None])
+    preference_total = float(tier_sizes.sum())
+
+    schedule = [
+        {'value': float(start + size), 'description': description, 'type': kind}
+        for (_, description, kind), start, size in zip(tiers, tier_starts, tier_sizes)
+    ]
+
+    # Residual events: (pps, slope change, kind, security), sorted by pps once collected
+    events = []
+    for j in range(len(names)):
+        if m[j] <= 0:
+            continue
+        if is_preferred[j] and not participating[j]:
+            events.append((preference[j] / m[j], m[j], 'conversion', j))
+        elif is_preferred[j] and capped[j]:
+            events.append(((cap[j] - preference[j]) / m[j], -m[j], 'participation_cap', j))
+            events.append((cap[j] / m[j], m[j], 'conversion', j))
+        elif not is_preferred[j] and strike[j] > 0:
+            events.append((strike[j], m[j], 'option_exercise', j))
+    events.sort()
+
+    # Shares sharing the residual just above p = 0: common, strike-0 options, participating preferred
+    slope = float(m[(~is_preferred & (strike <= 0)) | (is_preferred & participating)].sum())
+    labels = {
+        'conversion': "{name} Converts to Common",
+        'participation_cap': "{name} Participation Cap",
+        'option_exercise': "{name} Exercise at ${pps:,.2f}",
+    }
+    knots_pps, knots_exit, slopes = [0.0], [preference_total], []
+    pps, exit_value = 0.0, preference_total
+    for event_pps, slope_change, kind, j in events:
+        if event_pps > pps:
+            exit_value += slope * (event_pps - pps)
+            pps = event_pps
+            slopes.append(slope)
+            knots_pps.append(pps)
+            knots_exit.append(exit_value)
+        slope += slope_change
+        schedule.append({
+            'value': float(exit_value),
+            'description': labels[kind].format(name=names[j], pps=event_pps),
+            'type': kind,
+            'security': names[j],
+            'common_pps': float(event_pps),
+        })
+    slopes.append(slope)
+
+    schedule.sort(key=lambda bp: bp['value'])
+    return BreakpointSchedule(
+        version=version,
+        table=table,
+        breakpoints=np.unique([bp['value'] for bp in schedule]),
+        schedule=schedule,
+        tier_starts=tier_starts,
+        tier_sizes=tier_sizes,
+        tier_shares=tier_shares,
+        preference_total=preference_total,
+        knots_pps=np.array(knots_pps),
+        knots_exit=np.array(knots_exit),
+        slopes=np.array(slopes),
+    )
@@ -0,0 +1,143 @@
+"""
+DLOM Models
+Protective put, Finnerty average-strike put and Longstaff lookback bound, vectorized
+
+Every model is a closed form in volatility σ and time to liquidity T, and takes
+arrays that broadcast against each other, so DLOMs for many companies and many
+holding periods are one call. Results are fractions of the marketable value.
+
+- Chaffe (1993) protective put: an at-the-money European put,
+      DLOM = P(S=1, K=1, T, r, σ, q)
+- Finnerty (2012) average-strike put: a put struck at the average price over
+  the holding period, with the corrected variance term
+      v²T  = σ²T + ln[2(e^(σ²T) - σ²T - 1)] - 2 ln(e^(σ²T) - 1)
+      DLOM = e^(-qT) [2 N(v√T / 2) - 1]
+  It does not depend on r and never exceeds 32.28% (the σ²T → ∞ limit).
+- Longstaff (1995) lookback: the most an investor with perfect market timing
+  would pay to be able to sell at any time, an upper bound on the DLOM,
+      DLOM = (2 + σ²T/2) N(σ√T / 2) + σ√T / √(2π) · e^(-σ²T/8) - 1
+  It grows without bound in σ√T and can exceed 100%.
+"""
+
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from opm_pricing import price_puts
+
+DLOM_METHODS = ('chaffe', 'finnerty', 'longstaff')
+
+# Below this σ²T the Finnerty variance term is summed as a series (the closed form cancels)
+_SERIES_LIMIT = 1.0
+_SERIES_TERMS = 20
+
+
+class DLOMEstimates(NamedTuple):
+    """DLOM per method, each broadcast to the common shape of the inputs."""
+    chaffe: np.ndarray
+    finnerty: np.ndarray
+    longstaff: np.ndarray
+
+
+def _variance_time(volatility, time_to_liquidity):
+    sigma = np.asarray(volatility, dtype=float)
+    T = np.asarray(time_to_liquidity, dtype=float)
+    if np.any(sigma < 0) or np.any(T < 0):
+        raise ValueError("Volatility and time to liquidity must be non-negative")
+    return sigma, T, sigma ** 2 * T
+
+
+def _finnerty_variance(x: np.ndarray) -> np.ndarray:
+    """v²T as a function of x = σ²T, accurate from 0 to overflow territory."""
+    x = np.asarray(x, dtype=float)
+    small = x < _SERIES_LIMIT
+
+    # Small x: with g = (e^x - 1 - x) / (x²/2) and h = (e^x - 1) / x,
+    # v²T = x + ln g - 2 ln h, and g - 1, h - 1 are power series without cancellation
+    xs = np.where(small, x, 0.0)
+    g_minus_1 = np.zeros_like(xs)
+    h_minus_1 = np.zeros_like(xs)
+    power, factorial = np.ones_like(xs), 1.0
+    for k in range(1, _SERIES_TERMS + 1):
+        power = power * xs
+        factorial *= k + 1            # (k + 1)!
+        h_minus_1 += power / factorial
+        g_minus_1 += 2 * power / (factorial * (k + 2))
+    series = xs + np.log1p(g_minus_1) - 2 * np.log1p(h_minus_1)
+
+    # Large x: the same expression with e^x factored out of both logarithms
+    xl = np.where(small, _SERIES_LIMIT, x)
+    decay = np.exp(-xl)
+    closed = np.log(2.0) + np.log1p(-(xl + 1) * decay) - 2 * np.log1p(-decay)
+    return np.where(small, series, closed)
+
+
+def chaffe_dlom(volatility, time_to_liquidity, risk_free_rate=0.05, dividend_yield=0.0) -> np.ndarray:
+    """Chaffe protective put: at-the-money put value per dollar of marketable value."""
+    _variance_time(volatility, time_to_liquidity)
+    puts = price_puts(1.0, [1.0], T=time_to_liquidity, r=risk_free_rate, sigma=volatility, q=dividend_yield)
+    return puts[..., 0]
+
+
+def finnerty_dlom(volatility, time_to_liquidity, dividend_yield=0.0) -> np.ndarray:
+    """Finnerty (2012) average-strike put DLOM."""
+    _, T, x = _variance_time(volatility, time_to_liquidity)
+    half_vol = 0.5 * np.sqrt(_finnerty_variance(x))
+    return np.exp(-np.asarray(dividend_yield, dtype=float) * T) * (2 * ndtr(half_vol) - 1)
+
+
+def longstaff_dlom(volatility, time_to_liquidity) -> np.ndarray:
+    """Longstaff (1995) lookback upper bound on the DLOM."""
+    _, _, x = _variance_time(volatility, time_to_liquidity)
+    vol_sqrt_t = np.sqrt(x)
+    return (2 + 0.5 * x) * ndtr(0.5 * vol_sqrt_t) + vol_sqrt_t / np.sqrt(2 * np.pi) * np.exp(-x / 8) - 1
+
+
+def dlom_estimates(volatility, time_to_liquidity, risk_free_rate=0.05, dividend_yield=0.0) -> DLOMEstimates:
+    """All three models for the same (broadcast) inputs."""
+    shape = np.broadcast_shapes(*(np.shape(value) for value in
+                                  (volatility, time_to_liquidity, risk_free_rate, dividend_yield)))
+    return DLOMEstimates(
+        chaffe=np.broadcast_to(chaffe_dlom(volatility, time_to_liquidity, risk_free_rate, dividend_yield), shape),
+        finnerty=np.broadcast_to(finnerty_dlom(volatility, time_to_liquidity, dividend_yield), shape),
+        longstaff=np.broadcast_to(longstaff_dlom(volatility, time_to_liquidity), shape),
+    )
+
+
+def dlom_table(volatility, time_to_liquidity, risk_free_rate=0.05, dividend_yield=0.0,
+               company: Optional[Sequence] = None) -> pd.DataFrame:
+    """
+    DLOM for every combination of company and holding period, all methods side by side.
+
+    Args:
+        volatility: Scalar or one volatility per company
+        time_to_liquidity: Scalar or 1-D holding periods (years)
+        risk_free_rate, dividend_yield: Scalars or one value per company
+        company: Company labels (default: position in volatility)
+
+    Returns:
+        Tidy DataFrame: company, volatility, time_to_liquidity, chaffe, finnerty, longstaff
+    """
+    sigma = np.atleast_1d(np.asarray(volatility, dtype=float))
+    T = np.atleast_1d(np.asarray(time_to_liquidity, dtype=float))
+    if sigma.ndim != 1 or T.ndim != 1:
+        raise ValueError("volatility and time_to_liquidity must be scalars or 1-D sequences")
+    if company is None:
+        company = np.arange(sigma.size)
+    if len(company) != sigma.size:
+        raise ValueError("company needs one label per volatility")
+    per_company = [np.broadcast_to(np.asarray(value, dtype=float), sigma.shape)[:, None]
+                   for value in (risk_free_rate, dividend_yield)]
+
+    # (companies, holding periods) in one broadcast
+    estimates = dlom_estimates(sigma[:, None], T[None, :], *per_company)
+    table = pd.DataFrame({
+        'company': np.repeat(np.asarray(company), T.size),
+        'volatility': np.repeat(sigma, T.size),
+        'time_to_liquidity': np.tile(T, sigma.size),
+    })
+    for method in DLOM_METHODS:
+        table[method] = getattr(estimates, method).reshape(-1)
+    return table
@@ -0,0 +1,182 @@
+"""
+Monte Carlo OPM Engine
+Simulated exit values through the full waterfall, with variance reduction
+
+Terminal equity values follow risk-neutral GBM over the time to exit. The exit
+time can be a fixed term or drawn per path (e.g. DiscreteExitTiming), which makes
+the exit-value distribution a mixture of lognormals that closed-form OPM cannot
+price. Every path goes through Waterfall.payoffs in one array operation, and
+payoffs are discounted over that path's own term.
+
+Variance reduction:
+- antithetic variates: each normal draw Z is paired with -Z (same exit time)
+- control variates: the discounted payoffs of calls struck at 0 and at every
+  breakpoint, minus their closed-form Black–Scholes value for the path's exit
+  time, so each control has mean exactly zero. The coefficients are fitted on the
+  whole sample. With a fixed exit time the waterfall is an exact combination of
+  the controls and the standard error collapses to ~0, reproducing closed-form OPM.
+
+Paths are generated in chunks of `chunk_size`, each from its own stream spawned
+from one SeedSequence, so memory stays fixed and results do not depend on how
+chunks are spread over `workers` processes. Chunks only return sufficient
+statistics (sums and cross-products), which are pooled at the end.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from opm_pricing import price_calls
+from opm_waterfall import Waterfall
+
+DEFAULT_CHUNK = 100_000
+
+ExitTiming = Union[float, Callable[[np.random.Generator, int], np.ndarray]]
+
+
+class DiscreteExitTiming:
+    """Exit time drawn from a discrete distribution (picklable, so it works with workers > 1)."""
+
+    def __init__(self, times: Sequence[float], probabilities: Sequence[float]):
+        self.times = np.asarray(times, dtype=float)
+        self.probabilities = np.asarray(probabilities, dtype=float)
+        if self.times.shape != self.probabilities.shape or np.any(self.times <= 0):
+            raise ValueError("Exit times must be positive, one probability per time")
+        if not np.isclose(self.probabilities.sum(), 1.0) or np.any(self.probabilities < 0):
+            raise ValueError("Exit time probabilities must be non-negative and sum to 1")
+
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.choice(self.times, size=n, p=self.probabilities)
+
+
+class MonteCarloResult(NamedTuple):
+    """Per-security estimates; std_error includes every variance reduction used."""
+    names: List[str]
+    value: np.ndarray
+    std_error: np.ndarray
+    plain_std_error: np.ndarray   # without the control variates, for comparison
+    price_per_share: np.ndarray
+    n_paths: int
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'value': self.value,
+            'std_error': self.std_error,
+            'plain_std_error': self.plain_std_error,
+            'price_per_share': self.price_per_share,
+        }, index=pd.Index(self.names, name='security_name'))
+
+
+# ========== Simulation ==========
+
+
+def _simulate_chunk(waterfall: Waterfall, seed: np.random.SeedSequence, n_paths: int, equity_value: float,
+                    sigma: float, exit_timing: ExitTiming, r: float, q: float, antithetic: bool):
+    """Sufficient statistics of (payoffs, controls) for one chunk of paths."""
+    rng = np.random.default_rng(seed)
+    n_draws = (n_paths + 1) // 2 if antithetic else n_paths
+    if callable(exit_timing):
+        T = np.asarray(exit_timing(rng, n_draws), dtype=float)
+    else:
+        T = np.full(n_draws, float(exit_timing))
+    Z = rng.standard_normal(n_draws)
+
+    strikes = np.concatenate([[0.0], waterfall.breakpoints])
+    closed_form = price_calls(equity_value, strikes, T=T, r=r, sigma=sigma, q=q)
+    drift = (r - q - 0.5 * sigma ** 2) * T
+    diffusion = sigma * np.sqrt(T)
+    discount = np.exp(-r * T)[:, None]
+
+    def discounted(z):
+        exit_values = equity_value * np.exp(drift + diffusion * z)
+        payoffs = waterfall.payoffs(exit_values) * discount
+        controls = np.maximum(exit_values[:, None] - strikes, 0.0) * discount - closed_form
+        return payoffs, controls
+
+    f, y = discounted(Z)
+    if antithetic:
+        f_anti, y_anti = discounted(-Z)
+        f, y = 0.5 * (f + f_anti), 0.5 * (y + y_anti)
+
+    return {
+        'n': f.shape[0],
+        'sum_f': f.sum(axis=0),
+        'sum_ff': np.einsum('ij,ij->j', f, f),
+        'sum_y': y.sum(axis=0),
+        'sum_yy': y.T @ y,
+        'sum_yf': y.T @ f,
+    }
+
+
+def _run_chunks(args_list):
+    return [_simulate_chunk(*args) for args in args_list]
+
+
+def _pool(stats_list):
+    return {key: sum(stats[key] for stats in stats_list) for key in stats_list[0]}
+
+
+def monte_carlo_opm(waterfall: Waterfall, equity_value: float, volatility: float, time_to_exit: ExitTiming,
+                    risk_free_rate: float = 0.05, dividend_yield: float = 0.0, n_paths: int = 1_000_000,
+                    chunk_size: int = DEFAULT_CHUNK, antithetic: bool = True, control_variate: bool = True,
+                    seed: Optional[int] = None, workers: int = 1) -> MonteCarloResult:
+    """
+    Monte Carlo value of every security in the waterfall.
+
+    Args:
+        waterfall: Compiled cap table
+        equity_value: Current total equity value
+        volatility: Equity volatility
+        time_to_exit: Years to exit, or a sampler (rng, n) -> exit times
+        n_paths: Total simulated paths (antithetic pairs count as two)
+        chunk_size: Paths per chunk; bounds memory at ~chunk_size × (securities + breakpoints) floats
+        antithetic: Pair every draw with its mirror image
+        control_variate: Use the closed-form breakpoint calls as controls
+        seed: Seed for reproducible results (independent of workers)
+        workers: Processes to spread chunks over; samplers must be picklable when > 1
+    """
+    if n_paths < 2 or chunk_size < 2:
+        raise ValueError("n_paths and chunk_size must be at least 2")
+    if equity_value <= 0 or volatility <= 0:
+        raise ValueError("Equity value and volatility must be positive")
+    if not callable(time_to_exit) and time_to_exit <= 0:
+        raise ValueError("Time to exit must be positive")
+
+    sizes = [chunk_size] * (n_paths // chunk_size)
+    if n_paths % chunk_size:
+        sizes.append(n_paths % chunk_size)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(waterfall, stream, size, equity_value, volatility, time_to_exit, risk_free_rate,
+              dividend_yield, antithetic) for stream, size in zip(streams, sizes)]
+
+    if workers > 1 and len(tasks) > 1:
+        groups = [tasks[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            stats_list = [stats for group in executor.map(_run_chunks, groups) for stats in group]
+    else:
+        stats_list = _run_chunks(tasks)
+    return _estimate(waterfall, _pool(stats_list), n_paths, control_variate)
+
+
+def _estimate(waterfall: Waterfall, stats, n_paths: int, control_variate: bool) -> MonteCarloResult:
+    n = stats['n']
+    mean_f = stats['sum_f'] / n
+    var_f = np.maximum((stats['sum_ff'] - n * mean_f ** 2) / (n - 1), 0.0)
+    plain_std_error = np.sqrt(var_f / n)
+    value, variance = mean_f, var_f
+
+    if control_variate:
+        mean_y = stats['sum_y'] / n
+        cov_yy = (stats['sum_yy'] - n * np.outer(mean_y, mean_y)) / (n - 1)
+        cov_yf = (stats['sum_yf'] - n * np.outer(mean_y, mean_f)) / (n - 1)
+        # Least squares tolerates collinear controls (e.g. strikes above every simulated path)
+        beta = np.linalg.lstsq(cov_yy, cov_yf, rcond=None)[0]
+        # The controls have mean exactly zero, so any sample mean is pure noise
+        value = mean_f - mean_y @ beta
+        variance = np.maximum(var_f - np.einsum('kj,kj->j', beta, cov_yf), 0.0)
+
+    std_error = np.sqrt(variance / n)
+    shares = np.where(waterfall.shares > 0, waterfall.shares, np.nan)
+    return MonteCarloResult(list(waterfall.names), value, std_error, plain_std_error, value / shares, n_paths)
@@ -0,0 +1,256 @@
+"""
+Valuation Pipeline
+Hybrid PWERM/OPM valuation as a DAG of stages, each cached by its inputs
+
+A Pipeline is a set of named stages. Each stage reads some pipeline inputs and
+the outputs of upstream stages. Its cache key is a hash of its own inputs and
+of its upstream stages' keys, so the key changes exactly when something the
+stage depends on changes. Running the pipeline recomputes only stages whose key
+is not in the cache: after changing only the DLOM inputs, the waterfall, OPM and
+PWERM stages come straight from the cache. Going back to an earlier input is
+also a cache hit.
+
+valuation_pipeline() wires the standard chain:
+
+    cap_table ─> waterfall ─┬─> opm ───┐
+                            └─> pwerm ─┴─> hybrid ─┐
+    dlom_method, time_to_liquidity ─> dlom ────────┴─> per_share
+
+The hybrid value treats the OPM as one more PWERM scenario (e.g. "stay private")
+with probability `opm_weight`; the discrete `scenarios` share the rest.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from opm_dlom import DLOM_METHODS, dlom_estimates
+from opm_pricing import slice_values
+from opm_pwerm import ScenarioStore
+from opm_waterfall import Waterfall
+
+CACHE_SIZE = 128
+
+
+class Stage(NamedTuple):
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...]    # pipeline inputs, passed as keyword arguments
+    depends: Tuple[str, ...]   # upstream stages, outputs passed as keyword arguments
+
+
+def fingerprint(value) -> str:
+    """Stable content hash of a pipeline input (numbers, strings, arrays, DataFrames, nested containers)."""
+    digest = hashlib.sha256()
+    _feed(digest, value)
+    return digest.hexdigest()[:16]
+
+
+def _feed(digest, value) -> None:
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'frame' + repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        _feed(digest, value.to_frame())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'array{value.dtype.str}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b'dict')
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'seq{len(value)}'.encode())
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(f'bool{bool(value)}'.encode())
+    elif isinstance(value, (int, float, np.number)):
+        # 3 and 3.0 are the same input
+        digest.update(f'num{float(value)!r}'.encode())
+    else:
+        digest.update(f'{type(value).__name__}{value!r}'.encode())
+
+
+def _read_only(value):
+    """Stage output as stored in the cache: arrays become read-only views."""
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.setflags(write=False)
+    return value
+
+
+def _hand_out(value):
+    """Cached output as returned by run(): DataFrames and Series are copied."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+class Pipeline:
+    """
+    DAG of cached stages.
+
+    Stages are added after the stages they depend on, so the insertion order is
+    a topological order and cycles cannot be built.
+
+    One cached output serves every later run and every downstream stage, so run()
+    never hands out something a caller can change in place by accident: arrays are
+    read-only and DataFrames are copies. Other objects (e.g. the Waterfall) are
+    shared and must be treated as immutable.
+    """
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.stages: Dict[str, Stage] = {}
+        self.inputs: Dict[str, Any] = {}
+        self.cache_size = cache_size
+        self.executed: List[str] = []    # stages computed (not cached) by the last run
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+
+    def add_stage(self, name: str, func: Callable[..., Any], inputs: Sequence[str] = (),
+                  depends: Sequence[str] = ()) -> "Pipeline":
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' already exists")
+        unknown = [stage for stage in depends if stage not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(unknown)}")
+        self.stages[name] = Stage(name, func, tuple(inputs), tuple(depends))
+        return self
+
+    def update(self, **inputs) -> "Pipeline":
+        """Set or change inputs; nothing is recomputed until the next run."""
+        self.inputs.update(inputs)
+        return self
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def run(self, *targets: str) -> Dict[str, Any]:
+        """
+        Outputs of the target stages (default: every stage). Only the stages the
+        targets need are evaluated, and only those missing from the cache run.
+        """
+        targets = targets or tuple(self.stages)
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stages: {', '.join(unknown)}")
+
+        input_prints: Dict[str, str] = {}
+        keys: Dict[str, str] = {}
+        outputs: Dict[str, Any] = {}
+        self.executed = []
+
+        def key_of(name: str) -> str:
+            if name not in keys:
+                stage = self.stages[name]
+                missing = [item for item in stage.inputs if item not in self.inputs]
+                if missing:
+                    raise ValueError(f"Stage '{name}' needs inputs: {', '.join(missing)}")
+                for item in stage.inputs:
+                    if item not in input_prints:
+                        input_prints[item] = fingerprint(self.inputs[item])
+                parts = [name] + [f'{item}={input_prints[item]}' for item in stage.inputs]
+                parts += [f'{dep}:{key_of(dep)}' for dep in stage.depends]
+                keys[name] = hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+            return keys[name]
+
+        def resolve(name: str):
+            if name in outputs:
+                return outputs[name]
+            key = key_of(name)
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                outputs[name] = self._cache[key]
+                return outputs[name]
+            stage = self.stages[name]
+            arguments = {item: self.inputs[item] for item in stage.inputs}
+            arguments.update({dep: resolve(dep) for dep in stage.depends})
+            outputs[name] = _read_only(stage.func(**arguments))
+            self.executed.append(name)
+            self._cache[key] = outputs[name]
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return outputs[name]
+
+        return {name: _hand_out(resolve(name)) for name in targets}
+
+
+# ========== Valuation Stages ==========
+
+
+def _waterfall_stage(cap_table) -> Waterfall:
+    return Waterfall(cap_table)
+
+
+def _opm_stage(waterfall: Waterfall, equity_value, volatility, time_to_exit, risk_free_rate,
+               dividend_yield) -> np.ndarray:
+    slices = slice_values(equity_value, waterfall.breakpoints, T=time_to_exit, r=risk_free_rate,
+                          sigma=volatility, q=dividend_yield)
+    return waterfall.allocate(slices)
+
+
+def _pwerm_stage(waterfall: Waterfall, scenarios) -> Optional[np.ndarray]:
+    if not scenarios:
+        return None
+    # One company, so rows come back in waterfall.names order
+    return ScenarioStore.from_records(list(scenarios)).allocate(waterfall)['value'].to_numpy()
+
+
+def _hybrid_stage(opm: np.ndarray, pwerm: Optional[np.ndarray], opm_weight) -> np.ndarray:
+    if not 0.0 <= opm_weight <= 1.0:
+        raise ValueError("opm_weight must be between 0 and 1")
+    if pwerm is None:
+        if opm_weight != 1.0:
+            raise ValueError("opm_weight below 1 needs PWERM scenarios")
+        return opm
+    return opm_weight * opm + (1.0 - opm_weight) * pwerm
+
+
+def _dlom_stage(dlom_method, dlom_volatility, time_to_liquidity, risk_free_rate) -> float:
+    if dlom_method not in DLOM_METHODS:
+        raise ValueError(f"dlom_method must be one of: {', '.join(DLOM_METHODS)}")
+    estimates = dlom_estimates(dlom_volatility, time_to_liquidity, risk_free_rate)
+    return float(getattr(estimates, dlom_method))
+
+
+def _per_share_stage(waterfall: Waterfall, hybrid: np.ndarray, dlom: float) -> pd.DataFrame:
+    shares = np.where(waterfall.shares > 0, waterfall.shares, np.nan)
+    marketable = hybrid / shares
+    return pd.DataFrame({
+        'shares_outstanding': waterfall.shares,
+        'marketable_value': hybrid,
+        'marketable_pps': marketable,
+        'dlom': dlom,
+        'non_marketable_pps': marketable * (1.0 - dlom),
+    }, index=pd.Index(waterfall.names, name='security_name'))
+
+
+def valuation_pipeline(cache_size: int = CACHE_SIZE) -> Pipeline:
+    """
+    Hybrid PWERM/OPM pipeline with a DLOM from opm_dlom.
+
+    Inputs:
+        cap_table: dict or DataFrame (see opm_breakpoints.normalize_cap_table)
+        equity_value, volatility, time_to_exit, risk_free_rate, dividend_yield: OPM parameters
+        scenarios: PWERM scenario dicts (PWERMEngine.scenarios); empty for OPM only
+        opm_weight: probability of the OPM scenario (default 1 with no scenarios)
+        dlom_method: 'chaffe' (default), 'finnerty' or 'longstaff'
+        dlom_volatility, time_to_liquidity: DLOM parameters
+
+    The per_share stage returns marketable and non-marketable value per share.
+    """
+    pipeline = Pipeline(cache_size)
+    pipeline.add_stage('waterfall', _waterfall_stage, inputs=['cap_table'])
+    pipeline.add_stage('opm', _opm_stage,
+                       inputs=['equity_value', 'volatility', 'time_to_exit', 'risk_free_rate', 'dividend_yield'],
+                       depends=['waterfall'])
+    pipeline.add_stage('pwerm', _pwerm_stage, inputs=['scenarios'], depends=['waterfall'])
+    pipeline.add_stage('hybrid', _hybrid_stage, inputs=['opm_weight'], depends=['opm', 'pwerm'])
+    pipeline.add_stage('dlom', _dlom_stage,
+                       inputs=['dlom_method', 'dlom_volatility', 'time_to_liquidity', 'risk_free_rate'])
+    pipeline.add_stage('per_share', _per_share_stage, depends=['waterfall', 'hybrid', 'dlom'])
+    return pipeline.update(dividend_yield=0.0, scenarios=[], opm_weight=1.0, dlom_method='chaffe')
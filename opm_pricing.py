@@ -0,0 +1,217 @@
+"""
+Black–Scholes Pricing Kernel for the OPM engines
+Vectorized European call/put pricing over breakpoint strikes and parameter grids
+
+Every function broadcasts its parameters (equity value, term, rate, volatility,
+dividend yield) against each other NumPy-style and prices a whole vector of strikes
+along a trailing axis, so a 20-breakpoint waterfall over a 100×100 grid is a single
+array pass. Terms that do not depend on the strike (σ√T, discount factors, drift,
+log S) are computed once per parameter set; log K once per strike.
+
+Conventions (matching OPM_Complete.md §4):
+- strikes are breakpoints in ascending order
+- slice i lies between strikes K[i-1] and K[i] (K[-1] = 0) and is worth
+  C(K[i-1]) - C(K[i]); the last slice, above the top breakpoint, is worth C(K[-1])
+- T = 0 or σ = 0 prices at intrinsic value on the forward
+- Greeks are per unit of the input: vega per 1.00 of volatility, rho per 1.00 of
+  rate, theta per year of calendar time (-dV/dT)
+
+Security values are linear in the slice values (value = allocation @ slices), so
+their Greeks are the same linear combination of the slice Greeks; allocate() does
+that without re-pricing.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy.special import ndtr
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+class BSTerms(NamedTuple):
+    """Intermediate Black–Scholes terms, shaped (*params, n_strikes)."""
+    S: np.ndarray           # equity value, (*params, 1)
+    K: np.ndarray           # strikes, (n_strikes,)
+    T: np.ndarray           # (*params, 1)
+    r: np.ndarray
+    q: np.ndarray
+    sigma: np.ndarray
+    sqrt_t: np.ndarray
+    vol_sqrt_t: np.ndarray
+    df_r: np.ndarray        # exp(-rT)
+    df_q: np.ndarray        # exp(-qT)
+    d1: np.ndarray          # (*params, n_strikes)
+    d2: np.ndarray
+    degenerate: np.ndarray  # T = 0 or σ = 0: priced at intrinsic value
+
+
+def bs_terms(equity_value, strikes, T, r, sigma, q=0.0) -> BSTerms:
+    """Compute d1/d2 and the shared terms once for every parameter set and strike."""
+    S, T, r, sigma, q = (np.asarray(a, dtype=float) for a in np.broadcast_arrays(equity_value, T, r, sigma, q))
+    S, T, r, sigma, q = S[..., None], T[..., None], r[..., None], sigma[..., None], q[..., None]
+    K = np.atleast_1d(np.asarray(strikes, dtype=float))
+    if K.ndim != 1:
+        raise ValueError("strikes must be a 1-D array of breakpoints")
+    if np.any(K < 0) or np.any(S < 0):
+        raise ValueError("equity values and strikes must be non-negative")
+
+    sqrt_t = np.sqrt(T)
+    vol_sqrt_t = sigma * sqrt_t
+    df_r = np.exp(-r * T)
+    df_q = np.exp(-q * T)
+    degenerate = vol_sqrt_t <= 0
+    safe_vst = np.where(degenerate, 1.0, vol_sqrt_t)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # log(0) = -inf gives d1 = d2 = +inf for a zero strike, i.e. C(0) = S·e^(-qT)
+        log_moneyness = np.log(S) - np.log(K)
+        d1 = (log_moneyness + (r - q + 0.5 * sigma ** 2) * T) / safe_vst
+    d1 = np.where(np.isnan(d1), -np.inf, d1)   # S = 0 and K = 0
+    d2 = d1 - vol_sqrt_t
+    return BSTerms(S, K, T, r, q, sigma, sqrt_t, vol_sqrt_t, df_r, df_q, d1, d2, degenerate)
+
+
+def _call_from_terms(t: BSTerms) -> np.ndarray:
+    forward_s = t.S * t.df_q
+    discounted_k = t.K * t.df_r
+    call = forward_s * ndtr(t.d1) - discounted_k * ndtr(t.d2)
+    if np.any(t.degenerate):
+        intrinsic = np.maximum(forward_s - discounted_k, 0.0)
+        call = np.where(t.degenerate, intrinsic, call)
+    # Rounding can leave tiny negatives deep out of the money
+    return np.maximum(call, 0.0)
+
+
+def price_calls(equity_value, strikes, T, r, sigma, q=0.0) -> np.ndarray:
+    """
+    Call values for every strike, shape (*broadcast(params), n_strikes).
+
+    Args:
+        equity_value: Total equity value (underlying), scalar or array
+        strikes: 1-D breakpoints
+        T: Time to exit in years
+        r: Risk-free rate (continuous)
+        sigma: Volatility
+        q: Dividend yield
+    """
+    return _call_from_terms(bs_terms(equity_value, strikes, T, r, sigma, q))
+
+
+def price_puts(equity_value, strikes, T, r, sigma, q=0.0) -> np.ndarray:
+    """Put values by put–call parity, same shape as price_calls."""
+    t = bs_terms(equity_value, strikes, T, r, sigma, q)
+    return np.maximum(_call_from_terms(t) - t.S * t.df_q + t.K * t.df_r, 0.0)
+
+
+def slice_values(equity_value, breakpoints, T, r, sigma, q=0.0) -> np.ndarray:
+    """
+    Value of each capital-structure slice, shape (*params, n_breakpoints + 1).
+
+    Slice i is C(K[i-1]) - C(K[i]) with C(K[-1]) = C(0) = S·e^(-qT); the last slice is
+    the call on the top breakpoint. The slices sum to S·e^(-qT).
+    """
+    return _slices_from_calls(price_calls(equity_value, _slice_strikes(breakpoints), T, r, sigma, q))
+
+
+def _slice_strikes(breakpoints) -> np.ndarray:
+    breakpoints = np.atleast_1d(np.asarray(breakpoints, dtype=float))
+    if np.any(np.diff(breakpoints) < 0):
+        raise ValueError("breakpoints must be sorted in ascending order")
+    # The zero strike is the bottom of the first slice: C(0) = S·e^(-qT)
+    return np.concatenate([[0.0], breakpoints])
+
+
+def _slices_from_calls(calls: np.ndarray) -> np.ndarray:
+    above = np.concatenate([calls[..., 1:], np.zeros(calls.shape[:-1] + (1,))], axis=-1)
+    return calls - above
+
+
+class Greeks(NamedTuple):
+    """Value and closed-form sensitivities, each shaped (*params, n)."""
+    value: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    rho: np.ndarray
+
+
+def _greeks_from_terms(t: BSTerms) -> Greeks:
+    value = _call_from_terms(t)
+    n_d1 = ndtr(t.d1)
+    n_d2 = ndtr(t.d2)
+    pdf_d1 = np.exp(-0.5 * np.square(np.where(np.isfinite(t.d1), t.d1, np.inf))) * _INV_SQRT_2PI
+    if np.any(t.degenerate):
+        # Intrinsic value: step-function N(·), no curvature or volatility exposure
+        itm = (t.S * t.df_q > t.K * t.df_r).astype(float)
+        n_d1 = np.where(t.degenerate, itm, n_d1)
+        n_d2 = np.where(t.degenerate, itm, n_d2)
+        pdf_d1 = np.where(t.degenerate, 0.0, pdf_d1)
+
+    forward_pdf = t.S * t.df_q * pdf_d1
+    safe_s_vst = np.where((t.S > 0) & ~t.degenerate, t.S * t.vol_sqrt_t, 1.0)
+    safe_sqrt_t = np.where(t.sqrt_t > 0, t.sqrt_t, 1.0)
+    discounted_k = t.K * t.df_r
+
+    delta = t.df_q * n_d1
+    gamma = t.df_q * pdf_d1 / safe_s_vst
+    vega = forward_pdf * t.sqrt_t
+    theta = (-forward_pdf * t.sigma / (2.0 * safe_sqrt_t)
+             - t.r * discounted_k * n_d2
+             + t.q * t.S * t.df_q * n_d1)
+    rho = discounted_k * t.T * n_d2
+    return Greeks(value, delta, gamma, vega, theta, rho)
+
+
+def call_greeks(equity_value, strikes, T, r, sigma, q=0.0) -> Greeks:
+    """
+    Call value, delta, gamma, vega, theta and rho for every strike, from one pass
+    over the shared terms. Arguments as in price_calls.
+    """
+    return _greeks_from_terms(bs_terms(equity_value, strikes, T, r, sigma, q))
+
+
+def slice_greeks(equity_value, breakpoints, T, r, sigma, q=0.0) -> Greeks:
+    """Greeks of each slice (shape (*params, n_breakpoints + 1)), as slice_values."""
+    calls = call_greeks(equity_value, _slice_strikes(breakpoints), T, r, sigma, q)
+    return Greeks(*(_slices_from_calls(g) for g in calls))
+
+
+def allocate(weights, greeks: Greeks) -> Greeks:
+    """
+    Aggregate slice (or breakpoint-call) Greeks to securities.
+
+    Args:
+        weights: (n_securities, n) matrix; security value = weights @ slice values
+        greeks: Greeks over the same n slices, shaped (*params, n)
+
+    Returns:
+        Greeks shaped (*params, n_securities)
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 2 or weights.shape[1] != greeks.value.shape[-1]:
+        raise ValueError(f"weights must be (n_securities, {greeks.value.shape[-1]})")
+    return Greeks(*(g @ weights.T for g in greeks))
+
+
+def black_scholes_call(S0, K, T, r, sigma, q=0):
+    """
+    European call price (drop-in for the notebook's scalar function).
+    Inputs broadcast; a scalar call returns a float.
+    """
+    price = price_calls(S0, np.ravel(K), T, r, sigma, q)
+    return _unwrap(price, K)
+
+
+def black_scholes_put(S0, K, T, r, sigma, q=0):
+    """European put price (drop-in for the notebook's scalar function)."""
+    price = price_puts(S0, np.ravel(K), T, r, sigma, q)
+    return _unwrap(price, K)
+
+
+def _unwrap(price: np.ndarray, K):
+    if np.ndim(K) == 0:
+        price = price[..., 0]
+        return float(price) if price.ndim == 0 else price
+    return price
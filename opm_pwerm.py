@@ -0,0 +1,153 @@
+"""
+PWERM Engine with Columnar Scenario Storage
+Probability-weighted exit scenarios for one company or a whole portfolio, vectorized
+
+Scenarios are stored as parallel arrays (company, exit_value, probability,
+timing, discount_rate, description). Present-value factors, weighted values and
+per-company expected values are computed in one array pass each, with
+per-company sums done by np.bincount on integer company codes.
+
+Allocation runs each scenario's exit value through its company's waterfall.
+Companies with the same cap table (same Waterfall version) are allocated in a
+single Waterfall.payoffs call, so a portfolio refresh costs one vectorized call
+per distinct cap table, not a loop over companies and scenarios.
+"""
+
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from opm_waterfall import Waterfall
+
+SCENARIO_COLUMNS = ['exit_value', 'probability', 'timing', 'discount_rate']
+DEFAULT_COMPANY = 'company'
+PROBABILITY_TOLERANCE = 1e-6
+
+
+class ScenarioStore:
+    """
+    Columnar PWERM scenarios.
+
+    Args:
+        exit_value: Equity value at exit, per scenario
+        probability: Scenario probability; must sum to 1 within each company
+        timing: Years to exit
+        discount_rate: Annual discount rate (PV factor = (1 + rate) ** -timing)
+        company: Company of each scenario (default: one company)
+        description: Optional scenario labels
+    """
+
+    def __init__(self, exit_value, probability, timing, discount_rate,
+                 company: Optional[Sequence] = None, description: Optional[Sequence[str]] = None):
+        self.exit_value, self.probability, self.timing, self.discount_rate = (
+            np.asarray(column, dtype=float).ravel()
+            for column in np.broadcast_arrays(exit_value, probability, timing, discount_rate))
+        n = self.exit_value.size
+        if n == 0:
+            raise ValueError("No scenarios")
+        if company is None:
+            company = [DEFAULT_COMPANY] * n
+        if len(company) != n or (description is not None and len(description) != n):
+            raise ValueError("company and description need one entry per scenario")
+        self.company_codes, self.companies = pd.factorize(pd.Series(company), sort=False)
+        self.description = list(description) if description is not None else [''] * n
+
+        columns = {'exit values': self.exit_value, 'probabilities': self.probability,
+                   'timings': self.timing, 'discount rates': self.discount_rate}
+        bad = [name for name, column in columns.items() if not np.isfinite(column).all()]
+        if bad:
+            raise ValueError(f"Scenario {', '.join(bad)} must be finite numbers (no NaN or infinity)")
+        if np.any(self.exit_value < 0) or np.any(self.probability < 0) or np.any(self.timing < 0):
+            raise ValueError("Exit values, probabilities and timing must be non-negative")
+        if np.any(self.discount_rate <= -1):
+            raise ValueError("Discount rates must be above -100%")
+        totals = self._per_company(self.probability)
+        off = np.abs(totals - 1.0) > PROBABILITY_TOLERANCE
+        if off.any():
+            details = ', '.join(f"{company}: {total:.4f}" for company, total in zip(self.companies[off], totals[off]))
+            raise ValueError(f"Scenario probabilities must sum to 1 per company ({details})")
+
+        self.pv_factor = (1.0 + self.discount_rate) ** (-self.timing)
+        self.present_value = self.exit_value * self.pv_factor
+        self.weighted_value = self.present_value * self.probability
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "ScenarioStore":
+        """Build from a DataFrame with the scenario columns (plus optional company, description)."""
+        missing = [column for column in SCENARIO_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Scenarios are missing columns: {', '.join(missing)}")
+        return cls(*(frame[column].to_numpy() for column in SCENARIO_COLUMNS),
+                   company=frame['company'].tolist() if 'company' in frame.columns else None,
+                   description=frame['description'].tolist() if 'description' in frame.columns else None)
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "ScenarioStore":
+        """Build from scenario dicts (the PWERMEngine.add_scenario format)."""
+        return cls.from_frame(pd.DataFrame.from_records(records))
+
+    def __len__(self) -> int:
+        return self.exit_value.size
+
+    def _per_company(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.company_codes, weights=values, minlength=len(self.companies))
+
+    def expected_values(self) -> pd.Series:
+        """Probability-weighted present value per company."""
+        return pd.Series(self._per_company(self.weighted_value), index=self.companies, name='expected_value')
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'company': self.companies[self.company_codes],
+            'description': self.description,
+            'exit_value': self.exit_value,
+            'probability': self.probability,
+            'timing': self.timing,
+            'discount_rate': self.discount_rate,
+            'pv_factor': self.pv_factor,
+            'present_value': self.present_value,
+            'weighted_value': self.weighted_value,
+        })
+
+    def allocate(self, waterfalls: Union[Waterfall, Mapping[str, Waterfall]]) -> pd.DataFrame:
+        """
+        Probability-weighted present value per company and security.
+
+        Args:
+            waterfalls: One Waterfall for every company, or a mapping company -> Waterfall
+
+        Returns:
+            Tidy DataFrame: company, security_name, value, price_per_share
+        """
+        if isinstance(waterfalls, Waterfall):
+            waterfalls = {company: waterfalls for company in self.companies}
+        missing = [company for company in self.companies if company not in waterfalls]
+        if missing:
+            raise ValueError(f"No waterfall for: {', '.join(map(str, missing))}")
+
+        # Group companies by cap-table version so each distinct waterfall is evaluated once
+        groups: Dict[str, List[int]] = {}
+        for code, company in enumerate(self.companies):
+            groups.setdefault(waterfalls[company].version, []).append(code)
+
+        frames = []
+        for codes in groups.values():
+            waterfall = waterfalls[self.companies[codes[0]]]
+            rows = np.flatnonzero(np.isin(self.company_codes, codes))
+            weighted = waterfall.payoffs(self.exit_value[rows]) * (self.pv_factor[rows] * self.probability[rows])[:, None]
+            # Sum scenarios into their company (codes are ascending): (n_companies_in_group, n_securities)
+            local = np.searchsorted(codes, self.company_codes[rows])
+            values = np.zeros((len(codes), len(waterfall.names)))
+            np.add.at(values, local, weighted)
+
+            shares = np.where(waterfall.shares > 0, waterfall.shares, np.nan)
+            frames.append(pd.DataFrame({
+                'code': np.repeat(codes, len(waterfall.names)),
+                'company': np.repeat(self.companies[codes], len(waterfall.names)),
+                'security_name': np.tile(waterfall.names, len(codes)),
+                'value': values.ravel(),
+                'price_per_share': (values / shares).ravel(),
+            }))
+        result = pd.concat(frames, ignore_index=True).sort_values('code', kind='stable')
+        return result.drop(columns='code').reset_index(drop=True)
@@ -0,0 +1,97 @@
+"""
+Sensitivity Grid Engine for the OPM
+Full waterfall allocation over a Cartesian product of parameters in one broadcast
+
+Each parameter (equity value, volatility, time to exit, risk-free rate, dividend
+yield) takes a vector of values; the grid is every combination. The breakpoints
+and participation matrix depend only on the cap table, so the whole grid is one
+slice-pricing pass followed by one matrix product. When the working arrays of
+the full grid would exceed `max_memory_mb`, the grid is evaluated in chunks of
+flattened grid points instead, which gives the same numbers with bounded memory.
+
+Output is either a cube, shaped (*grid, n_securities) with a coordinate vector per
+axis, or a tidy DataFrame with one row per grid point and security.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from opm_pricing import slice_values
+from opm_waterfall import Waterfall
+
+GRID_PARAMETERS = ('equity_value', 'volatility', 'time_to_exit', 'risk_free_rate', 'dividend_yield')
+DEFAULT_MEMORY_MB = 256
+
+# Float64 arrays of slice width alive at once while pricing a grid point
+_WORK_ARRAYS = 12
+
+
+def _coordinates(equity_value, volatility, time_to_exit, risk_free_rate, dividend_yield) -> Dict[str, np.ndarray]:
+    coords = {}
+    for name, values in zip(GRID_PARAMETERS, (equity_value, volatility, time_to_exit, risk_free_rate, dividend_yield)):
+        values = np.atleast_1d(np.asarray(values, dtype=float))
+        if values.ndim != 1 or values.size == 0:
+            raise ValueError(f"{name} must be a scalar or a non-empty 1-D sequence")
+        coords[name] = values
+    return coords
+
+
+def sensitivity_cube(waterfall: Waterfall, equity_value, volatility, time_to_exit, risk_free_rate=0.05,
+                     dividend_yield=0.0, max_memory_mb: float = DEFAULT_MEMORY_MB) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Security values over the parameter grid.
+
+    Args:
+        waterfall: Compiled cap table (opm_waterfall.Waterfall)
+        equity_value, volatility, time_to_exit, risk_free_rate, dividend_yield:
+            Scalars or 1-D sequences; the grid is their Cartesian product
+        max_memory_mb: Budget for working arrays; larger grids are chunked
+
+    Returns:
+        (values shaped (*grid_shape, n_securities), {parameter: coordinate vector})
+    """
+    coords = _coordinates(equity_value, volatility, time_to_exit, risk_free_rate, dividend_yield)
+    shape = tuple(values.size for values in coords.values())
+    n_points = int(np.prod(shape))
+    n_securities = len(waterfall.names)
+    breakpoints = waterfall.breakpoints
+
+    bytes_per_point = 8 * ((breakpoints.size + 2) * _WORK_ARRAYS + n_securities)
+    chunk = max(1, int(max_memory_mb * 2 ** 20 // bytes_per_point))
+
+    if n_points <= chunk:
+        # One broadcast over the full grid
+        E, V, T, R, Q = np.ix_(*coords.values())
+        values = waterfall.allocate(slice_values(E, breakpoints, T=T, r=R, sigma=V, q=Q))
+        return values, coords
+
+    values = np.empty((n_points, n_securities))
+    for start in range(0, n_points, chunk):
+        stop = min(start + chunk, n_points)
+        index = np.unravel_index(np.arange(start, stop), shape)
+        E, V, T, R, Q = (axis[i] for axis, i in zip(coords.values(), index))
+        values[start:stop] = waterfall.allocate(slice_values(E, breakpoints, T=T, r=R, sigma=V, q=Q))
+    return values.reshape(shape + (n_securities,)), coords
+
+
+def sensitivity_grid(waterfall: Waterfall, equity_value, volatility, time_to_exit, risk_free_rate=0.05,
+                     dividend_yield=0.0, max_memory_mb: float = DEFAULT_MEMORY_MB) -> pd.DataFrame:
+    """
+    Tidy sensitivity table: one row per grid point and security, with the parameter
+    columns, security_name, value and price_per_share (NaN for securities without
+    shares, e.g. debt). Pivot it for review tables, e.g.
+
+        grid[grid.security_name == 'Common Stock'].pivot_table(
+            index='volatility', columns='time_to_exit', values='price_per_share')
+    """
+    values, coords = sensitivity_cube(waterfall, equity_value, volatility, time_to_exit,
+                                      risk_free_rate, dividend_yield, max_memory_mb)
+    table = pd.MultiIndex.from_product(
+        [*coords.values(), waterfall.names], names=[*GRID_PARAMETERS, 'security_name']
+    ).to_frame(index=False)
+    table['value'] = values.reshape(-1)
+    shares = np.where(waterfall.shares > 0, waterfall.shares, np.nan)
+    table['price_per_share'] = (values / shares).reshape(-1)
+    return table
@@ -0,0 +1,144 @@
+"""
+Waterfall Allocation Engine for the OPM
+Compiles a cap table into a slice-by-security participation matrix, once
+
+Every security's payoff at exit is a piecewise-linear function of the exit value X,
+with kinks at the breakpoints. Between two consecutive breakpoints each security
+receives a fixed fraction of every extra dollar, so with the slices of
+opm_pricing.slice_values,
+
+    class values = participation_matrix @ slice values
+
+and allocation inside a backsolve loop or a sensitivity sweep is one matrix product.
+The matrix is built by evaluating the exact payoff function at the breakpoints,
+which come from the memoized schedule of opm_breakpoints.
+
+Payoff rules:
+- debt is repaid first, then liquidation preferences by seniority (higher rank
+  first, pari passu within a rank, pro rata to the preference amount)
+- once every preference is covered, the residual is shared at a common price per
+  share p: common m·p, options/warrants m·(p - strike)⁺, participating preferred
+  L + m·p up to its cap, non-participating preferred max(L, m·p); preferred converts
+  whenever m·p beats its preferred payoff (m = shares × conversion_ratio)
+
+Cap table columns (dict of lists or DataFrame):
+    security_name, shares_outstanding          required
+    liquidation_preference                     total $ preference (default 0)
+    seniority                                  rank, higher paid first (default 1)
+    participating                              default: participation_cap > 0
+    participation_cap                          total $ incl. preference; 0 = none
+    conversion_ratio                           default 1
+    strike_price                               options/warrants (default 0)
+    debt_amount                                senior debt (default 0)
+"""
+
+from typing import List
+
+import numpy as np
+
+from opm_breakpoints import build_schedule
+
+
+class Waterfall:
+    """
+    Exit-value waterfall for one cap table, compiled once.
+
+    Attributes:
+        names: Security names, in cap-table order
+        shares: Shares outstanding per security (for price per share)
+        version: Cap-table version the breakpoint schedule is cached under
+        breakpoints: Sorted exit values where any payoff changes slope
+        breakpoint_schedule: The breakpoints with descriptions, for reporting
+        matrix: Participation matrix at `breakpoints`, (n_securities, n_breakpoints + 1)
+    """
+
+    def __init__(self, cap_table):
+        # Breakpoints and the preference stack come from the memoized schedule
+        self.schedule = build_schedule(cap_table)
+        table = self.schedule.table
+        self.table = table
+        self.version = self.schedule.version
+        self.names: List[str] = table['security_name'].tolist()
+        self.shares = table['shares_outstanding'].to_numpy()
+        self.as_converted = self.shares * table['conversion_ratio'].to_numpy()
+        self.preference = table['liquidation_preference'].to_numpy()
+        self.participating = table['participating'].to_numpy()
+        cap = table['participation_cap'].to_numpy()
+        self.cap = np.where(self.participating & (cap > 0), cap, np.inf)
+        self.strike = table['strike_price'].to_numpy()
+        self.debt = table['debt_amount'].to_numpy()
+        self.is_preferred = self.preference > 0
+        self.preference_total = self.schedule.preference_total
+
+        self.breakpoint_schedule = self.schedule.schedule
+        self.breakpoints = self.schedule.breakpoints
+        self.matrix = self.participation_matrix(self.breakpoints)
+
+    # ========== Payoffs ==========
+
+    def _equity_payoffs(self, pps: np.ndarray) -> np.ndarray:
+        """Payoffs once all preferences are covered, at common price per share pps."""
+        p = np.asarray(pps, dtype=float)[..., None]
+        as_common = self.as_converted * np.maximum(p - self.strike, 0.0)
+        preferred = np.minimum(self.preference + np.where(self.participating, as_common, 0.0), self.cap)
+        preferred = np.maximum(preferred, as_common)
+        return np.where(self.is_preferred, preferred, as_common) + self.debt
+
+    def _pps_at(self, exit_values: np.ndarray) -> np.ndarray:
+        """Invert the piecewise-linear exit value X(p) for X >= preference_total."""
+        schedule = self.schedule
+        idx = np.clip(np.searchsorted(schedule.knots_exit, exit_values, side='right') - 1, 0, None)
+        slope = schedule.slopes[idx]
+        offset = np.divide(exit_values - schedule.knots_exit[idx], slope,
+                           out=np.zeros_like(exit_values), where=slope > 0)
+        return schedule.knots_pps[idx] + offset
+
+    def payoffs(self, exit_values) -> np.ndarray:
+        """Each security's payoff at each exit value, shape (*exit_values.shape, n_securities)."""
+        x = np.asarray(exit_values, dtype=float)
+        if np.any(x < 0):
+            raise ValueError("Exit values must be non-negative")
+        schedule = self.schedule
+        stacked = np.clip(x[..., None] - schedule.tier_starts, 0.0, schedule.tier_sizes) @ schedule.tier_shares
+        residual = self._equity_payoffs(self._pps_at(np.maximum(x, self.preference_total)))
+        return np.where((x < self.preference_total)[..., None], stacked, residual)
+
+    # ========== Allocation ==========
+
+    def participation_matrix(self, breakpoints=None) -> np.ndarray:
+        """
+        Fraction of each slice going to each security, (n_securities, n_breakpoints + 1).
+        Exact when the breakpoints include every kink (the default); with a coarser set
+        each fraction is the average over its slice.
+        """
+        if breakpoints is None:
+            return self.matrix
+        b = np.atleast_1d(np.asarray(breakpoints, dtype=float))
+        if np.any(np.diff(b) < 0):
+            raise ValueError("breakpoints must be sorted in ascending order")
+        edges = np.concatenate([[0.0], b])
+        pay = self.payoffs(edges)
+        widths = np.diff(edges)
+        fractions = np.divide(np.diff(pay, axis=0), widths[:, None],
+                              out=np.zeros((widths.size, len(self.names))), where=widths[:, None] > 0)
+        # Slope above the top breakpoint
+        step = max(edges[-1], 1.0)
+        top = (self.payoffs(edges[-1] + step) - pay[-1]) / step
+        return np.vstack([fractions, top]).T
+
+    def allocate(self, slice_values) -> np.ndarray:
+        """Security values from slice values at `breakpoints`, shape (*params, n_securities)."""
+        return np.asarray(slice_values) @ self.matrix.T
+
+    def class_weights(self, security_name: str) -> np.ndarray:
+        """The security's share of each slice (a row of the participation matrix)."""
+        return self.matrix[self._index(security_name)]
+
+    def shares_of(self, security_name: str) -> float:
+        return float(self.shares[self._index(security_name)])
+
+    def _index(self, security_name: str) -> int:
+        try:
+            return self.names.index(security_name)
+        except ValueError:
+            raise ValueError(f"Unknown security: {security_name}") from None
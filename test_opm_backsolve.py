@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from opm_backsolve import CONVERGED, UNREACHABLE, backsolve_equity_value
+from opm_pricing import slice_values
+
+
+def class_pps(equity_value, breakpoints, weights, shares, T, r, sigma):
+    return slice_values(equity_value, breakpoints, T, r, sigma) @ np.asarray(weights) / shares
+
+
+def test_recovers_the_equity_value_behind_a_price():
+    breakpoints, weights = [10e6, 30e6, 60e6], [0.0, 0.4, 0.25, 0.2]
+    pps = class_pps(80e6, breakpoints, weights, 2e6, 3.0, 0.05, 0.6)
+    result = backsolve_equity_value(pps, breakpoints, weights, 2e6, 3.0, 0.05, 0.6)
+    assert result.status[()] == CONVERGED
+    assert float(result.equity_value) == pytest.approx(80e6, rel=1e-8)
+    assert result.iterations[()] <= 10
+
+
+def test_bulk_rounds_with_their_own_breakpoints():
+    rng = np.random.default_rng(7)
+    n = 500
+    breakpoints = np.sort(rng.uniform(1e6, 150e6, (n, 4)), axis=1)
+    weights = np.array([0.0, 0.0, 0.3, 0.3, 0.15])
+    sigma = rng.uniform(0.3, 0.9, n)
+    true_equity = rng.uniform(5e6, 400e6, n)
+    pps = np.array([class_pps(true_equity[i], breakpoints[i], weights, 1e6, 4.0, 0.04, sigma[i])
+                    for i in range(n)])
+    result = backsolve_equity_value(pps, breakpoints, weights, 1e6, 4.0, 0.04, sigma)
+    assert result.equity_value.shape == (n,)
+    assert np.all(result.converged)
+    np.testing.assert_allclose(result.equity_value, true_equity, rtol=1e-6)
+    assert result.iterations.max() <= 15
+
+
+def test_capped_class_reports_unreachable_target():
+    # The class only owns the 10M-20M slice, worth at most 10M·e^(-rT)
+    result = backsolve_equity_value([50.0, 100.0], [10e6, 20e6], [0.0, 1.0, 0.0], 1e5, 3.0, 0.05, 0.4)
+    assert result.status.tolist() == [CONVERGED, UNREACHABLE]
+    assert np.isnan(result.equity_value[1])
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        backsolve_equity_value(2.0, [50e6, 10e6], [0.0, 0.1, 0.1], 1e6, 4.0, 0.05, 0.5)
+    with pytest.raises(ValueError):
+        backsolve_equity_value(2.0, [10e6], [0.0, 0.1, 0.1], 1e6, 4.0, 0.05, 0.5)
+    with pytest.raises(ValueError):
+        backsolve_equity_value(2.0, [10e6], [0.0, -0.1], 1e6, 4.0, 0.05, 0.5)
+    with pytest.raises(ValueError):
+        backsolve_equity_value(2.0, [10e6], [0.0, 0.1], 1e6, 4.0, 0.05, 0.0)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from opm_breakpoints import build_schedule, cap_table_version, normalize_cap_table, with_option_tiers
+from opm_waterfall import Waterfall
+
+MULTI_SERIES = {
+    'security_name': ['Venture Debt', 'Seed', 'Series A', 'Series B', 'Series C', 'Common Stock'],
+    'shares_outstanding': [0, 3_000_000, 4_000_000, 3_000_000, 2_000_000, 10_000_000],
+    'debt_amount': [5_000_000, 0, 0, 0, 0, 0],
+    'liquidation_preference': [0, 1_500_000, 8_000_000, 15_000_000, 30_000_000, 0],
+    'seniority': [0, 1, 1, 2, 3, 0],
+    'participation_cap': [0, 0, 0, 45_000_000, 0, 0],
+    'conversion_ratio': [1, 1, 1.1, 1, 1, 1],
+}
+OPTION_TIERS = {
+    'Options 2019': {'shares': 1_500_000, 'conversion_ratio': 1.0, 'is_option': True, 'strike_price': 0.40},
+    'Options 2021': {'shares': 1_000_000, 'conversion_ratio': 1.0, 'is_option': True, 'strike_price': 2.10},
+    'Warrants': {'shares': 250_000, 'conversion_ratio': 1.0, 'is_option': True, 'strike_price': 6.00},
+    'Common Stock': {'shares': 10_000_000, 'conversion_ratio': 1.0, 'is_option': False},
+}
+
+
+def test_full_schedule_from_a_multi_series_cap_table():
+    table = with_option_tiers(MULTI_SERIES, OPTION_TIERS)
+    assert len(table) == 9
+    schedule = build_schedule(table).schedule
+    counts = pd.Series([bp['type'] for bp in schedule]).value_counts().to_dict()
+    # Debt, three seniority tiers, three exercise points, cap, and four conversions
+    assert counts == {'debt': 1, 'liquidation_preference': 3, 'option_exercise': 3,
+                      'participation_cap': 1, 'conversion': 4}
+    values = [bp['value'] for bp in schedule]
+    assert values == sorted(values)
+    assert values[:4] == [5e6, 35e6, 50e6, 59.5e6]
+
+
+def test_sweep_matches_exit_value_at_each_event():
+    waterfall = Waterfall(with_option_tiers(MULTI_SERIES, OPTION_TIERS))
+    for bp in waterfall.breakpoint_schedule:
+        if 'common_pps' in bp:
+            # Total payoff when common is worth exactly the event's price per share
+            exit_value = waterfall._equity_payoffs(np.array(bp['common_pps'])).sum()
+            assert bp['value'] == pytest.approx(exit_value, rel=1e-12)
+
+
+def test_schedule_is_memoized_per_cap_table_version():
+    first = build_schedule(MULTI_SERIES)
+    assert build_schedule(pd.DataFrame(MULTI_SERIES)) is first
+    assert Waterfall(MULTI_SERIES).schedule is first
+
+    changed = dict(MULTI_SERIES, liquidation_preference=[0, 1_500_000, 8_000_000, 15_000_000, 31_000_000, 0])
+    assert build_schedule(changed) is not first
+    assert cap_table_version(normalize_cap_table(changed)) != first.version
+
+
+def test_large_option_ladders_are_fast():
+    n = 2000
+    rng = np.random.default_rng(11)
+    table = dict(MULTI_SERIES)
+    tiers = {f'Grant {i}': {'shares': 10_000, 'is_option': True, 'strike_price': s}
+             for i, s in enumerate(rng.uniform(0.1, 20.0, n))}
+    schedule = build_schedule(with_option_tiers(table, tiers))
+    assert sum(bp['type'] == 'option_exercise' for bp in schedule.schedule) == n
+    assert np.all(np.diff(schedule.knots_exit) > 0)
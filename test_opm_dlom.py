@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from opm_dlom import chaffe_dlom, dlom_estimates, dlom_table, finnerty_dlom, longstaff_dlom
+from opm_pricing import black_scholes_put
+
+
+def finnerty_reference(sigma, T, q=0.0):
+    x = sigma ** 2 * T
+    v2t = x + np.log(2 * (np.exp(x) - x - 1)) - 2 * np.log(np.exp(x) - 1)
+    return np.exp(-q * T) * (2 * norm.cdf(np.sqrt(v2t) / 2) - 1)
+
+
+def test_models_match_closed_forms():
+    assert chaffe_dlom(0.4, 2.0, 0.05) == pytest.approx(black_scholes_put(1, 1, 2.0, 0.05, 0.4))
+    for sigma, T in [(0.3, 1.0), (0.6, 2.0), (1.2, 4.0)]:
+        assert finnerty_dlom(sigma, T) == pytest.approx(finnerty_reference(sigma, T), rel=1e-12)
+    assert finnerty_dlom(0.6, 2.0, 0.03) == pytest.approx(finnerty_reference(0.6, 2.0, 0.03), rel=1e-12)
+    s = 0.3
+    expected = (2 + s ** 2 / 2) * norm.cdf(s / 2) + s / np.sqrt(2 * np.pi) * np.exp(-s ** 2 / 8) - 1
+    assert longstaff_dlom(s, 1.0) == pytest.approx(expected)
+
+
+def test_finnerty_limits_are_stable():
+    # Small σ²T: v²T → σ²T / 3 without cancellation noise
+    tiny = finnerty_dlom(1e-5, 1.0)
+    assert tiny == pytest.approx(2 * norm.cdf(np.sqrt(1e-10 / 3) / 2) - 1, rel=1e-6)
+    # Large σ²T: bounded by 2 N(√ln2 / 2) - 1 = 32.28%, no overflow
+    assert finnerty_dlom(50.0, 100.0) == pytest.approx(2 * norm.cdf(np.sqrt(np.log(2)) / 2) - 1)
+    assert np.all(np.diff(finnerty_dlom(np.linspace(0.05, 3, 200), 2.0)) > 0)
+    assert float(finnerty_dlom(0.0, 1.0)) == 0.0 and float(longstaff_dlom(0.4, 0.0)) == 0.0
+
+
+def test_broadcast_and_portfolio_table():
+    sigma = np.array([0.3, 0.5, 0.8])[:, None]
+    T = np.array([0.5, 1.0, 2.0, 4.0])
+    estimates = dlom_estimates(sigma, T)
+    assert all(values.shape == (3, 4) for values in estimates)
+    # The lookback bound dominates the other two
+    assert np.all(estimates.longstaff > estimates.chaffe) and np.all(estimates.longstaff > estimates.finnerty)
+
+    table = dlom_table([0.3, 0.5, 0.8], T, company=['A', 'B', 'C'])
+    assert len(table) == 12
+    row = table[(table.company == 'B') & (table.time_to_liquidity == 2.0)].iloc[0]
+    assert row['finnerty'] == pytest.approx(estimates.finnerty[1, 2])
+    assert row['chaffe'] == pytest.approx(estimates.chaffe[1, 2])
+
+
+def test_invalid_inputs():
+    with pytest.raises(ValueError):
+        finnerty_dlom(-0.2, 1.0)
+    with pytest.raises(ValueError):
+        dlom_table([0.3, 0.4], 1.0, company=['A'])
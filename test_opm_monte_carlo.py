@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from opm_monte_carlo import DiscreteExitTiming, monte_carlo_opm
+from opm_pricing import slice_values
+from opm_waterfall import Waterfall
+from test_opm_waterfall import SAMPLE
+
+
+@pytest.fixture(scope='module')
+def waterfall():
+    return Waterfall(SAMPLE)
+
+
+def closed_form(waterfall, T):
+    return waterfall.allocate(slice_values(100e6, waterfall.breakpoints, T=T, r=0.05, sigma=0.45))
+
+
+def test_fixed_exit_reproduces_closed_form(waterfall):
+    result = monte_carlo_opm(waterfall, 100e6, 0.45, 3.0, n_paths=50_000, chunk_size=20_000, seed=1)
+    np.testing.assert_allclose(result.value, closed_form(waterfall, 3.0), rtol=1e-6)
+    # Without the control variate the estimate is noisy but unbiased
+    plain = monte_carlo_opm(waterfall, 100e6, 0.45, 3.0, n_paths=200_000, seed=1, control_variate=False)
+    assert np.all(np.abs(plain.value - closed_form(waterfall, 3.0)) < 4 * plain.std_error)
+
+
+def test_stochastic_exit_timing(waterfall):
+    timing = DiscreteExitTiming([2.0, 3.0, 5.0], [0.3, 0.5, 0.2])
+    result = monte_carlo_opm(waterfall, 100e6, 0.45, timing, n_paths=200_000, seed=7)
+    expected = sum(p * closed_form(waterfall, T) for T, p in [(2.0, 0.3), (3.0, 0.5), (5.0, 0.2)])
+    assert np.all(np.abs(result.value - expected) < 4 * result.std_error)
+    assert np.all(result.std_error < result.plain_std_error / 4)
+    frame = result.to_frame()
+    assert list(frame.index) == waterfall.names
+
+
+def test_results_do_not_depend_on_worker_count(waterfall):
+    timing = DiscreteExitTiming([2.0, 4.0], [0.5, 0.5])
+    kwargs = dict(n_paths=40_000, chunk_size=10_000, seed=3)
+    single = monte_carlo_opm(waterfall, 100e6, 0.45, timing, **kwargs)
+    pooled = monte_carlo_opm(waterfall, 100e6, 0.45, timing, workers=2, **kwargs)
+    np.testing.assert_allclose(pooled.value, single.value)
+
+
+def test_invalid_inputs(waterfall):
+    with pytest.raises(ValueError):
+        monte_carlo_opm(waterfall, 100e6, 0.45, 0.0)
+    with pytest.raises(ValueError):
+        DiscreteExitTiming([2.0, 3.0], [0.5, 0.6])
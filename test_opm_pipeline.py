@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from opm_pipeline import Pipeline, valuation_pipeline
+from opm_pricing import black_scholes_put, slice_values
+from opm_pwerm import ScenarioStore
+from opm_waterfall import Waterfall
+from test_opm_waterfall import SAMPLE
+
+SCENARIOS = [
+    {'exit_value': 500_000_000, 'probability': 0.4, 'timing': 3, 'discount_rate': 0.12, 'description': "IPO Exit"},
+    {'exit_value': 150_000_000, 'probability': 0.6, 'timing': 2, 'discount_rate': 0.12, 'description': "Strategic Sale"},
+]
+
+
+def make_pipeline():
+    return valuation_pipeline().update(
+        cap_table=SAMPLE, equity_value=100e6, volatility=0.45, time_to_exit=3.0, risk_free_rate=0.05,
+        scenarios=SCENARIOS, opm_weight=0.6, dlom_volatility=0.5, time_to_liquidity=2.0)
+
+
+def test_hybrid_value_and_dlom():
+    per_share = make_pipeline().run('per_share')['per_share']
+    waterfall = Waterfall(SAMPLE)
+    opm = waterfall.allocate(slice_values(100e6, waterfall.breakpoints, T=3.0, r=0.05, sigma=0.45))
+    pwerm = ScenarioStore.from_records(SCENARIOS).allocate(waterfall)['value'].to_numpy()
+    np.testing.assert_allclose(per_share['marketable_value'], 0.6 * opm + 0.4 * pwerm)
+    assert per_share['dlom'].iloc[0] == pytest.approx(black_scholes_put(1, 1, 2.0, 0.05, 0.5))
+    np.testing.assert_allclose(per_share['non_marketable_pps'],
+                               per_share['marketable_pps'] * (1 - per_share['dlom']))
+
+
+def test_changing_dlom_inputs_reuses_opm():
+    pipeline = make_pipeline()
+    pipeline.run()
+    assert set(pipeline.executed) == set(pipeline.stages)
+
+    pipeline.update(time_to_liquidity=1.0)
+    pipeline.run()
+    assert pipeline.executed == ['dlom', 'per_share']
+
+    pipeline.update(opm_weight=0.5)
+    pipeline.run()
+    assert pipeline.executed == ['hybrid', 'per_share']
+
+    # Same content in a new object, and a return to an earlier value, are cache hits
+    pipeline.update(cap_table=dict(SAMPLE), time_to_liquidity=2.0, opm_weight=0.6)
+    pipeline.run()
+    assert pipeline.executed == []
+
+
+def test_only_needed_stages_run():
+    pipeline = make_pipeline()
+    pipeline.run('opm')
+    assert pipeline.executed == ['waterfall', 'opm']
+    pipeline.run('dlom')
+    assert pipeline.executed == ['dlom']
+
+
+def test_outputs_cannot_corrupt_the_cache():
+    pipeline = make_pipeline()
+    first = pipeline.run('opm', 'per_share')
+    expected = first['opm'].copy()
+    with pytest.raises(ValueError):
+        first['opm'][:] = 0
+    first['per_share']['marketable_pps'] = 0.0
+
+    again = pipeline.run('opm', 'per_share')
+    assert pipeline.executed == []
+    np.testing.assert_array_equal(again['opm'], expected)
+    assert (again['per_share']['marketable_pps'] > 0).all()
+
+
+def test_invalid_pipelines():
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        pipeline.add_stage('b', lambda a: a, depends=['a'])
+    pipeline.add_stage('a', lambda x: x, inputs=['x'])
+    with pytest.raises(ValueError):
+        pipeline.run('a')
+    with pytest.raises(ValueError):
+        make_pipeline().update(scenarios=[]).run('hybrid')
+
+
+def test_dlom_method_switch():
+    pipeline = make_pipeline()
+    chaffe = pipeline.run('per_share')['per_share']['dlom'].iloc[0]
+    pipeline.update(dlom_method='finnerty')
+    finnerty = pipeline.run('per_share')['per_share']['dlom'].iloc[0]
+    assert pipeline.executed == ['dlom', 'per_share']
+    assert finnerty < chaffe
+    with pytest.raises(ValueError):
+        pipeline.update(dlom_method='asian').run('dlom')
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from opm_pricing import (allocate, black_scholes_call, black_scholes_put, call_greeks,
+                         price_calls, price_puts, slice_greeks, slice_values)
+
+
+def reference_call(S0, K, T, r, sigma, q=0):
+    d1 = (np.log(S0 / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    return S0 * np.exp(-q * T) * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+
+
+def test_scalar_matches_reference_formula():
+    assert black_scholes_call(100, 100, 1, 0.05, 0.2) == pytest.approx(10.4506, abs=1e-4)
+    assert black_scholes_put(100, 100, 1, 0.05, 0.2) == pytest.approx(5.5735, abs=1e-4)
+    assert black_scholes_call(100e6, 50e6, 3, 0.05, 0.45, q=0.01) == pytest.approx(
+        reference_call(100e6, 50e6, 3, 0.05, 0.45, q=0.01), rel=1e-10)
+
+
+def test_grid_broadcasts_against_strikes():
+    strikes = np.linspace(5e6, 100e6, 20)
+    equity = np.linspace(10e6, 200e6, 100)[:, None]
+    vol = np.linspace(0.2, 0.9, 100)[None, :]
+    calls = price_calls(equity, strikes, T=3.0, r=0.04, sigma=vol)
+    assert calls.shape == (100, 100, 20)
+    i, j, k = 37, 81, 12
+    assert calls[i, j, k] == pytest.approx(
+        reference_call(equity[i, 0], strikes[k], 3.0, 0.04, vol[0, j]), rel=1e-9)
+    # Call values fall as the strike rises
+    assert np.all(np.diff(calls, axis=-1) <= 0)
+
+
+def test_put_call_parity():
+    strikes = np.array([10.0, 50.0, 100.0, 200.0])
+    calls = price_calls(100.0, strikes, 2.0, 0.03, 0.3, q=0.02)
+    puts = price_puts(100.0, strikes, 2.0, 0.03, 0.3, q=0.02)
+    parity = 100.0 * np.exp(-0.02 * 2) - strikes * np.exp(-0.03 * 2)
+    np.testing.assert_allclose(calls - puts, parity, atol=1e-9)
+
+
+def test_edge_cases():
+    # Zero strike: the call is the whole (dividend-adjusted) equity
+    assert black_scholes_call(100, 0, 1, 0.05, 0.2, q=0.01) == pytest.approx(100 * np.exp(-0.01))
+    # Zero term or zero volatility: intrinsic value, no NaNs
+    assert black_scholes_call(100, 80, 0, 0.05, 0.2) == pytest.approx(20.0)
+    assert black_scholes_call(80, 100, 0, 0.05, 0.2) == 0.0
+    assert black_scholes_call(100, 80, 1, 0.05, 0.0) == pytest.approx(100 - 80 * np.exp(-0.05))
+    with pytest.raises(ValueError):
+        price_calls(100, [-1.0], 1, 0.05, 0.2)
+
+
+def test_slice_values_partition_equity():
+    breakpoints = [0.0, 10e6, 30e6, 40e6]
+    slices = slice_values([50e6, 120e6], breakpoints, T=3.0, r=0.05, sigma=0.45)
+    assert slices.shape == (2, 5)
+    assert slices[:, 0] == pytest.approx([0.0, 0.0])
+    np.testing.assert_allclose(slices.sum(axis=-1), [50e6, 120e6])
+    assert np.all(slices >= 0)
+    with pytest.raises(ValueError):
+        slice_values(50e6, [30e6, 10e6], T=3.0, r=0.05, sigma=0.45)
+
+
+def test_greeks_match_finite_differences():
+    S, K, T, r, sigma, q = 80e6, np.array([10e6, 50e6, 120e6]), 2.5, 0.04, 0.5, 0.01
+    g = call_greeks(S, K, T, r, sigma, q)
+    h = 1e-4
+
+    def bumped(**kw):
+        args = dict(equity_value=S, strikes=K, T=T, r=r, sigma=sigma, q=q)
+        args.update(kw)
+        return price_calls(**args)
+
+    np.testing.assert_allclose(g.value, price_calls(S, K, T, r, sigma, q))
+    np.testing.assert_allclose(g.delta, (bumped(equity_value=S * (1 + h)) - bumped(equity_value=S * (1 - h))) / (2 * S * h), rtol=1e-5)
+    np.testing.assert_allclose(g.gamma, (bumped(equity_value=S * (1 + h)) - 2 * g.value + bumped(equity_value=S * (1 - h))) / (S * h) ** 2, rtol=1e-3)
+    np.testing.assert_allclose(g.vega, (bumped(sigma=sigma + h) - bumped(sigma=sigma - h)) / (2 * h), rtol=1e-5)
+    np.testing.assert_allclose(g.theta, -(bumped(T=T + h) - bumped(T=T - h)) / (2 * h), rtol=1e-5)
+    np.testing.assert_allclose(g.rho, (bumped(r=r + h) - bumped(r=r - h)) / (2 * h), rtol=1e-5)
+
+
+def test_slice_greeks_aggregate_to_securities():
+    breakpoints = [10e6, 30e6]
+    weights = np.array([[1.0, 0.0, 0.0],     # senior preference: first slice
+                        [0.0, 1.0, 0.5],     # junior preference plus half the residual
+                        [0.0, 0.0, 0.5]])    # common: half the residual
+    g = slice_greeks([40e6, 90e6], breakpoints, T=3.0, r=0.05, sigma=0.45)
+    np.testing.assert_allclose(g.value, slice_values([40e6, 90e6], breakpoints, T=3.0, r=0.05, sigma=0.45))
+    by_security = allocate(weights, g)
+    assert by_security.delta.shape == (2, 3)
+    # The securities own the whole company: deltas sum to e^(-qT) = 1, other Greeks cancel
+    np.testing.assert_allclose(by_security.delta.sum(axis=-1), 1.0)
+    np.testing.assert_allclose(by_security.vega.sum(axis=-1), 0.0, atol=1e-6)
+    np.testing.assert_allclose(by_security.value, g.value @ weights.T)
+    with pytest.raises(ValueError):
+        allocate(weights[:, :2], g)
+
+
+def test_degenerate_greeks_are_finite():
+    g = call_greeks([0.0, 100.0], [0.0, 80.0, 120.0], T=0.0, r=0.05, sigma=0.3)
+    for values in g:
+        assert np.all(np.isfinite(values))
+    assert g.delta[1].tolist() == [1.0, 1.0, 0.0]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from opm_pwerm import ScenarioStore
+from opm_waterfall import Waterfall
+from test_opm_waterfall import SAMPLE
+
+SCENARIOS = [
+    {'exit_value': 500_000_000, 'probability': 0.3, 'timing': 3, 'discount_rate': 0.12, 'description': "IPO Exit"},
+    {'exit_value': 300_000_000, 'probability': 0.5, 'timing': 4, 'discount_rate': 0.12, 'description': "Strategic Sale"},
+    {'exit_value': 100_000_000, 'probability': 0.2, 'timing': 5, 'discount_rate': 0.12, 'description': "Distressed Sale"},
+]
+
+
+def test_expected_value_matches_scenario_loop():
+    store = ScenarioStore.from_records(SCENARIOS)
+    expected = sum(s['exit_value'] * (1 + s['discount_rate']) ** -s['timing'] * s['probability'] for s in SCENARIOS)
+    assert store.expected_values().iloc[0] == pytest.approx(expected)
+    frame = store.to_frame()
+    assert list(frame['description']) == ["IPO Exit", "Strategic Sale", "Distressed Sale"]
+
+
+def test_probabilities_must_sum_to_one_per_company():
+    with pytest.raises(ValueError, match="Beta"):
+        ScenarioStore([1e8, 2e8, 1e8, 2e8], [0.5, 0.5, 0.5, 0.6], 3, 0.1, company=['Alpha', 'Alpha', 'Beta', 'Beta'])
+
+
+def test_non_finite_inputs_rejected():
+    with pytest.raises(ValueError, match="probabilities"):
+        ScenarioStore([1e8, 2e8], [np.nan, 1.0], 3, 0.1)
+    with pytest.raises(ValueError, match="exit values"):
+        ScenarioStore([np.inf, 2e8], [0.5, 0.5], 3, 0.1)
+    with pytest.raises(ValueError, match="timings, discount rates"):
+        ScenarioStore([1e8, 2e8], [0.5, 0.5], [3, np.nan], [0.1, -np.inf])
+    with pytest.raises(ValueError, match="exit values"):
+        ScenarioStore.from_records([dict(SCENARIOS[0], exit_value=None), *SCENARIOS[1:]])
+
+
+def test_allocation_through_the_waterfall():
+    waterfall = Waterfall(SAMPLE)
+    store = ScenarioStore.from_records(SCENARIOS)
+    allocated = store.allocate(waterfall)
+    assert list(allocated['security_name']) == waterfall.names
+    assert allocated['value'].sum() == pytest.approx(store.expected_values().iloc[0])
+    # Each security gets its probability-weighted, discounted waterfall payoff
+    payoffs = waterfall.payoffs(store.exit_value)
+    np.testing.assert_allclose(allocated['value'], (store.weighted_value / store.exit_value) @ payoffs)
+
+
+def test_portfolio_batch_keeps_company_order():
+    rng = np.random.default_rng(5)
+    companies = [f'Co {i}' for i in range(40)]
+    shared = Waterfall(SAMPLE)
+    other = Waterfall(dict(SAMPLE, liquidation_preference=[0, 15_000_000, 20_000_000, 0]))
+    waterfalls = {company: (shared if i % 3 else other) for i, company in enumerate(companies)}
+    frame = pd.DataFrame({
+        'company': np.repeat(companies, 3),
+        'exit_value': rng.uniform(5e7, 8e8, 120),
+        'probability': rng.dirichlet(np.ones(3), 40).ravel(),
+        'timing': rng.uniform(1, 6, 120),
+        'discount_rate': 0.14,
+    })
+    store = ScenarioStore.from_frame(frame)
+    allocated = store.allocate(waterfalls)
+    totals = allocated.groupby('company', sort=False)['value'].sum()
+    assert list(totals.index) == companies
+    np.testing.assert_allclose(totals.to_numpy(), store.expected_values().to_numpy())
+    with pytest.raises(ValueError):
+        store.allocate({'Co 0': shared})
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from opm_pricing import slice_values
+from opm_sensitivity import sensitivity_cube, sensitivity_grid
+from opm_waterfall import Waterfall
+from test_opm_waterfall import SAMPLE
+
+
+@pytest.fixture(scope='module')
+def waterfall():
+    return Waterfall(SAMPLE)
+
+
+def test_cube_matches_single_valuations(waterfall):
+    cube, coords = sensitivity_cube(waterfall, [50e6, 100e6], [0.3, 0.45, 0.6], [1.0, 3.0], risk_free_rate=0.04)
+    assert cube.shape == (2, 3, 2, 1, 1, 4)
+    assert list(coords) == ['equity_value', 'volatility', 'time_to_exit', 'risk_free_rate', 'dividend_yield']
+    single = waterfall.allocate(slice_values(100e6, waterfall.breakpoints, T=3.0, r=0.04, sigma=0.45))
+    np.testing.assert_allclose(cube[1, 1, 1, 0, 0], single)
+
+
+def test_chunked_grid_equals_broadcast_grid(waterfall):
+    args = (waterfall, np.linspace(20e6, 300e6, 30), np.linspace(0.2, 0.9, 20), np.linspace(0.5, 5, 7))
+    full, _ = sensitivity_cube(*args)
+    chunked, _ = sensitivity_cube(*args, max_memory_mb=0.05)
+    np.testing.assert_allclose(chunked, full)
+
+
+def test_tidy_grid_pivots_to_a_review_table(waterfall):
+    grid = sensitivity_grid(waterfall, 100e6, np.linspace(0.3, 0.7, 5), [1.0, 2.0, 3.0, 4.0])
+    assert len(grid) == 5 * 4 * 4
+    table = grid[grid.security_name == 'Common Stock'].pivot_table(
+        index='volatility', columns='time_to_exit', values='price_per_share')
+    assert table.shape == (5, 4)
+    assert np.all(np.isfinite(table.to_numpy()))
+
+
+def test_invalid_parameters(waterfall):
+    with pytest.raises(ValueError):
+        sensitivity_cube(waterfall, [], 0.4, 3.0)
+    with pytest.raises(ValueError):
+        sensitivity_cube(waterfall, [[1e6]], 0.4, 3.0)
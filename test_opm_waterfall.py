@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from opm_pricing import slice_values
+from opm_waterfall import Waterfall
+
+SAMPLE = {
+    'security_name': ['Common Stock', 'Series A Preferred', 'Series B Preferred', 'Employee Options'],
+    'shares_outstanding': [5_000_000, 2_000_000, 1_500_000, 500_000],
+    'liquidation_preference': [0, 10_000_000, 20_000_000, 0],
+    'participation_cap': [0, 0, 40_000_000, 0],
+    'strike_price': [0, 0, 0, 1.50],
+}
+
+
+def test_non_participating_preferred_converts():
+    waterfall = Waterfall({'security_name': ['Common', 'Series A'],
+                           'shares_outstanding': [1e6, 1e6],
+                           'liquidation_preference': [0, 5e6]})
+    np.testing.assert_allclose(waterfall.breakpoints, [5e6, 10e6])
+    np.testing.assert_allclose(waterfall.payoffs([3e6, 7e6, 20e6]),
+                               [[0, 3e6], [2e6, 5e6], [10e6, 10e6]])
+    np.testing.assert_allclose(waterfall.matrix, [[0, 1, 0.5], [1, 0, 0.5]])
+
+
+def test_seniority_and_debt_are_paid_in_order():
+    waterfall = Waterfall({'security_name': ['Loan', 'Series A', 'Series B', 'Common'],
+                           'shares_outstanding': [0, 1e6, 1e6, 1e6],
+                           'debt_amount': [4e6, 0, 0, 0],
+                           'liquidation_preference': [0, 2e6, 3e6, 0],
+                           'seniority': [0, 1, 2, 0]})
+    # 8M: debt 4M, Series B (senior) 3M, Series A gets the last 1M
+    np.testing.assert_allclose(waterfall.payoffs(8e6), [4e6, 1e6, 3e6, 0])
+    types = [bp['type'] for bp in waterfall.breakpoint_schedule]
+    assert types[:3] == ['debt', 'liquidation_preference', 'liquidation_preference']
+
+
+def test_capped_participation_and_option_exercise():
+    waterfall = Waterfall(SAMPLE)
+    kinds = {bp['type'] for bp in waterfall.breakpoint_schedule}
+    assert kinds == {'liquidation_preference', 'option_exercise', 'participation_cap', 'conversion'}
+    # Series B: 20M preference plus participation, capped at 40M until converting beats it
+    cap = next(bp['value'] for bp in waterfall.breakpoint_schedule if bp['type'] == 'participation_cap')
+    series_b = waterfall.payoffs([cap, cap + 50e6])[:, 2]
+    np.testing.assert_allclose(series_b, [40e6, 40e6])
+
+
+def test_payoffs_conserve_value_and_matrix_is_exact():
+    waterfall = Waterfall(SAMPLE)
+    exits = np.random.default_rng(3).uniform(0, 4e8, 5000)
+    payoffs = waterfall.payoffs(exits)
+    np.testing.assert_allclose(payoffs.sum(axis=-1), exits, rtol=1e-12, atol=1e-6)
+    np.testing.assert_allclose(waterfall.matrix.sum(axis=0), 1.0)
+
+    # Payoff rebuilt from the participation matrix slice by slice
+    edges = np.concatenate([[0.0], waterfall.breakpoints])
+    widths = np.append(np.diff(edges), np.inf)
+    rebuilt = np.clip(exits[:, None] - edges, 0, widths) @ waterfall.matrix.T
+    np.testing.assert_allclose(rebuilt, payoffs, rtol=1e-9, atol=1e-3)
+
+
+def test_allocation_is_one_matrix_product_over_a_grid():
+    waterfall = Waterfall(SAMPLE)
+    equity = np.linspace(20e6, 300e6, 50)[:, None]
+    slices = slice_values(equity, waterfall.breakpoints, T=3.0, r=0.05, sigma=np.linspace(0.3, 0.8, 40))
+    values = waterfall.allocate(slices)
+    assert values.shape == (50, 40, 4)
+    np.testing.assert_allclose(values.sum(axis=-1), np.broadcast_to(equity, (50, 40)))
+    np.testing.assert_allclose(waterfall.class_weights('Series A Preferred'), waterfall.matrix[1])
+
+
+def test_invalid_cap_tables():
+    with pytest.raises(ValueError):
+        Waterfall({'security_name': ['Common']})
+    with pytest.raises(ValueError):
+        Waterfall({'security_name': ['A', 'A'], 'shares_outstanding': [1, 1]})
+    with pytest.raises(ValueError):
+        Waterfall({'security_name': ['Common', 'B'], 'shares_outstanding': [1, 1],
+                   'liquidation_preference': [0, 10], 'participation_cap': [0, 5]})
+    with pytest.raises(ValueError):
+        Waterfall(SAMPLE).class_weights('Series Z')